@@ -7,7 +7,7 @@ import sys
 import os
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QHBoxLayout, 
                            QVBoxLayout, QSplitter, QStatusBar, QMessageBox, QFileDialog, 
-                           QDialog, QInputDialog)
+                           QDialog, QInputDialog, QProgressDialog)
 from PyQt5.QtCore import Qt, QTimer, pyqtSlot
 from PyQt5.QtGui import QPalette, QColor, QIcon
 
@@ -18,12 +18,20 @@ from src.ui.summary_panel import SummaryPanel
 from src.ui.enhanced_chart_widget import EnhancedChartWidget
 from src.ui.capital_dialog import CapitalDialog
 from src.ui.export_dialog import show_export_dialog
+from src.utils.export_service import ExportService
 from src.models.trading_model_with_db import TradingDataModelWithDB
 from src.models.ai_analyzer import AIAnalyzer
+from src.models.analysis_service import AnalysisService
+from src.models.monte_carlo import MonteCarloProjector
 from src.styles.themes import ThemeManager
 from src.utils.advice import get_daily_advice, get_weekly_summary_message
 from src.utils.i18n import tr, set_language
+from src.utils.saved_weeks import SavedWeeksIndex
 from src.ui.load_week_dialog import LoadWeekDialog
+from src.ui.analysis_worker import AnalysisWorker
+from src.ui.goal_dialog import GoalDialog
+from src.ui.custom_metrics_dialog import CustomMetricsDialog
+from src.ui.bulk_export_dialog import BulkExportDialog
 
 class MainWindow(QMainWindow):
     """Ventana principal de la aplicación W-T-F Trading Manager"""
@@ -32,6 +40,13 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.data_model = None
         self.ai_analyzer = None
+        self.analysis_service = None
+        self.analysis_worker = None
+        self.export_service = None
+        self._analysis_generation = 0
+        self._last_analysis = None
+        # Acciones que esperan el análisis de la semana actual (se atienden al llegar el resultado)
+        self._analysis_waiters = []
         self.theme_manager = None
         self.dark_mode = False  # Agregar atributo dark_mode
         self.setup_ui()
@@ -58,6 +73,13 @@ class MainWindow(QMainWindow):
         # Crear modelo de datos
         self.data_model = TradingDataModelWithDB()
         self.ai_analyzer = AIAnalyzer()
+        self.analysis_service = AnalysisService(self.ai_analyzer)
+        self.analysis_worker = AnalysisWorker(self.analysis_service)
+        self.analysis_worker.analysis_ready.connect(self.on_analysis_ready)
+        self.analysis_worker.analysis_failed.connect(self.on_analysis_failed)
+        # Pool de exportación compartido por los diálogos (vive lo que la ventana)
+        self.export_service = ExportService()
+        self.trade_ingest_worker = None
         self.theme_manager = ThemeManager()
         
         # Crear menú principal
@@ -125,9 +147,20 @@ class MainWindow(QMainWindow):
         self.menu_bar.daily_advice_visibility_changed.connect(self.on_toggle_daily_advice_visibility)
         self.menu_bar.show_weekly_summary_triggered.connect(self.show_weekly_summary_notification)
         self.menu_bar.start_new_week_triggered.connect(self.start_new_week_reset)
+        self.menu_bar.show_projection_triggered.connect(self.show_capital_projection)
+        self.menu_bar.show_patterns_triggered.connect(self.show_week_patterns)
+        self.menu_bar.show_goal_solver_triggered.connect(self.show_goal_solver)
+        self.menu_bar.show_custom_metrics_triggered.connect(self.show_custom_metrics)
         self.menu_bar.export_excel_triggered.connect(self.export_to_excel)
         self.menu_bar.export_csv_triggered.connect(self.export_to_csv)
         self.menu_bar.export_json_triggered.connect(self.export_to_json)
+        self.menu_bar.export_history_excel_triggered.connect(self.export_history_to_excel)
+        self.menu_bar.export_history_csv_triggered.connect(self.export_history_to_csv)
+        self.menu_bar.export_history_columnar_triggered.connect(self.export_history_to_columnar)
+        self.menu_bar.import_history_columnar_triggered.connect(self.import_history_columnar)
+        self.menu_bar.import_spreadsheet_triggered.connect(self.import_spreadsheet)
+        self.menu_bar.import_trades_triggered.connect(self.import_trades)
+        self.menu_bar.export_bulk_triggered.connect(self.export_bulk)
         # Visibilidad de leyenda del gráfico
         self.menu_bar.legend_visibility_changed.connect(self.on_toggle_legend)
         # Cambio de idioma desde la barra de menú
@@ -266,55 +299,105 @@ class MainWindow(QMainWindow):
             print(f"Error al actualizar gráfico: {e}")
     
     def update_summary(self):
-        """Actualizar el panel de resumen con análisis AI"""
+        """Actualizar el panel de resumen con análisis AI.
+        El análisis se ejecuta en el hilo del AnalysisWorker sobre una foto del modelo;
+        si el resultado ya está en caché se aplica de inmediato.
+        """
         try:
-            # Obtener resumen de datos
-            summary_data = self.data_model.get_weekly_summary()
-            
-            # Generar análisis AI
-            ai_analysis = self.ai_analyzer.analyze_weekly_performance(summary_data, self.data_model.data)
-            
-            # Preparar datos del capital
-            capital_data = {
-                'initial_capital': self.data_model.initial_capital,
-                'current_balance': self.data_model.get_current_balance(),
-                'total_profit_loss': self.data_model.get_total_profit_loss(),
-                'profit_loss_percentage': self.data_model.get_profit_loss_percentage()
-            }
-            
-            # Actualizar panel
-            self.summary_panel.update_summary(summary_data, ai_analysis, capital_data)
-            # Actualizar consejo del día
-            try:
-                advice = get_daily_advice(self.data_model)
-                self.summary_panel.update_daily_advice(advice)
-            except Exception:
-                pass
-            
+            self._analysis_generation += 1
+            snapshot = self.data_model.snapshot()
+            cached = self.analysis_service.get_cached(snapshot)
+            if cached is not None:
+                self._apply_analysis(cached)
+                return
+            self.analysis_worker.request(self._analysis_generation, snapshot)
         except Exception as e:
-            print(f"Error al actualizar resumen: {e}")
-            # Mostrar resumen sin análisis AI
-            summary_data = self.data_model.get_weekly_summary()
-            capital_data = {
-                'initial_capital': getattr(self.data_model, 'initial_capital', 100.0),
-                'current_balance': getattr(self.data_model, 'initial_capital', 100.0),
-                'total_profit_loss': 0,
-                'profit_loss_percentage': 0
-            }
-            self.summary_panel.update_summary(summary_data, {}, capital_data)
-            # Intentar actualizar consejo del día
+            self.on_analysis_failed(self._analysis_generation, str(e))
+
+    @pyqtSlot(int, object)
+    def on_analysis_ready(self, generation: int, result):
+        """Aplicar el resultado del worker si sigue siendo el más reciente"""
+        if generation != self._analysis_generation:
+            return
+        self._apply_analysis(result)
+
+    def _with_analysis(self, callback):
+        """Ejecutar callback(resultado) con el análisis de la semana actual sin calcularlo en
+        el hilo de la GUI: de inmediato si está en caché o, si no, cuando el AnalysisWorker lo
+        entregue (callback(None) si el análisis falla)."""
+        snapshot = self.data_model.snapshot()
+        cached = self.analysis_service.get_cached(snapshot)
+        if cached is not None:
+            callback(cached)
+            return
+        self._analysis_waiters.append(callback)
+        self.status_bar.showMessage("⏳ " + tr("analysis_computing"))
+        self._analysis_generation += 1
+        self.analysis_worker.request(self._analysis_generation, snapshot)
+
+    def _serve_analysis_waiters(self, result):
+        """Atender las acciones que esperaban el análisis"""
+        waiters, self._analysis_waiters = self._analysis_waiters, []
+        if waiters:
+            self.status_bar.clearMessage()
+        for callback in waiters:
             try:
-                advice = get_daily_advice(self.data_model)
-                self.summary_panel.update_daily_advice(advice)
-            except Exception:
-                pass
+                callback(result)
+            except Exception as e:
+                print(f"Error al usar el resultado del análisis: {e}")
 
-    def show_daily_advice(self):
-        """Mostrar consejo del día en el panel y en la barra de estado."""
+    def _apply_analysis(self, result):
+        """Mostrar en el panel el resultado completo del análisis"""
+        self._serve_analysis_waiters(result)
+        # Mismo contenido que lo ya mostrado: evitar re-renderizar (sin parpadeo)
+        if result is self._last_analysis:
+            return
+        self._last_analysis = result
+        
+        # Actualizar panel
+        self.summary_panel.update_summary(result['summary'], result['ai_analysis'], result['capital'])
+        # Actualizar consejo del día
+        self.summary_panel.update_daily_advice(result['advice'])
+        self.summary_panel.update_drawdown(result['drawdown'])
+        self.summary_panel.update_custom_metrics(result['custom_metrics'])
+
+    @pyqtSlot(int, str)
+    def on_analysis_failed(self, generation: int, error: str):
+        """Mostrar el resumen sin análisis AI si el análisis falló"""
+        if generation != self._analysis_generation:
+            return
+        print(f"Error al actualizar resumen: {error}")
+        self._last_analysis = None
+        self._serve_analysis_waiters(None)
+        summary_data = self.data_model.get_weekly_summary()
+        capital_data = {
+            'initial_capital': getattr(self.data_model, 'initial_capital', 100.0),
+            'current_balance': getattr(self.data_model, 'initial_capital', 100.0),
+            'total_profit_loss': 0,
+            'profit_loss_percentage': 0
+        }
+        self.summary_panel.update_summary(summary_data, {}, capital_data)
+        # Intentar actualizar consejo del día
         try:
             advice = get_daily_advice(self.data_model)
             self.summary_panel.update_daily_advice(advice)
-            self.status_bar.showMessage("📌 " + tr("daily_advice"), 3000)
+        except Exception:
+            pass
+        try:
+            self.summary_panel.update_drawdown(self.data_model.get_drawdown_report())
+            self.summary_panel.update_custom_metrics(self.data_model.get_custom_metrics())
+        except Exception:
+            pass
+
+    def show_daily_advice(self):
+        """Mostrar consejo del día en el panel y en la barra de estado."""
+        def show(result):
+            # Si el análisis falló, on_analysis_failed ya mostró el consejo sin análisis
+            if result is not None:
+                self.summary_panel.update_daily_advice(result['advice'])
+                self.status_bar.showMessage("📌 " + tr("daily_advice"), 3000)
+        try:
+            self._with_analysis(show)
         except Exception as e:
             print(f"Error al generar consejo del día: {e}")
 
@@ -335,6 +418,105 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, tr("warning"), f"{tr('operation_failed')}: {e}")
 
+    def show_capital_projection(self):
+        """Mostrar la proyección Monte Carlo del capital a partir del historial."""
+        try:
+            # Capital de partida: el de la semana siguiente según la política de rollover
+            start = self.data_model.get_rollover_capital()
+            history = self.data_model.get_history()
+
+            projector = MonteCarloProjector(withdrawal_rate=self.data_model.withdrawal_rate)
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            try:
+                projection = projector.project(start, history['amounts'], history['capitals'],
+                                               weeks=12, n_paths=100000, seed=0)
+            finally:
+                QApplication.restoreOverrideCursor()
+
+            if not projection:
+                QMessageBox.information(self, tr("monte_carlo_title"), tr("monte_carlo_no_history"))
+                return
+
+            bands = projection['percentiles']
+            weeks = projection['weeks']
+            message = tr("monte_carlo_summary").format(
+                weeks=weeks,
+                paths=projection['paths'],
+                days=projection['sample_days'],
+                start=start,
+                p5=bands[5][-1],
+                p50=bands[50][-1],
+                p95=bands[95][-1],
+                mean=projection['mean'][-1],
+                ruin=projector.ruin_fraction * 100,
+                ruin_prob=projection['probability_of_ruin'] * 100,
+                withdrawals=projection['expected_withdrawals']
+            )
+            lines = [f"{tr('week')} {w + 1}: ${bands[5][w]:.2f} / ${bands[50][w]:.2f} / ${bands[95][w]:.2f}"
+                     for w in range(3, weeks, 4)]
+            message += "\n\n" + tr("monte_carlo_bands") + "\n" + "\n".join(lines)
+            QMessageBox.information(self, tr("monte_carlo_title"), message)
+        except Exception as e:
+            QMessageBox.warning(self, tr("warning"), f"{tr('operation_failed')}: {e}")
+
+    def show_week_patterns(self):
+        """Mostrar las formas de semana recurrentes del historial.
+        El agrupamiento se calcula en el AnalysisWorker; el diálogo se abre con su resultado.
+        """
+        try:
+            self._with_analysis(self._show_week_patterns_result)
+        except Exception as e:
+            QMessageBox.warning(self, tr("warning"), f"{tr('operation_failed')}: {e}")
+
+    def _show_week_patterns_result(self, result):
+        try:
+            if result is None:
+                raise RuntimeError(tr("analysis_failed"))
+            patterns = result['patterns']
+            if not patterns['clusters']:
+                QMessageBox.information(self, tr("week_patterns_title"), tr("week_patterns_no_history"))
+                return
+
+            day_keys = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday']
+            names = [tr(f"pattern_{c['shape']}").format(day=tr(day_keys[c['day']])) for c in patterns['clusters']]
+            total = sum(c['size'] for c in patterns['clusters'])
+            lines = [tr("week_patterns_header").format(weeks=total, clusters=len(names))]
+            for name, cluster in zip(names, patterns['clusters']):
+                shape = "  ".join(f"{v:+.2f}" for v in cluster['centroid'])
+                lines.append("")
+                lines.append(tr("week_patterns_cluster").format(
+                    name=name, size=cluster['size'], share=cluster['size'] / total * 100 if total else 0
+                ))
+                lines.append(tr("week_patterns_centroid").format(shape=shape))
+                lines.append(tr("week_patterns_recent").format(weeks=", ".join(cluster['weeks'][-3:])))
+            if patterns['current_cluster'] is not None:
+                lines.append("")
+                lines.append(tr("week_patterns_current").format(name=names[patterns['current_cluster']]))
+            QMessageBox.information(self, tr("week_patterns_title"), "\n".join(lines))
+        except Exception as e:
+            QMessageBox.warning(self, tr("warning"), f"{tr('operation_failed')}: {e}")
+
+    def show_goal_solver(self):
+        """Abrir el diálogo de metas de capital"""
+        try:
+            dialog = GoalDialog(self.data_model, self)
+            if self.dark_mode:
+                dialog.setStyleSheet(self.theme_manager.get_widget_styles(True))
+            dialog.exec_()
+        except Exception as e:
+            QMessageBox.warning(self, tr("warning"), f"{tr('operation_failed')}: {e}")
+
+    def show_custom_metrics(self):
+        """Abrir el editor de métricas personalizadas y refrescar el panel al guardar"""
+        try:
+            dialog = CustomMetricsDialog(self.data_model, self)
+            if self.dark_mode:
+                dialog.setStyleSheet(self.theme_manager.get_widget_styles(True))
+            if dialog.exec_() == QDialog.Accepted:
+                self.update_summary()
+        except Exception as e:
+            QMessageBox.warning(self, tr("warning"), f"{tr('operation_failed')}: {e}")
+
     def perform_saturday_rollover(self):
         """Si es sábado, crea automáticamente la nueva semana para el lunes próximo con capital actualizado.
         Evita sobreescribir la semana previa creando un nuevo registro y archivo con datos en cero.
@@ -352,11 +534,8 @@ class MainWindow(QMainWindow):
             if self.data_model.week_start_date >= next_monday_date:
                 return
 
-            # Calcular retiro recomendado y nuevo capital
-            total = float(self.data_model.get_total_profit_loss())
-            balance = float(self.data_model.get_current_balance())
-            withdraw = max(0.0, total) * 0.30
-            new_initial = max(0.0, balance - withdraw)
+            # Nuevo capital según la política de rollover del modelo
+            new_initial = self.data_model.get_rollover_capital()
 
             # Crear nueva semana en el modelo/BD
             created = self.data_model.start_new_week(next_monday_date, new_initial)
@@ -410,10 +589,7 @@ class MainWindow(QMainWindow):
                 QMessageBox.information(self, tr("information"), tr("operation_completed"))
                 return
 
-            total = float(self.data_model.get_total_profit_loss())
-            balance = float(self.data_model.get_current_balance())
-            withdraw = max(0.0, total) * 0.30
-            new_initial = max(0.0, balance - withdraw)
+            new_initial = self.data_model.get_rollover_capital()
 
             created = self.data_model.start_new_week(next_monday_date, new_initial)
             if not created:
@@ -449,6 +625,8 @@ class MainWindow(QMainWindow):
         # Retraducir gráfico
         if hasattr(self.chart_widget, 'apply_language'):
             self.chart_widget.apply_language()
+        # El idioma forma parte de la clave de caché: re-renderizar consejo y análisis
+        self.update_summary()
     
     @pyqtSlot(str)
     def update_save_status(self, status):
@@ -488,6 +666,8 @@ class MainWindow(QMainWindow):
 
             # Guardar en archivo JSON directamente
             if self.data_model.save_to_file(filepath):
+                # Mantener el índice de la carpeta: el diálogo de carga no abre cada archivo
+                SavedWeeksIndex(save_folder).record(filepath)
                 self.update_save_status("✅ " + tr("save_success"))
             else:
                 self.update_save_status("❌ " + tr("save_error"))
@@ -607,6 +787,44 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, tr("error"), f"{tr('operation_failed')}: {str(e)}")
             self.update_save_status("❌ " + tr("operation_failed"))
     
+    def _get_export_data(self, result):
+        """Datos de la semana para exportar, con el resumen y análisis ya calculados (o sin ellos)"""
+        weekly_data = self.data_model.get_weekly_data()
+        if result is None:
+            return weekly_data
+        try:
+            summary = result['summary']
+            weekly_data.update({
+                'weekly_total': summary['total_weekly'],
+                'performance_percentage': summary['performance_percentage'],
+                'positive_days': summary['positive_days'],
+                'negative_days': summary['negative_days'],
+                'total_withdrawals': summary['total_withdrawal'],
+                'total_reinvestment': summary['total_reinvestment'],
+                'ai_analysis': {k: v for k, v in result['ai_analysis'].items() if k not in ('metrics', 'risk', 'weekdays')},
+                'drawdown': result['drawdown'],
+                'custom_metrics': result['custom_metrics']
+            })
+            if 'risk' in result['ai_analysis']:
+                # Informe completo con la serie móvil (solo al exportar: O(n·ventana))
+                history = self.data_model.get_history()
+                weekly_data['tail_risk'] = self.ai_analyzer.tail_risk.report(
+                    history['amounts'], history['dates'], include_rolling=True)
+        except Exception as e:
+            print(f"No se pudo adjuntar el análisis a la exportación: {e}")
+        return weekly_data
+    
+    def _show_export_dialog(self, result):
+        """Mostrar el diálogo de exportación de la semana actual"""
+        try:
+            weekly_data = self._get_export_data(result)
+            # Número de semana basado en fecha de inicio
+            week_number = self.data_model.week_start_date.isocalendar()[1]
+            show_export_dialog(weekly_data, week_number, self, self.export_service)
+        except Exception as e:
+            QMessageBox.critical(self, tr("error"), f"{tr('export_error')}: {str(e)}")
+            self.update_save_status("❌ " + tr("export_error"))
+
     def export_to_excel(self):
         """Exportar datos a Excel"""
         try:
@@ -614,13 +832,8 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, tr("warning"), tr("no_data_to_export"))
                 return
             
-            # Obtener datos de la semana actual
-            weekly_data = self.data_model.get_weekly_data()
-            # Número de semana basado en fecha de inicio
-            week_number = self.data_model.week_start_date.isocalendar()[1]
-            
-            # Mostrar diálogo de exportación
-            show_export_dialog(weekly_data, week_number, self)
+            # El diálogo se abre con el análisis de la semana (calculado en el AnalysisWorker)
+            self._with_analysis(self._show_export_dialog)
             
         except Exception as e:
             QMessageBox.critical(self, tr("error"), f"{tr('export_error')}: {str(e)}")
@@ -633,12 +846,8 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, tr("warning"), tr("no_data_to_export"))
                 return
             
-            # Obtener datos de la semana actual
-            weekly_data = self.data_model.get_weekly_data()
-            week_number = self.data_model.week_start_date.isocalendar()[1]
-            
-            # Mostrar diálogo de exportación
-            show_export_dialog(weekly_data, week_number, self)
+            # El diálogo se abre con el análisis de la semana (calculado en el AnalysisWorker)
+            self._with_analysis(self._show_export_dialog)
             
         except Exception as e:
             QMessageBox.critical(self, tr("error"), f"{tr('export_error')}: {str(e)}")
@@ -651,28 +860,249 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, tr("warning"), tr("no_data_to_export"))
                 return
             
-            # Obtener datos de la semana actual
-            weekly_data = self.data_model.get_weekly_data()
-            week_number = self.data_model.week_start_date.isocalendar()[1]
-            
-            # Mostrar diálogo de exportación
-            show_export_dialog(weekly_data, week_number, self)
+            # El diálogo se abre con el análisis de la semana (calculado en el AnalysisWorker)
+            self._with_analysis(self._show_export_dialog)
             
         except Exception as e:
             QMessageBox.critical(self, tr("error"), f"{tr('export_error')}: {str(e)}")
             self.update_save_status("❌ " + tr("export_error"))
     
+    def export_history_to_excel(self):
+        """Exportar todas las semanas guardadas a Excel (una hoja por año)"""
+        self._export_history('xlsx')
+
+    def export_history_to_csv(self):
+        """Exportar todas las semanas guardadas a CSV (opcionalmente .csv.gz)"""
+        self._export_history('csv')
+
+    def export_history_to_columnar(self):
+        """Exportar todos los días guardados a Parquet o Arrow IPC (pyarrow opcional)"""
+        self._export_history('parquet')
+
+    def export_bulk(self):
+        """Exportar cada semana de un rango de fechas en segundo plano (varios formatos en paralelo)"""
+        try:
+            destinations = [self.data_model.destinations[day] for day in self.data_model.days]
+            dialog = BulkExportDialog(self.data_model.db_manager, self.export_service, destinations, self)
+            dialog.exec_()
+        except Exception as e:
+            QMessageBox.critical(self, tr("error"), f"{tr('export_error')}: {str(e)}")
+
+    def _export_history(self, kind: str):
+        """Exportar el historial completo leyendo la BD en streaming"""
+        try:
+            from datetime import datetime
+            db = self.data_model.db_manager
+            weeks = db.count_weeks()
+            if weeks == 0:
+                QMessageBox.warning(self, tr("warning"), tr("no_data_to_export"))
+                return
+            default_name = f"trading_historial_{datetime.now().strftime('%Y%m%d')}.{kind}"
+            filters = {
+                'xlsx': "Excel Files (*.xlsx);;All Files (*)",
+                'csv': "CSV Files (*.csv);;CSV gzip (*.csv.gz);;All Files (*)",
+                'parquet': "Parquet (*.parquet);;Arrow IPC (*.arrow);;All Files (*)"
+            }[kind]
+            file_path, _ = QFileDialog.getSaveFileName(self, tr("export_save_title"), default_name, filters)
+            if not file_path:
+                return
+
+            # Se escribe en el pool del servicio de exportación: la interfaz solo consulta el avance
+            destinations = [self.data_model.destinations[day] for day in self.data_model.days]
+            if kind == 'parquet':
+                account = os.path.splitext(os.path.basename(db.db_path))[0]
+                task = self.export_service.columnar_history_task(db.iter_history, weeks, file_path,
+                                                                 account, destinations)
+            else:
+                task = self.export_service.history_task(db.iter_history, weeks, file_path, destinations)
+            job = self.export_service.submit([task], tr("export_save_title"))
+            self._follow_history_export(job, weeks, file_path)
+        except Exception as e:
+            QMessageBox.critical(self, tr("error"), f"{tr('export_error')}: {str(e)}")
+            self.update_save_status("❌ " + tr("export_error"))
+
+    def _follow_history_export(self, job, weeks: int, file_path: str):
+        """Mostrar el avance real y la ETA del trabajo, con opción de cancelarlo"""
+        from src.ui.export_dialog import format_eta
+        progress = QProgressDialog(tr("starting_export"), tr("cancel"), 0, 1000, self)
+        progress.setWindowTitle(tr("export_save_title"))
+        progress.setMinimumDuration(0)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        progress.canceled.connect(job.cancel)
+        timer = QTimer(progress)
+        timer.setInterval(200)
+
+        def poll():
+            state = job.snapshot()
+            progress.setValue(int(state['progress'] * 1000))
+            progress.setLabelText(tr("export_progress_eta").format(
+                done=state['done_rows'], total=state['total_rows'], eta=format_eta(state['eta'])))
+            if not job.finished:
+                return
+            timer.stop()
+            progress.close()
+            progress.deleteLater()
+            if state['status'] == 'cancelled':
+                self.update_save_status("⏹ " + tr("export_cancelled"))
+            elif state['status'] == 'done':
+                self.update_save_status("✅ " + tr("export_success"))
+                QMessageBox.information(self, tr("export_success"),
+                                        tr("export_history_done").format(weeks=weeks, path=file_path))
+            else:
+                QMessageBox.critical(self, tr("export_error"), "\n".join(state['errors']) or tr("export_failed"))
+                self.update_save_status("❌ " + tr("export_error"))
+
+        timer.timeout.connect(poll)
+        timer.start()
+        self.update_save_status("⏳ " + tr("starting_export"))
+
+    def import_history_columnar(self):
+        """Importar semanas desde un archivo Parquet / Arrow IPC a la base de datos"""
+        try:
+            file_path, _ = QFileDialog.getOpenFileName(self, tr("import_history_title"), "",
+                                                       "Parquet / Arrow (*.parquet *.arrow);;All Files (*)")
+            if not file_path:
+                return
+            from src.utils import columnar
+            table = columnar.read_history(file_path)
+            accounts = columnar.accounts_in(table)
+            if not accounts:
+                QMessageBox.information(self, tr("import_history_title"), tr("no_data_to_export"))
+                return
+            account = accounts[0]
+            if len(accounts) > 1:
+                account, ok = QInputDialog.getItem(self, tr("import_history_title"),
+                                                   tr("import_history_account"), accounts, 0, False)
+                if not ok:
+                    return
+            weeks = sum(1 for _ in columnar.iter_weeks(table, account))
+            reply = QMessageBox.question(self, tr("import_history_title"),
+                                         tr("import_history_confirm").format(weeks=weeks, account=account),
+                                         QMessageBox.Yes | QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+
+            imported = self.data_model.db_manager.save_weeks(columnar.iter_weeks(table, account))
+            # Recargar la semana activa: el historial y las cachés se reconstruyen
+            self.data_model.load_specific_week(self.data_model.week_start_date.isoformat())
+            self.table_widget.load_data()
+            self.update_chart()
+            self.update_summary()
+            self.update_save_status("✅ " + tr("import_history_done").format(weeks=imported))
+        except Exception as e:
+            QMessageBox.critical(self, tr("error"), f"{tr('import_history_failed')}: {str(e)}")
+            self.update_save_status("❌ " + tr("import_history_failed"))
+
+    def import_spreadsheet(self):
+        """Importar semanas o días desde un Excel / CSV a la base de datos"""
+        try:
+            file_path, _ = QFileDialog.getOpenFileName(self, tr("import_spreadsheet_title"), "",
+                                                       "Excel / CSV (*.xlsx *.xlsm *.csv *.gz);;All Files (*)")
+            if not file_path:
+                return
+            reply = QMessageBox.question(self, tr("import_spreadsheet_title"), tr("import_spreadsheet_confirm"),
+                                         QMessageBox.Yes | QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+
+            from src.utils.importers import SpreadsheetImporter
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            try:
+                report = SpreadsheetImporter(self.data_model.db_manager).import_file(file_path)
+            finally:
+                QApplication.restoreOverrideCursor()
+            # Recargar la semana activa: el historial y las cachés se reconstruyen
+            self.data_model.load_specific_week(self.data_model.week_start_date.isoformat())
+            self.table_widget.load_data()
+            self.update_chart()
+            self.update_summary()
+            message = tr("import_spreadsheet_done").format(weeks=report.weeks, rows=report.rows_read)
+            self.update_save_status("✅ " + message)
+            if report.rejected:
+                details = "\n".join(report.errors)
+                QMessageBox.warning(self, tr("import_spreadsheet_title"), message + "\n\n" +
+                                    tr("import_spreadsheet_rejected").format(count=report.rejected) +
+                                    "\n" + details)
+            else:
+                QMessageBox.information(self, tr("import_spreadsheet_title"), message)
+        except Exception as e:
+            QMessageBox.critical(self, tr("error"), f"{tr('import_history_failed')}: {str(e)}")
+            self.update_save_status("❌ " + tr("import_history_failed"))
+
+    def import_trades(self):
+        """Ingerir un extracto de operaciones de la plataforma en segundo plano"""
+        if self.trade_ingest_worker is not None and self.trade_ingest_worker.isRunning():
+            return
+        file_path, _ = QFileDialog.getOpenFileName(self, tr("import_trades_title"), "",
+                                                   "CSV / JSON / Excel (*.csv *.json *.jsonl *.gz *.xlsx);;All Files (*)")
+        if not file_path:
+            return
+        from src.ui.trade_ingest_worker import TradeIngestWorker
+        self.trade_ingest_worker = TradeIngestWorker(self.data_model.db_manager, file_path,
+                                                     self.data_model.week_start_date, self)
+        progress = QProgressDialog(tr("import_trades_progress").format(rows=0), tr("cancel"), 0, 0, self)
+        progress.setWindowTitle(tr("import_trades_title"))
+        progress.setMinimumDuration(0)
+        progress.canceled.connect(self.trade_ingest_worker.cancel)
+        self.trade_ingest_worker.progress.connect(
+            lambda rows: progress.setLabelText(tr("import_trades_progress").format(rows=rows)))
+        self.trade_ingest_worker.completed.connect(self.on_trades_imported)
+        self.trade_ingest_worker.failed.connect(
+            lambda error: QMessageBox.critical(self, tr("error"), f"{tr('import_history_failed')}: {error}"))
+        self.trade_ingest_worker.finished.connect(progress.reset)
+        self.update_save_status("⏳ " + tr("import_trades_progress").format(rows=0))
+        self.trade_ingest_worker.start()
+
+    def on_trades_imported(self, report, ledger):
+        """Pasar a la semana activa los totales diarios de las operaciones importadas e informar el resultado"""
+        # El registro se armó en el hilo de ingesta; si entretanto se cambió de semana ya no sirve
+        if ledger is not None and self.trade_ingest_worker.week_start != self.data_model.week_start_date:
+            ledger = None
+        try:
+            if ledger is not None:
+                self.data_model.set_trade_ledger(ledger, report.days)
+                # update_day solo en los días cuyo total cambió (deltas O(1) sobre las estadísticas)
+                if self.data_model.apply_trade_totals(ledger):
+                    self.table_widget.load_data()
+                    self.update_chart()
+                self.update_summary()
+        except Exception as e:
+            print(f"Error al aplicar las operaciones importadas a la semana: {e}")
+        message = tr("import_trades_done").format(inserted=report.inserted, duplicates=report.duplicates,
+                                                  rejected=report.rejected, days=len(report.days))
+        if report.cancelled:
+            message = tr("import_trades_cancelled") + "\n" + message
+        if report.weekend_days:
+            message += "\n" + tr("import_trades_weekend").format(count=len(report.weekend_days))
+        week = ledger.summary() if ledger is not None else {'trades': 0}
+        if week['trades']:
+            message += "\n" + tr("import_trades_week").format(trades=week['trades'], win_rate=week['win_rate'] * 100,
+                                                              profit=week['profit'])
+        self.update_save_status("✅ " + message.split("\n")[0])
+        if report.errors:
+            QMessageBox.warning(self, tr("import_trades_title"), message + "\n\n" + "\n".join(report.errors))
+        else:
+            QMessageBox.information(self, tr("import_trades_title"), message)
+
     def closeEvent(self, event):
         """Manejar cierre de la aplicación"""
         try:
             # Guardar estado actual antes de cerrar
             self.data_model.save_current_week()
+            self.analysis_worker.stop()
+            self.export_service.shutdown(wait=False)
+            if self.trade_ingest_worker is not None and self.trade_ingest_worker.isRunning():
+                self.trade_ingest_worker.cancel()
+                self.trade_ingest_worker.wait()
             event.accept()
         except Exception as e:
             reply = QMessageBox.question(self, tr("confirm_close_title"),
                                        f"{tr('save_error')}: {str(e)}\n{tr('close_anyway_question')}",
                                        QMessageBox.Yes | QMessageBox.No)
             if reply == QMessageBox.Yes:
+                self.analysis_worker.stop()
+                self.export_service.shutdown(wait=False)
                 event.accept()
             else:
                 event.ignore()
@@ -4,8 +4,80 @@ Maneja toda la persistencia de datos de la aplicación
 """
 
 import sqlite3
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+from ..utils.money import from_cents, to_cents
+
+# Versión del esquema (PRAGMA user_version): 1 = montos en centavos enteros
+SCHEMA_VERSION = 1
+
+# Columna de trading_weeks de cada día hábil (0 = lunes), en centavos
+DAY_COLUMNS = ('lunes_cents', 'martes_cents', 'miercoles_cents', 'jueves_cents', 'viernes_cents')
+# Columnas REAL del esquema anterior, solo para migrar
+LEGACY_DAY_COLUMNS = ('lunes_amount', 'martes_amount', 'miercoles_amount', 'jueves_amount', 'viernes_amount')
+
+WEEKS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        week_start_date TEXT UNIQUE NOT NULL,
+        lunes_cents INTEGER DEFAULT 0,
+        martes_cents INTEGER DEFAULT 0,
+        miercoles_cents INTEGER DEFAULT 0,
+        jueves_cents INTEGER DEFAULT 0,
+        viernes_cents INTEGER DEFAULT 0,
+        initial_capital_cents INTEGER DEFAULT 10000,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+# closed_at: segundos desde 1970 de la hora de cierre tal como figura en el extracto;
+# direction: 1 = arriba/call, -1 = abajo/put, 0 = desconocida
+TRADES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY,
+        trade_id TEXT UNIQUE NOT NULL,
+        trade_date TEXT NOT NULL,
+        closed_at INTEGER NOT NULL,
+        asset TEXT,
+        direction INTEGER DEFAULT 0,
+        stake_cents INTEGER DEFAULT 0,
+        profit_cents INTEGER NOT NULL
+    )
+'''
+TRADE_TOTALS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        trade_date TEXT PRIMARY KEY,
+        trades INTEGER NOT NULL DEFAULT 0,
+        profit_cents INTEGER NOT NULL DEFAULT 0
+    )
+'''
+# Columnas en el orden de las filas de historial (week_start_date, lunes..viernes, initial_capital)
+HISTORY_COLUMNS = "week_start_date, " + ", ".join(DAY_COLUMNS) + ", initial_capital_cents"
+HISTORY_UNITS = ("week_start_date, " + ", ".join(f"{column} / 100.0" for column in DAY_COLUMNS) +
+                 ", initial_capital_cents / 100.0")
+
+
+def _cents_sql(column: str, default: float = 0.0) -> str:
+    """Expresión SQL que pasa un monto REAL a centavos con el redondeo de money.to_cents"""
+    value = f"COALESCE({column}, {default})"
+    return f"CAST(ROUND({value} * 100 + (CASE WHEN {value} < 0 THEN -1e-7 ELSE 1e-7 END)) AS INTEGER)"
+
+
+def _week_dict(row: tuple) -> Dict:
+    """Fila (week_start_date, lunes..viernes, capital) en centavos al formato del modelo"""
+    week_start_date, lunes, martes, miercoles, jueves, viernes, initial_capital = row
+    return {
+        'week_start_date': week_start_date,
+        'initial_capital': from_cents(initial_capital),
+        'data': {
+            'Lunes': {'amount': from_cents(lunes), 'destination': 'Retiro Personal'},
+            'Martes': {'amount': from_cents(martes), 'destination': 'Retiro Personal'},
+            'Miércoles': {'amount': from_cents(miercoles), 'destination': 'Reinversión'},
+            'Jueves': {'amount': from_cents(jueves), 'destination': 'Retiro Personal'},
+            'Viernes': {'amount': from_cents(viernes), 'destination': 'Retiro Personal'}
+        }
+    }
+
 
 class DatabaseManager:
     """Administrador de base de datos SQLite para persistencia de datos"""
@@ -19,29 +91,12 @@ class DatabaseManager:
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
+
+                # Bases anteriores: montos REAL a centavos enteros
+                self._migrate_to_cents(conn)
                 
-                # Crear tabla de semanas de trading
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS trading_weeks (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        week_start_date TEXT UNIQUE NOT NULL,
-                        lunes_amount REAL DEFAULT 0.0,
-                        martes_amount REAL DEFAULT 0.0,
-                        miercoles_amount REAL DEFAULT 0.0,
-                        jueves_amount REAL DEFAULT 0.0,
-                        viernes_amount REAL DEFAULT 0.0,
-                        initial_capital REAL DEFAULT 100.0,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                # Agregar columna initial_capital si no existe (para bases de datos existentes)
-                try:
-                    cursor.execute("ALTER TABLE trading_weeks ADD COLUMN initial_capital REAL DEFAULT 100.0")
-                except sqlite3.OperationalError:
-                    # La columna ya existe, ignorar error
-                    pass
+                # Crear tabla de semanas de trading (montos en centavos)
+                cursor.execute(WEEKS_TABLE.format(table='trading_weeks'))
                 
                 # Crear tabla de configuración
                 cursor.execute('''
@@ -51,13 +106,76 @@ class DatabaseManager:
                         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     )
                 ''')
-                
+
+                # Operaciones individuales importadas de la plataforma (solo se agregan filas)
+                cursor.execute(TRADES_TABLE.format(table='trades'))
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_date ON trades (trade_date)")
+
+                # Totales por día de las operaciones, actualizados al agregar cada lote
+                cursor.execute(TRADE_TOTALS_TABLE.format(table='trade_daily_totals'))
+
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
                 conn.commit()
         except sqlite3.Error as e:
             print(f"Error al inicializar la base de datos: {e}")
+
+    @staticmethod
+    def _columns(conn, table: str) -> List[str]:
+        return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+    def _migrate_to_cents(self, conn):
+        """Reescribir las tablas con montos REAL en el esquema de centavos INTEGER.
+        SQLite no cambia el tipo de una columna: se crea la tabla nueva, se copian las
+        filas redondeando al centavo y se reemplaza la vieja, todo en una transacción.
+        Las columnas cambian de nombre (*_cents) para que una versión anterior de la
+        aplicación falle en lugar de leer montos 100 veces mayores.
+        """
+        weeks = self._columns(conn, 'trading_weeks')
+        trades = self._columns(conn, 'trades')
+        totals = self._columns(conn, 'trade_daily_totals')
+        if 'lunes_amount' not in weeks and 'profit' not in trades and 'profit' not in totals:
+            return
+        conn.execute("BEGIN")
+        try:
+            if 'lunes_amount' in weeks:
+                capital = 'initial_capital' if 'initial_capital' in weeks else '100.0'
+                day_columns = ", ".join(_cents_sql(column) for column in LEGACY_DAY_COLUMNS)
+                self._rebuild_table(conn, 'trading_weeks', WEEKS_TABLE, f'''
+                    INSERT INTO {{table}} (id, week_start_date, {", ".join(DAY_COLUMNS)},
+                                           initial_capital_cents, created_at, updated_at)
+                    SELECT id, week_start_date, {day_columns}, {_cents_sql(capital, 100.0)},
+                           created_at, updated_at
+                    FROM trading_weeks
+                ''')
+            if 'profit' in trades:
+                self._rebuild_table(conn, 'trades', TRADES_TABLE, f'''
+                    INSERT INTO {{table}} (id, trade_id, trade_date, closed_at, asset, direction,
+                                           stake_cents, profit_cents)
+                    SELECT id, trade_id, trade_date, closed_at, asset, direction,
+                           {_cents_sql('stake')}, {_cents_sql('profit')}
+                    FROM trades
+                ''')
+            if 'profit' in totals:
+                self._rebuild_table(conn, 'trade_daily_totals', TRADE_TOTALS_TABLE, f'''
+                    INSERT INTO {{table}} (trade_date, trades, profit_cents)
+                    SELECT trade_date, trades, {_cents_sql('profit')} FROM trade_daily_totals
+                ''')
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+    @staticmethod
+    def _rebuild_table(conn, table: str, create_sql: str, copy_sql: str):
+        staging = f"{table}_cents"
+        conn.execute(f"DROP TABLE IF EXISTS {staging}")
+        conn.execute(create_sql.format(table=staging))
+        conn.execute(copy_sql.format(table=staging))
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {staging} RENAME TO {table}")
     
     def save_weekly_data(self, data: Dict) -> bool:
-        """Guardar o actualizar los datos de una semana"""
+        """Guardar o actualizar los datos de una semana (los montos se guardan en centavos)"""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
@@ -66,28 +184,29 @@ class DatabaseManager:
                 trading_data = data['data']
                 
                 # Preparar datos para la inserción/actualización
-                lunes = trading_data['Lunes']['amount']
-                martes = trading_data['Martes']['amount']
-                miercoles = trading_data['Miércoles']['amount']
-                jueves = trading_data['Jueves']['amount']
-                viernes = trading_data['Viernes']['amount']
+                lunes = to_cents(trading_data['Lunes']['amount'])
+                martes = to_cents(trading_data['Martes']['amount'])
+                miercoles = to_cents(trading_data['Miércoles']['amount'])
+                jueves = to_cents(trading_data['Jueves']['amount'])
+                viernes = to_cents(trading_data['Viernes']['amount'])
+                initial_capital = to_cents(data.get('initial_capital', 100.0))
                 
                 # Intentar actualizar primero
                 cursor.execute('''
                     UPDATE trading_weeks 
-                    SET lunes_amount = ?, martes_amount = ?, miercoles_amount = ?, 
-                        jueves_amount = ?, viernes_amount = ?, initial_capital = ?, updated_at = CURRENT_TIMESTAMP
+                    SET lunes_cents = ?, martes_cents = ?, miercoles_cents = ?, 
+                        jueves_cents = ?, viernes_cents = ?, initial_capital_cents = ?, updated_at = CURRENT_TIMESTAMP
                     WHERE week_start_date = ?
-                ''', (lunes, martes, miercoles, jueves, viernes, data.get('initial_capital', 100.0), week_start_date))
+                ''', (lunes, martes, miercoles, jueves, viernes, initial_capital, week_start_date))
                 
                 # Si no se actualizó ninguna fila, insertar nueva
                 if cursor.rowcount == 0:
                     cursor.execute('''
                         INSERT INTO trading_weeks 
-                        (week_start_date, lunes_amount, martes_amount, miercoles_amount, 
-                         jueves_amount, viernes_amount, initial_capital)
+                        (week_start_date, lunes_cents, martes_cents, miercoles_cents, 
+                         jueves_cents, viernes_cents, initial_capital_cents)
                         VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (week_start_date, lunes, martes, miercoles, jueves, viernes, data.get('initial_capital', 100.0)))
+                    ''', (week_start_date, lunes, martes, miercoles, jueves, viernes, initial_capital))
                 
                 conn.commit()
                 return True
@@ -102,31 +221,16 @@ class DatabaseManager:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute('''
-                    SELECT week_start_date, lunes_amount, martes_amount, miercoles_amount, 
-                           jueves_amount, viernes_amount, initial_capital
+                cursor.execute(f'''
+                    SELECT {HISTORY_COLUMNS}
                     FROM trading_weeks
                     ORDER BY week_start_date DESC
                     LIMIT 1
                 ''')
                 
                 row = cursor.fetchone()
-                if row:
-                    week_start_date, lunes, martes, miercoles, jueves, viernes, initial_capital = row
-                    
-                    # Convertir a formato compatible con el modelo
-                    return {
-                        'week_start_date': week_start_date,
-                        'initial_capital': initial_capital,
-                        'data': {
-                            'Lunes': {'amount': lunes, 'destination': 'Retiro Personal'},
-                            'Martes': {'amount': martes, 'destination': 'Retiro Personal'},
-                            'Miércoles': {'amount': miercoles, 'destination': 'Reinversión'},
-                            'Jueves': {'amount': jueves, 'destination': 'Retiro Personal'},
-                            'Viernes': {'amount': viernes, 'destination': 'Retiro Personal'}
-                        }
-                    }
-                return None
+                # Convertir a formato compatible con el modelo
+                return _week_dict(row) if row else None
                 
         except sqlite3.Error as e:
             print(f"Error al cargar última semana: {e}")
@@ -138,29 +242,14 @@ class DatabaseManager:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute('''
-                    SELECT week_start_date, lunes_amount, martes_amount, miercoles_amount, 
-                           jueves_amount, viernes_amount, initial_capital
+                cursor.execute(f'''
+                    SELECT {HISTORY_COLUMNS}
                     FROM trading_weeks
                     WHERE week_start_date = ?
                 ''', (week_start_date,))
                 
                 row = cursor.fetchone()
-                if row:
-                    week_start_date, lunes, martes, miercoles, jueves, viernes, initial_capital = row
-                    
-                    return {
-                        'week_start_date': week_start_date,
-                        'initial_capital': initial_capital,
-                        'data': {
-                            'Lunes': {'amount': lunes, 'destination': 'Retiro Personal'},
-                            'Martes': {'amount': martes, 'destination': 'Retiro Personal'},
-                            'Miércoles': {'amount': miercoles, 'destination': 'Reinversión'},
-                            'Jueves': {'amount': jueves, 'destination': 'Retiro Personal'},
-                            'Viernes': {'amount': viernes, 'destination': 'Retiro Personal'}
-                        }
-                    }
-                return None
+                return _week_dict(row) if row else None
                 
         except sqlite3.Error as e:
             print(f"Error al cargar semana por fecha: {e}")
@@ -189,4 +278,233 @@ class DatabaseManager:
                 
         except sqlite3.Error as e:
             print(f"Error al obtener todas las semanas: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    def load_history(self, cents: bool = False) -> List[tuple]:
+        """Obtener todas las semanas con sus montos diarios en orden cronológico.
+        Cada fila: (week_start_date, lunes, martes, miercoles, jueves, viernes, initial_capital)
+        Con cents=True los montos son los enteros en centavos guardados; si no, decimales.
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute(f'''
+                    SELECT {HISTORY_COLUMNS if cents else HISTORY_UNITS}
+                    FROM trading_weeks
+                    ORDER BY week_start_date ASC
+                ''')
+                
+                return cursor.fetchall()
+                
+        except sqlite3.Error as e:
+            print(f"Error al cargar el historial: {e}")
+            return []
+
+    @staticmethod
+    def _range_clause(start: Optional[str] = None, end: Optional[str] = None,
+                      column: str = 'week_start_date'):
+        """Filtro WHERE opcional por rango de fechas ISO de column (ambos extremos incluidos)"""
+        conditions, params = [], []
+        if start:
+            conditions.append(f"{column} >= ?")
+            params.append(str(start))
+        if end:
+            conditions.append(f"{column} <= ?")
+            params.append(str(end))
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+    def iter_history(self, chunk_size: int = 1000, start: Optional[str] = None,
+                     end: Optional[str] = None, cents: bool = False) -> Iterator[tuple]:
+        """Recorrer el historial en orden cronológico leyendo de a chunk_size filas.
+        Mismas columnas que load_history, sin cargar toda la tabla en memoria;
+        start/end limitan el rango de semanas.
+        Los errores de SQLite se propagan: quien consume decide cómo informarlos.
+        """
+        where, params = self._range_clause(start, end)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT ''' + (HISTORY_COLUMNS if cents else HISTORY_UNITS) + '''
+                FROM trading_weeks''' + where + '''
+                ORDER BY week_start_date ASC
+            ''', params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    def save_weeks(self, rows: Iterable[tuple], chunk_size: int = 1000) -> int:
+        """Insertar o actualizar muchas semanas en una sola transacción.
+        Cada fila: (week_start_date, lunes, martes, miercoles, jueves, viernes, initial_capital)
+        con montos decimales (se guardan en centavos).
+        Si algo falla no se guarda ninguna; devuelve la cantidad de semanas escritas.
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            total = 0
+            with conn:
+                batch = []
+                for week_start, *amounts in rows:
+                    batch.append((week_start, *(to_cents(amount) for amount in amounts)))
+                    if len(batch) >= chunk_size:
+                        total += self._upsert_weeks(conn, batch)
+                        batch = []
+                if batch:
+                    total += self._upsert_weeks(conn, batch)
+            return total
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _upsert_weeks(conn, batch: List[tuple]) -> int:
+        conn.executemany('''
+            INSERT INTO trading_weeks
+            (week_start_date, lunes_cents, martes_cents, miercoles_cents,
+             jueves_cents, viernes_cents, initial_capital_cents)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(week_start_date) DO UPDATE SET
+                lunes_cents = excluded.lunes_cents,
+                martes_cents = excluded.martes_cents,
+                miercoles_cents = excluded.miercoles_cents,
+                jueves_cents = excluded.jueves_cents,
+                viernes_cents = excluded.viernes_cents,
+                initial_capital_cents = excluded.initial_capital_cents,
+                updated_at = CURRENT_TIMESTAMP
+        ''', batch)
+        return len(batch)
+
+    def count_weeks(self, start: Optional[str] = None, end: Optional[str] = None) -> int:
+        """Cantidad de semanas guardadas (opcionalmente dentro del rango start/end)"""
+        where, params = self._range_clause(start, end)
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                return conn.execute("SELECT COUNT(*) FROM trading_weeks" + where, params).fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Error al contar las semanas: {e}")
+            return 0
+
+    def append_trades(self, trades: List[tuple]) -> Dict:
+        """Agregar un lote de operaciones y actualizar los totales diarios y las semanas.
+        Cada fila: (trade_id, trade_date, closed_at, asset, direction, stake_cents, profit_cents).
+
+        Las operaciones con un trade_id ya guardado (o repetido en el lote) se ignoran, así
+        que volver a importar un extracto no duplica nada. Solo las nuevas se suman a
+        trade_daily_totals; los días hábiles afectados pasan a valer su total en
+        trading_weeks (creando la semana si no existe). Todo el lote es una transacción.
+        Devuelve {'inserted', 'duplicates', 'days': {fecha: total en centavos}}.
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                conn.execute('''
+                    CREATE TEMP TABLE IF NOT EXISTS trades_batch (
+                        trade_id TEXT PRIMARY KEY, trade_date TEXT, closed_at INTEGER,
+                        asset TEXT, direction INTEGER, stake_cents INTEGER, profit_cents INTEGER
+                    )
+                ''')
+                conn.execute("DELETE FROM trades_batch")
+                conn.executemany("INSERT OR IGNORE INTO trades_batch VALUES (?, ?, ?, ?, ?, ?, ?)", trades)
+                conn.execute("DELETE FROM trades_batch WHERE trade_id IN (SELECT trade_id FROM trades)")
+                inserted = conn.execute('''
+                    INSERT INTO trades (trade_id, trade_date, closed_at, asset, direction, stake_cents, profit_cents)
+                    SELECT trade_id, trade_date, closed_at, asset, direction, stake_cents, profit_cents
+                    FROM trades_batch ORDER BY closed_at
+                ''').rowcount
+                conn.execute('''
+                    INSERT INTO trade_daily_totals (trade_date, trades, profit_cents)
+                    SELECT trade_date, COUNT(*), SUM(profit_cents) FROM trades_batch WHERE 1 GROUP BY trade_date
+                    ON CONFLICT(trade_date) DO UPDATE SET
+                        trades = trades + excluded.trades,
+                        profit_cents = profit_cents + excluded.profit_cents
+                ''')
+                days = dict(conn.execute('''
+                    SELECT trade_date, profit_cents FROM trade_daily_totals
+                    WHERE trade_date IN (SELECT DISTINCT trade_date FROM trades_batch)
+                ''').fetchall())
+                self._apply_daily_totals(conn, days)
+                conn.execute("DELETE FROM trades_batch")
+            return {'inserted': inserted, 'duplicates': len(trades) - inserted, 'days': days}
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _apply_daily_totals(conn, days: Dict[str, int]):
+        """Escribir el total (centavos) de cada día hábil en la columna del día de su semana"""
+        for trade_date, profit in days.items():
+            day = datetime.strptime(trade_date, '%Y-%m-%d').date()
+            weekday = day.weekday()
+            if weekday >= len(DAY_COLUMNS):
+                continue  # Las operaciones de fin de semana quedan solo en trades
+            column = DAY_COLUMNS[weekday]
+            monday = (day - timedelta(days=weekday)).isoformat()
+            conn.execute(f'''
+                INSERT INTO trading_weeks (week_start_date, {column}) VALUES (?, ?)
+                ON CONFLICT(week_start_date) DO UPDATE SET
+                    {column} = excluded.{column}, updated_at = CURRENT_TIMESTAMP
+            ''', (monday, profit))
+
+    def get_daily_trade_totals(self, start: Optional[str] = None,
+                               end: Optional[str] = None) -> List[tuple]:
+        """(fecha, operaciones, total en centavos) de cada día con operaciones, en orden cronológico"""
+        where, params = self._range_clause(start, end, 'trade_date')
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                return conn.execute("SELECT trade_date, trades, profit_cents FROM trade_daily_totals" + where +
+                                    " ORDER BY trade_date ASC", params).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error al leer los totales de operaciones: {e}")
+            return []
+
+    def iter_trades(self, start: Optional[str] = None, end: Optional[str] = None,
+                    chunk_size: int = 10000) -> Iterator[tuple]:
+        """Recorrer las operaciones (trade_date entre start y end) en orden de cierre.
+        Cada fila: (trade_id, trade_date, closed_at, asset, direction, stake_cents, profit_cents).
+        Los errores de SQLite se propagan, como en iter_history.
+        """
+        where, params = self._range_clause(start, end, 'trade_date')
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute('''
+                SELECT trade_id, trade_date, closed_at, asset, direction, stake_cents, profit_cents
+                FROM trades''' + where + '''
+                ORDER BY trade_date ASC, closed_at ASC
+            ''', params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    def get_config(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Obtener un valor de la tabla de configuración"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT value FROM app_config WHERE key = ?", (key,))
+                row = cursor.fetchone()
+                return row[0] if row else default
+        except sqlite3.Error as e:
+            print(f"Error al leer la configuración {key}: {e}")
+            return default
+
+    def set_config(self, key: str, value: str) -> bool:
+        """Guardar un valor en la tabla de configuración"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT OR REPLACE INTO app_config (key, value, updated_at)
+                    VALUES (?, ?, CURRENT_TIMESTAMP)
+                ''', (key, value))
+                conn.commit()
+                return True
+        except sqlite3.Error as e:
+            print(f"Error al guardar la configuración {key}: {e}")
+            return False
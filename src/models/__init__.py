@@ -2,5 +2,14 @@
 from .trading_model import TradingDataModel
 from .trading_model_with_db import TradingDataModelWithDB
 from .ai_analyzer import AIAnalyzer
+from .analytics_engine import AnalyticsEngine
+from .incremental_stats import IncrementalStats
+from .risk_metrics import TailRiskAnalyzer
+from .drawdown import DrawdownAnalyzer
+from .weekday_effect import WeekdayEffectAnalyzer
+from .week_patterns import WeekPatternFinder
+from .online_estimator import OnlineRLSEstimator
+from .goal_solver import GoalSolver
+from .custom_metrics import CustomMetricsEngine, FormulaError
 
-__all__ = ['TradingDataModel', 'TradingDataModelWithDB', 'AIAnalyzer']
\ No newline at end of file
+__all__ = ['TradingDataModel', 'TradingDataModelWithDB', 'AIAnalyzer', 'AnalyticsEngine', 'IncrementalStats', 'TailRiskAnalyzer', 'DrawdownAnalyzer', 'WeekdayEffectAnalyzer', 'WeekPatternFinder', 'OnlineRLSEstimator', 'GoalSolver', 'CustomMetricsEngine', 'FormulaError']
\ No newline at end of file
@@ -4,12 +4,21 @@ Proporciona análisis inteligente de patrones y recomendaciones
 """
 
 import random
-from typing import Dict, List
+import zlib
+from typing import Dict, List, Optional
+from .analytics_engine import AnalyticsEngine
+from .risk_metrics import TailRiskAnalyzer
+from .weekday_effect import WeekdayEffectAnalyzer
 
 class AIAnalyzer:
     """Analizador AI para interpretar resultados de trading"""
     
-    def __init__(self):
+    def __init__(self, min_history_weeks: int = 2):
+        self.engine = AnalyticsEngine()
+        self.tail_risk = TailRiskAnalyzer()
+        self.weekday_effect = WeekdayEffectAnalyzer()
+        # Semanas necesarias para basar el análisis en el historial
+        self.min_history_weeks = min_history_weeks
         self.insights = [
             "Tu rendimiento muestra una tendencia positiva consistente.",
             "Considera aumentar tu capital de trading gradualmente.",
@@ -36,8 +45,18 @@ class AIAnalyzer:
             "No inviertas más de lo que puedes permitirte perder."
         ]
     
-    def analyze_weekly_performance(self, summary: Dict, daily_data: Dict) -> Dict:
-        """Analizar el rendimiento semanal y proporcionar insights"""
+    def analyze_weekly_performance(self, summary: Dict, daily_data: Dict, history: Optional[Dict] = None,
+                                   metrics: Optional[Dict] = None, seed: Optional[int] = None,
+                                   risk: Optional[Dict] = None, patterns: Optional[Dict] = None) -> Dict:
+        """Analizar el rendimiento semanal y proporcionar insights.
+        Si se proporciona el historial (ver TradingDataModelWithDB.get_history),
+        las conclusiones se basan en métricas estadísticas de todas las semanas.
+        Si ya se tienen las métricas (p. ej. de IncrementalStats) no se recalculan.
+        El riesgo se evalúa con VaR/ES del historial (ver TailRiskAnalyzer.report).
+        patterns es el informe de WeekPatternFinder.update (forma de la semana actual).
+        El resultado es determinista: los consejos generales se eligen con una
+        semilla derivada de los datos (o la indicada en seed).
+        """
         analysis = {
             'summary': '',
             'insights': [],
@@ -90,15 +109,46 @@ class AIAnalyzer:
             elif wednesday_amount < 0:
                 analysis['insights'].append("Considera revisar tu estrategia de reinversión.")
         
-        # Agregar insights aleatorios relevantes
-        analysis['insights'].extend(random.sample(self.insights, 2))
+        if metrics is None:
+            metrics = {}
+            if history is not None:
+                metrics = self.engine.compute(history.get('amounts', []), history.get('capitals'))
+        
+        if metrics.get('weeks', 0) >= self.min_history_weeks:
+            capital = 0.0
+            if history is not None:
+                if risk is None:
+                    risk = self.tail_risk.report(history['amounts'], history.get('dates'))
+                if len(history.get('capitals', [])):
+                    capital = float(history['capitals'][history.get('current_row', -1)])
+            self._add_history_insights(analysis, metrics)
+            self._add_history_recommendations(analysis, metrics, total_weekly)
+            if history is not None:
+                day_names = list(daily_data) if daily_data and len(daily_data) == 5 else None
+                weekdays = self.weekday_effect.compute(history['amounts'], day_names)
+                self._add_weekday_insights(analysis, weekdays, daily_data)
+                analysis['weekdays'] = weekdays
+            if patterns and patterns.get('current_cluster') is not None:
+                cluster = patterns['clusters'][patterns['current_cluster']]
+                analysis['insights'].append(
+                    f"Esta semana sigue el patrón «{cluster['name']}», visto en {cluster['size']} semanas del historial."
+                )
+            analysis['risk_assessment'] = self._assess_history_risk(metrics, risk, capital)
+            analysis['metrics'] = metrics
+            if risk is not None:
+                analysis['risk'] = risk
+            return analysis
+        
+        # Sin historial suficiente: consejos generales elegidos de forma reproducible
+        rng = random.Random(self._seed_for(summary) if seed is None else seed)
+        analysis['insights'].extend(rng.sample(self.insights, 2))
         
         # Generar recomendaciones basadas en el rendimiento
         if total_weekly < 0:
             analysis['recommendations'].append("Considera reducir el tamaño de tus operaciones temporalmente.")
             analysis['recommendations'].append("Revisa y ajusta tu estrategia antes de continuar.")
         else:
-            analysis['recommendations'].extend(random.sample(self.recommendations, 2))
+            analysis['recommendations'].extend(rng.sample(self.recommendations, 2))
         
         # Evaluación de riesgo
         if performance_percentage > 30 or performance_percentage < -30:
@@ -108,4 +158,131 @@ class AIAnalyzer:
         else:
             analysis['risk_assessment'] = "Riesgo controlado - buena gestión de riesgo."
         
-        return analysis
\ No newline at end of file
+        return analysis
+    
+    def _add_history_insights(self, analysis: Dict, metrics: Dict):
+        """Agregar insights derivados de las métricas del historial"""
+        insights = analysis['insights']
+        
+        # Tendencia: media móvil reciente frente a la anterior
+        window = metrics['rolling_window']
+        rolling_mean = metrics['rolling_mean']
+        previous = metrics['rolling_mean_previous']
+        if rolling_mean > previous:
+            insights.append(f"Tendencia al alza: media de las últimas {window} semanas ${rolling_mean:.2f} (antes ${previous:.2f}).")
+        elif rolling_mean < previous:
+            insights.append(f"Tendencia a la baja: media de las últimas {window} semanas ${rolling_mean:.2f} (antes ${previous:.2f}).")
+        else:
+            insights.append(f"Media de las últimas {window} semanas estable en ${rolling_mean:.2f}.")
+        
+        insights.append(
+            f"Tasa de acierto {metrics['win_rate'] * 100:.1f}% en {metrics['active_days']} días operados "
+            f"(ganancia/pérdida media {self._format_ratio(metrics['win_loss_ratio'])})."
+        )
+        insights.append(
+            f"Factor de beneficio {self._format_ratio(metrics['profit_factor'])} y esperanza "
+            f"de ${metrics['expectancy']:.2f} por día operado."
+        )
+        insights.append(
+            f"Ratio Sharpe {metrics['sharpe_ratio']:.2f} / Sortino {metrics['sortino_ratio']:.2f} "
+            f"en {metrics['weeks']} semanas."
+        )
+    
+    def _add_history_recommendations(self, analysis: Dict, metrics: Dict, total_weekly: float):
+        """Agregar recomendaciones según las métricas del historial"""
+        recommendations = analysis['recommendations']
+        
+        if metrics['expectancy'] < 0:
+            recommendations.append("Tu esperanza por día es negativa: reduce el tamaño de las operaciones hasta corregirla.")
+        elif metrics['profit_factor'] < 1.2:
+            recommendations.append("Tu factor de beneficio es ajustado: prioriza solo los setups de mayor calidad.")
+        else:
+            recommendations.append("Tu ventaja estadística es positiva: mantén la disciplina y el tamaño actual.")
+        
+        if metrics['win_loss_ratio'] < 1:
+            recommendations.append("Tus pérdidas medias superan a tus ganancias medias: ajusta los stop-loss.")
+        elif metrics['rolling_mean'] < metrics['rolling_mean_previous']:
+            recommendations.append("El rendimiento reciente se está enfriando: revisa tus últimas operaciones.")
+        elif total_weekly < 0:
+            recommendations.append("Semana en rojo dentro de un historial sano: no fuerces la recuperación.")
+        else:
+            recommendations.append("Considera aumentar el capital gradualmente mientras la tendencia se mantenga.")
+    
+    def _add_weekday_insights(self, analysis: Dict, weekdays: Dict, daily_data: Dict):
+        """Agregar insights y recomendaciones del efecto día de la semana"""
+        days = {d['day']: d for d in weekdays['days'] if d['n'] > 1}
+        if len(days) < 2:
+            return
+        confidence = weekdays['confidence'] * 100
+        
+        best = days.get(weekdays['best_day'])
+        worst = days.get(weekdays['worst_day'])
+        if best and worst and best is not worst:
+            analysis['insights'].append(
+                f"Mejor día histórico: {best['day']} (media ${best['mean']:.2f}, acierto {best['hit_rate'] * 100:.0f}%); "
+                f"peor: {worst['day']} (media ${worst['mean']:.2f}, acierto {worst['hit_rate'] * 100:.0f}%)."
+            )
+        
+        # Día(s) de reinversión según los destinos de la semana
+        for name, data in (daily_data or {}).items():
+            day = days.get(name)
+            if day and data.get('destination') == 'Reinversión' and day['ci_low'] is not None:
+                analysis['insights'].append(
+                    f"Tu día de reinversión ({name}) promedia ${day['mean']:.2f} "
+                    f"(IC {confidence:.0f}%: ${day['ci_low']:.2f} a ${day['ci_high']:.2f})."
+                )
+        
+        # Solo se recomienda actuar cuando el intervalo bootstrap no incluye el cero
+        losing = [d for d in days.values() if d['ci_high'] is not None and d['ci_high'] < 0]
+        if losing:
+            names = ", ".join(d['day'] for d in losing)
+            analysis['recommendations'].append(
+                f"Pérdidas consistentes los días {names} (IC {confidence:.0f}% bajo cero): reduce el tamaño o evita operar esos días."
+            )
+    
+    def _assess_history_risk(self, metrics: Dict, risk: Optional[Dict] = None, capital: float = 0.0) -> str:
+        """Evaluar el riesgo con el drawdown máximo y, si hay historial, con VaR/ES de cola"""
+        max_drawdown = metrics['max_drawdown'] * 100
+        detail = (
+            f"Drawdown máximo {max_drawdown:.1f}% (mayor caída en monto: ${metrics['max_drawdown_amount']:.2f}), "
+            f"volatilidad semanal reciente ${metrics['rolling_volatility']:.2f}."
+        )
+        level = 2 if max_drawdown > 30 else 1 if max_drawdown > 15 else 0
+        
+        if risk and risk['levels']:
+            confidence = min(risk['levels'])
+            tail = risk['levels'][confidence]
+            daily = tail['daily_historical']
+            weekly = tail['weekly_historical']
+            detail += (
+                f" VaR {confidence * 100:.0f}% diario ${daily['var']:.2f} (ES ${daily['es']:.2f}, "
+                f"normal ${tail['daily_parametric']['var']:.2f}); semanal ${weekly['var']:.2f} "
+                f"(ES ${weekly['es']:.2f})."
+            )
+            if tail['rolling_var'] is not None:
+                trend = "al alza" if tail['rolling_var'] > daily['var'] else "estable o a la baja"
+                detail += (
+                    f" VaR de los últimos {tail['rolling_window']} días ${tail['rolling_var']:.2f} "
+                    f"(riesgo de cola {trend})."
+                )
+            # Pérdida de cola diaria relativa al capital de la semana
+            if capital > 0:
+                tail_loss = daily['es'] / capital * 100
+                level = max(level, 2 if tail_loss > 10 else 1 if tail_loss > 5 else 0)
+        
+        if level == 2:
+            return f"Alto riesgo detectado - {detail}"
+        if level == 1:
+            return f"Riesgo moderado - {detail}"
+        return f"Riesgo controlado - {detail}"
+    
+    @staticmethod
+    def _seed_for(summary: Dict) -> int:
+        """Semilla estable (entre ejecuciones) derivada del contenido del resumen"""
+        content = repr(sorted((k, round(v, 6) if isinstance(v, float) else v) for k, v in summary.items()))
+        return zlib.crc32(content.encode('utf-8'))
+    
+    @staticmethod
+    def _format_ratio(value: float) -> str:
+        """Formatear un ratio que puede ser infinito (sin pérdidas)"""
+        return "∞" if value == float('inf') else f"{value:.2f}"
@@ -0,0 +1,89 @@
+"""
+Servicio de análisis con caché
+Agrupa resumen semanal, análisis AI, datos de capital, drawdown, métricas personalizadas y
+consejo del día en un solo resultado reutilizable por el panel de resumen, los consejos y
+las exportaciones
+"""
+
+from datetime import datetime
+from typing import Dict, Optional
+from .ai_analyzer import AIAnalyzer
+from .week_patterns import WeekPatternFinder
+from ..utils import i18n
+from ..utils.advice import get_daily_advice
+from ..utils.cache import LRUCache
+
+
+class AnalysisService:
+    """Ejecuta el pipeline de análisis una sola vez por contenido de semana"""
+
+    def __init__(self, ai_analyzer: Optional[AIAnalyzer] = None, max_entries: int = 64):
+        self.ai_analyzer = ai_analyzer or AIAnalyzer()
+        # Conserva el ajuste entre análisis: las semanas nuevas solo se asignan
+        self.patterns = WeekPatternFinder()
+        self.cache = LRUCache(max_entries)
+
+    def make_key(self, model, today_idx: Optional[int] = None) -> tuple:
+        """Clave de caché: montos de la semana, capital inicial, idioma y huella del historial.
+        El día de la semana se incluye porque el consejo del día depende de él, la fecha
+        porque el riesgo de cola excluye los días posteriores a hoy, y las definiciones de
+        métricas personalizadas porque cambian el resultado.
+        """
+        if today_idx is None:
+            today_idx = datetime.now().weekday()
+        amounts = tuple(round(float(model.daily_amounts.get(day, 0.0)), 6) for day in model.days)
+        return (
+            model.week_start_date.isoformat(),
+            amounts,
+            round(float(model.initial_capital), 6),
+            i18n.current_language,
+            model.get_history_fingerprint(),
+            today_idx,
+            model.custom_metrics.revision,
+            datetime.now().date().isoformat()
+        )
+
+    def analyze(self, model) -> Dict:
+        """Obtener el resultado completo del análisis (desde caché si no hubo cambios).
+        Acepta el modelo o una WeekSnapshot (para ejecutarse fuera del hilo de la GUI).
+        El dict devuelto se comparte entre consumidores: no debe modificarse.
+        """
+        today_idx = datetime.now().weekday()
+        key = self.make_key(model, today_idx)
+        result = self.cache.get(key)
+        if result is None:
+            result = self._run(model, key, today_idx)
+            # Si el idioma cambió durante el cálculo, el consejo no corresponde a la clave
+            if i18n.current_language == key[3]:
+                self.cache.put(key, result)
+        return result
+
+    def get_cached(self, model) -> Optional[Dict]:
+        """Obtener el resultado solo si ya está en caché (sin calcular)"""
+        return self.cache.get(self.make_key(model))
+
+    def _run(self, model, key: tuple, today_idx: int) -> Dict:
+        """Calcular todas las piezas del análisis"""
+        summary = model.get_weekly_summary()
+        history = model.get_history()
+        patterns = self.patterns.update(history, model.days)
+        ai_analysis = self.ai_analyzer.analyze_weekly_performance(
+            summary, model.data, history=history, metrics=model.get_history_metrics(),
+            patterns=patterns
+        )
+        capital = {
+            'initial_capital': model.initial_capital,
+            'current_balance': model.get_current_balance(),
+            'total_profit_loss': model.get_total_profit_loss(),
+            'profit_loss_percentage': model.get_profit_loss_percentage()
+        }
+        return {
+            'key': key,
+            'summary': summary,
+            'ai_analysis': ai_analysis,
+            'capital': capital,
+            'drawdown': model.get_drawdown_report(),
+            'patterns': patterns,
+            'custom_metrics': model.get_custom_metrics(),
+            'advice': get_daily_advice(model, today_idx)
+        }
@@ -0,0 +1,97 @@
+"""
+Motor de analítica estadística sobre el historial de trading
+Calcula métricas vectorizadas con NumPy a partir de la matriz semanas x días
+"""
+
+from typing import Dict, Optional
+import numpy as np
+from .equity_curve import drawdown_curve
+
+
+class AnalyticsEngine:
+    """Calcula métricas de rendimiento y riesgo sobre todo el historial"""
+
+    def __init__(self, rolling_window: int = 4, periods_per_year: int = 52):
+        self.rolling_window = max(1, int(rolling_window))
+        self.periods_per_year = periods_per_year
+
+    def compute(self, amounts, capitals: Optional[np.ndarray] = None) -> Dict:
+        """Calcular métricas del historial.
+
+        amounts: matriz (semanas x 5) con el resultado de cada día.
+        capitals: capital inicial de cada semana (opcional).
+        """
+        amounts = np.asarray(amounts, dtype=np.float64).reshape(-1, 5)
+        weeks = amounts.shape[0]
+        if weeks == 0:
+            return {'weeks': 0, 'days': 0}
+
+        if capitals is None:
+            capitals = np.zeros(weeks)
+        capitals = np.asarray(capitals, dtype=np.float64)
+
+        weekly = amounts.sum(axis=1)
+        daily = amounts.ravel()
+
+        # Rendimientos semanales respecto al capital inicial de cada semana
+        weekly_returns = np.divide(weekly, capitals, out=np.zeros(weeks), where=capitals > 0)
+
+        # Media y volatilidad móviles con sumas acumuladas (O(n))
+        window = min(self.rolling_window, weeks)
+        csum = np.concatenate(([0.0], np.cumsum(weekly)))
+        csum_sq = np.concatenate(([0.0], np.cumsum(weekly * weekly)))
+        roll_mean = (csum[window:] - csum[:-window]) / window
+        roll_var = np.maximum((csum_sq[window:] - csum_sq[:-window]) / window - roll_mean * roll_mean, 0.0)
+
+        # Ratios tipo Sharpe/Sortino anualizados sobre rendimientos semanales
+        sharpe = 0.0
+        sortino = 0.0
+        if weeks > 1:
+            mean_ret = weekly_returns.mean()
+            std_ret = weekly_returns.std(ddof=1)
+            if std_ret > 0:
+                sharpe = mean_ret / std_ret * np.sqrt(self.periods_per_year)
+            downside = np.sqrt(np.mean(np.minimum(weekly_returns, 0.0) ** 2))
+            if downside > 0:
+                sortino = mean_ret / downside * np.sqrt(self.periods_per_year)
+
+        # Máximo drawdown sobre la curva de capital acumulada día a día; monto y porcentaje
+        # son máximos independientes (pueden corresponder a tramos distintos)
+        _, _, drawdown, drawdown_pct = drawdown_curve(daily, capitals[0])
+
+        # Estadísticas de días ganadores/perdedores (solo días operados)
+        wins = daily[daily > 0]
+        losses = -daily[daily < 0]
+        active = wins.size + losses.size
+        gross_profit = wins.sum()
+        gross_loss = losses.sum()
+        avg_win = gross_profit / wins.size if wins.size else 0.0
+        avg_loss = gross_loss / losses.size if losses.size else 0.0
+        win_rate = wins.size / active if active else 0.0
+
+        return {
+            'weeks': weeks,
+            'days': int(daily.size),
+            'active_days': int(active),
+            'total_profit_loss': float(weekly.sum()),
+            'mean_weekly': float(weekly.mean()),
+            'rolling_window': window,
+            'rolling_mean': float(roll_mean[-1]),
+            'rolling_mean_previous': float(roll_mean[-2]) if roll_mean.size > 1 else float(roll_mean[-1]),
+            'rolling_volatility': float(np.sqrt(roll_var[-1])),
+            'sharpe_ratio': float(sharpe),
+            'sortino_ratio': float(sortino),
+            'max_drawdown': float(drawdown_pct.max()),
+            'max_drawdown_amount': float(drawdown.max()),
+            'win_rate': float(win_rate),
+            'win_loss_ratio': self._ratio(avg_win, avg_loss),
+            'profit_factor': self._ratio(gross_profit, gross_loss),
+            'expectancy': float(win_rate * avg_win - (1.0 - win_rate) * avg_loss) if active else 0.0,
+        }
+
+    @staticmethod
+    def _ratio(numerator: float, denominator: float) -> float:
+        """Cociente seguro: infinito si no hay pérdidas pero sí ganancias"""
+        if denominator > 0:
+            return float(numerator / denominator)
+        return float('inf') if numerator > 0 else 0.0
@@ -0,0 +1,318 @@
+"""
+Métricas personalizadas definidas por el usuario
+Cada fórmula se analiza una sola vez con `ast` y se compila a una expresión de
+NumPy que se evalúa de una vez sobre todas las semanas del historial
+"""
+
+import ast
+import io
+import operator
+import threading
+import tokenize
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from ..utils.cache import LRUCache
+
+# Niveles de una subexpresión: constante, un valor por semana o un valor por día
+CONST, WEEK, CELL = 0, 1, 2
+
+AGGREGATES = ('sum', 'mean', 'count', 'min', 'max')
+FUNCTIONS = {'abs': np.abs}
+VARIABLES = {
+    'amount': CELL,
+    'destination': CELL,
+    'day': CELL,
+    'weekday': CELL,
+    'initial_capital': WEEK
+}
+# Variables de texto: solo se comparan (destination == 'Retiro'), no admiten aritmética
+TEXT_VARIABLES = ('destination', 'day')
+
+_BINARY = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+    ast.Mod: operator.mod
+}
+_COMPARE = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge
+}
+
+
+class FormulaError(ValueError):
+    """Fórmula inválida: sintaxis, nombre o función no permitidos"""
+
+
+class CustomMetricsEngine:
+    """Compila fórmulas como `sum(amount where destination=='Reinversión') / initial_capital`.
+
+    Variables: amount (monto de cada día), destination, day (nombre del día),
+    weekday (0=Lunes) e initial_capital (de la semana). Las agregaciones sum, mean,
+    count, min y max recorren los días de cada semana y aceptan `where <condición>`.
+    El resultado es un valor por semana; se informa el de la semana activa y la
+    media del historial.
+    """
+
+    def __init__(self, max_entries: int = 8):
+        self.formulas: List[Dict] = []
+        self._compiled: Dict[str, Callable] = {}
+        self._lock = threading.Lock()
+        self.cache = LRUCache(max_entries)
+
+    # ------------------------------------------------------------------
+    # Definiciones
+    # ------------------------------------------------------------------
+    def set_formulas(self, formulas: List[Dict]):
+        """Reemplazar las métricas ({'name', 'formula'}); las inválidas se informan al evaluar"""
+        with self._lock:
+            self.formulas = [{'name': str(f['name']), 'formula': str(f['formula'])} for f in formulas]
+
+    @property
+    def revision(self) -> Tuple:
+        """Firma de las definiciones actuales (para claves de caché)"""
+        return tuple((f['name'], f['formula']) for f in self.formulas)
+
+    def validate(self, formula: str):
+        """Compilar la fórmula y lanzar FormulaError si no es válida"""
+        self._program(formula)
+
+    def _program(self, formula: str) -> Callable:
+        """Programa compilado de la fórmula (se analiza una sola vez por texto)"""
+        with self._lock:
+            program = self._compiled.get(formula)
+        if program is None:
+            program = self.compile(formula)
+            with self._lock:
+                self._compiled[formula] = program
+        return program
+
+    # ------------------------------------------------------------------
+    # Análisis y compilación
+    # ------------------------------------------------------------------
+    @staticmethod
+    def parse(formula: str) -> ast.Expression:
+        """Árbol de la fórmula; `x where cond` se reescribe como el argumento where=cond"""
+        if not formula or not formula.strip():
+            raise FormulaError("La fórmula está vacía")
+        try:
+            tokens = []
+            previous = None
+            for tok in tokenize.generate_tokens(io.StringIO(formula.strip()).readline):
+                if tok.type == tokenize.NAME and tok.string == 'where':
+                    if previous is not None and previous.string != '(':
+                        tokens.append((tokenize.OP, ','))
+                    tokens.extend([(tokenize.NAME, 'where'), (tokenize.OP, '=')])
+                else:
+                    tokens.append((tok.type, tok.string))
+                if tok.type not in (tokenize.NEWLINE, tokenize.NL, tokenize.ENDMARKER):
+                    previous = tok
+            return ast.parse(tokenize.untokenize(tokens).strip(), mode='eval')
+        except (SyntaxError, tokenize.TokenError) as e:
+            raise FormulaError(f"Sintaxis inválida: {e}")
+
+    def compile(self, formula: str) -> Callable:
+        """Compilar la fórmula a una función env -> array (semanas x 1)"""
+        fn, level = self._compile(self.parse(formula).body)
+        if level == CELL:
+            raise FormulaError("La fórmula debe agregar los días con sum, mean, count, min o max")
+        return fn
+
+    @classmethod
+    def _is_text(cls, node: ast.AST) -> bool:
+        """El nodo produce texto (constante, variable de texto o condicional con una rama de texto)"""
+        if isinstance(node, ast.IfExp):
+            return cls._is_text(node.body) or cls._is_text(node.orelse)
+        return ((isinstance(node, ast.Constant) and isinstance(node.value, str))
+                or (isinstance(node, ast.Name) and node.id in TEXT_VARIABLES))
+
+    def _compile(self, node: ast.AST, allow_text: bool = False) -> Tuple[Callable, int]:
+        """Convertir un nodo del árbol en (función, nivel).
+        Las constantes de texto solo se admiten como operando de una comparación (allow_text):
+        con '%' o '*' un texto corto puede generar cadenas de varios GB."""
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float, str)):
+                raise FormulaError(f"Constante no permitida: {node.value!r}")
+            if isinstance(node.value, str) and not allow_text:
+                raise FormulaError(f"El texto {node.value!r} solo puede usarse en una comparación")
+            # Números como float64: con enteros de Python, 9**9**9 no termina nunca
+            value = node.value if isinstance(node.value, str) else np.float64(node.value)
+            return (lambda env: value), CONST
+
+        if isinstance(node, ast.Name):
+            if node.id not in VARIABLES:
+                raise FormulaError(f"Variable desconocida: {node.id}")
+            name = node.id
+            return (lambda env: env[name]), VARIABLES[name]
+
+        if isinstance(node, ast.BinOp):
+            op = _BINARY.get(type(node.op))
+            if op is None:
+                raise FormulaError("Operador no permitido")
+            if self._is_text(node.left) or self._is_text(node.right):
+                raise FormulaError("Operación aritmética no permitida con texto")
+            left, left_level = self._compile(node.left)
+            right, right_level = self._compile(node.right)
+            return (lambda env: op(left(env), right(env))), max(left_level, right_level)
+
+        if isinstance(node, ast.UnaryOp):
+            if self._is_text(node.operand):
+                raise FormulaError("Operación aritmética no permitida con texto")
+            operand, level = self._compile(node.operand)
+            if isinstance(node.op, ast.USub):
+                return (lambda env: -operand(env)), level
+            if isinstance(node.op, ast.UAdd):
+                return operand, level
+            if isinstance(node.op, ast.Not):
+                return (lambda env: np.logical_not(operand(env))), level
+            raise FormulaError("Operador no permitido")
+
+        if isinstance(node, ast.BoolOp):
+            parts = [self._compile(value) for value in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            fns = [fn for fn, _ in parts]
+
+            def boolean(env):
+                result = fns[0](env)
+                for fn in fns[1:]:
+                    result = combine(result, fn(env))
+                return result
+            return boolean, max(level for _, level in parts)
+
+        if isinstance(node, ast.Compare):
+            first, level = self._compile(node.left, allow_text=True)
+            steps = []
+            for op_node, comparator in zip(node.ops, node.comparators):
+                op = _COMPARE.get(type(op_node))
+                if op is None:
+                    raise FormulaError("Comparación no permitida")
+                fn, comparator_level = self._compile(comparator, allow_text=True)
+                steps.append((op, fn))
+                level = max(level, comparator_level)
+
+            def compare(env):
+                # Comparaciones encadenadas: a < b < c equivale a (a < b) and (b < c)
+                left = first(env)
+                result = None
+                for op, fn in steps:
+                    right = fn(env)
+                    current = np.asarray(op(left, right))
+                    result = current if result is None else np.logical_and(result, current)
+                    left = right
+                return result
+            return compare, level
+
+        if isinstance(node, ast.IfExp):
+            test, test_level = self._compile(node.test)
+            body, body_level = self._compile(node.body)
+            orelse, else_level = self._compile(node.orelse)
+            return (lambda env: np.where(test(env), body(env), orelse(env))), max(test_level, body_level, else_level)
+
+        if isinstance(node, ast.Call):
+            return self._compile_call(node)
+
+        raise FormulaError(f"Expresión no permitida: {type(node).__name__}")
+
+    def _compile_call(self, node: ast.Call) -> Tuple[Callable, int]:
+        """Agregaciones por semana (con where opcional) y funciones elemento a elemento"""
+        if not isinstance(node.func, ast.Name):
+            raise FormulaError("Solo se permiten llamadas a funciones por nombre")
+        name = node.func.id
+        where = None
+        for keyword in node.keywords:
+            if keyword.arg != 'where' or name not in AGGREGATES:
+                raise FormulaError(f"Argumento no permitido en {name}: {keyword.arg}")
+            where, _ = self._compile(keyword.value)
+        args = [self._compile(arg) for arg in node.args]
+
+        if name in FUNCTIONS:
+            if len(args) != 1 or where is not None:
+                raise FormulaError(f"{name} recibe un solo argumento")
+            func = FUNCTIONS[name]
+            (arg, level), = args
+            return (lambda env: func(arg(env))), level
+
+        if name not in AGGREGATES:
+            raise FormulaError(f"Función desconocida: {name}")
+        if len(args) > 1 or (not args and name != 'count'):
+            raise FormulaError(f"{name} recibe un solo argumento")
+        value = args[0][0] if args else None
+
+        def aggregate(env):
+            shape = env['_shape']
+            mask = np.ones(shape, dtype=bool)
+            if where is not None:
+                mask = np.broadcast_to(np.asarray(where(env), dtype=bool), shape)
+            if value is None:
+                return mask.sum(axis=1, keepdims=True).astype(np.float64)
+            if name == 'count':
+                return (mask & np.broadcast_to(np.asarray(value(env), dtype=bool), shape)).sum(
+                    axis=1, keepdims=True).astype(np.float64)
+            cells = np.broadcast_to(np.asarray(value(env), dtype=np.float64), shape)
+            if name == 'sum':
+                return np.where(mask, cells, 0.0).sum(axis=1, keepdims=True)
+            counts = mask.sum(axis=1, keepdims=True)
+            if name == 'mean':
+                total = np.where(mask, cells, 0.0).sum(axis=1, keepdims=True)
+                return np.divide(total, counts, out=np.full(counts.shape, np.nan), where=counts > 0)
+            if name == 'min':
+                result = np.where(mask, cells, np.inf).min(axis=1, keepdims=True)
+            else:
+                result = np.where(mask, cells, -np.inf).max(axis=1, keepdims=True)
+            return np.where(counts > 0, result, np.nan)
+        return aggregate, WEEK
+
+    # ------------------------------------------------------------------
+    # Evaluación
+    # ------------------------------------------------------------------
+    def evaluate(self, history: Dict, destinations: List[str], day_names: List[str],
+                 version: Optional[int] = None) -> List[Dict]:
+        """Evaluar todas las métricas sobre el historial (en caché por versión de datos y definiciones)"""
+        formulas = list(self.formulas)
+        if not formulas:
+            return []
+        if version is None:
+            return self._evaluate(formulas, history, destinations, day_names)
+        return self.cache.get_or_compute(
+            (version, tuple((f['name'], f['formula']) for f in formulas)),
+            lambda: self._evaluate(formulas, history, destinations, day_names)
+        )
+
+    def _evaluate(self, formulas: List[Dict], history: Dict, destinations: List[str],
+                  day_names: List[str]) -> List[Dict]:
+        amounts = np.asarray(history['amounts'], dtype=np.float64).reshape(-1, 5)
+        env = {
+            '_shape': amounts.shape,
+            'amount': amounts,
+            'destination': np.array(destinations)[None, :],
+            'day': np.array(day_names)[None, :],
+            'weekday': np.arange(5)[None, :],
+            'initial_capital': np.asarray(history['capitals'], dtype=np.float64)[:, None]
+        }
+        current_row = history.get('current_row')
+
+        results = []
+        for definition in formulas:
+            entry = {'name': definition['name'], 'formula': definition['formula'],
+                     'value': None, 'mean': None, 'error': None}
+            try:
+                with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                    values = np.broadcast_to(
+                        np.asarray(self._program(definition['formula'])(env), dtype=np.float64),
+                        (amounts.shape[0], 1)
+                    ).ravel()
+                finite = np.isfinite(values)
+                if current_row is not None and current_row < values.size and finite[current_row]:
+                    entry['value'] = float(values[current_row])
+                if finite.any():
+                    entry['mean'] = float(values[finite].mean())
+            except (FormulaError, TypeError, ValueError) as e:
+                entry['error'] = str(e)
+            results.append(entry)
+        return results
@@ -0,0 +1,107 @@
+"""
+Análisis de drawdown, recuperación y rachas sobre la serie diaria del historial
+Todo en O(n) con NumPy sobre la curva y las rachas de equity_curve (las mismas que
+usan AnalyticsEngine e IncrementalStats)
+"""
+
+from typing import Dict, List, Optional
+import numpy as np
+from .equity_curve import drawdown_curve, sign_runs
+from ..utils.cache import LRUCache
+
+
+class DrawdownAnalyzer:
+    """Drawdown máximo, duración, tiempo de recuperación y rachas, con caché por versión de datos"""
+
+    def __init__(self, max_entries: int = 8):
+        self.cache = LRUCache(max_entries)
+
+    def analyze(self, amounts, start_capital: float, dates: Optional[List[str]] = None,
+                version: Optional[int] = None) -> Dict:
+        """Obtener el informe para la matriz semanas x días.
+        Con version (el data_version del modelo) el resultado se reutiliza mientras no cambie.
+        """
+        if version is None:
+            return self.compute(amounts, start_capital, dates)
+        return self.cache.get_or_compute(
+            (version, float(start_capital)),
+            lambda: self.compute(amounts, start_capital, dates)
+        )
+
+    @staticmethod
+    def _runs(mask: np.ndarray):
+        """Run-length encoding de una máscara booleana: (inicios, longitudes) de los tramos True"""
+        padded = np.concatenate(([0], mask.astype(np.int8), [0]))
+        edges = np.diff(padded)
+        starts = np.flatnonzero(edges == 1)
+        return starts, np.flatnonzero(edges == -1) - starts
+
+    def compute(self, amounts, start_capital: float, dates: Optional[List[str]] = None) -> Dict:
+        """Calcular el informe completo (sin caché).
+        Monto, porcentaje, fechas y duración del drawdown máximo son del mismo tramo: el de
+        mayor monto. deepest_drawdown_pct es el mayor porcentaje, que puede ser de otro tramo."""
+        amounts = np.asarray(amounts, dtype=np.float64).reshape(-1, 5)
+        daily = amounts.ravel()
+        if dates:
+            day_dates = (np.array(dates, dtype='datetime64[D]')[:, None] + np.arange(5)).ravel()
+        else:
+            day_dates = None
+
+        def date_of(day_index: Optional[int]) -> Optional[str]:
+            if day_dates is None or day_index is None or daily.size == 0:
+                return None
+            return str(day_dates[min(max(day_index, 0), daily.size - 1)])
+
+        # Valores al cierre de cada día; el capital inicial es el máximo antes del día 0
+        equity, peak, drawdown, drawdown_pct = drawdown_curve(daily, start_capital)
+        trough = int(np.argmax(drawdown)) if daily.size else 0
+        max_dd = float(drawdown[trough]) if daily.size else 0.0
+        if max_dd > 0:
+            peak_value = float(peak[trough])
+            # Último día en el máximo antes del valle (-1: el capital inicial)
+            at_peak = np.flatnonzero(equity[:trough] >= peak_value)
+            peak_idx = int(at_peak[-1]) if at_peak.size else -1
+            recovered = np.flatnonzero(equity[trough:] >= peak_value)
+            recovery_idx = trough + int(recovered[0]) if recovered.size else None
+        else:
+            peak_idx = trough
+            recovery_idx = None
+
+        # Periodos bajo el agua (por debajo del máximo previo)
+        underwater_starts, underwater_lengths = self._runs(drawdown > 0)
+        current_underwater = int(underwater_lengths[-1]) if daily.size and drawdown[-1] > 0 else 0
+
+        # Rachas sobre los días operados (los días en cero no rompen ni suman)
+        traded, run_starts, run_lengths, run_signs = sign_runs(daily)
+
+        def longest(sign: int):
+            lengths = np.where(run_signs == sign, run_lengths, 0)
+            if not lengths.any():
+                return 0, None
+            i = int(np.argmax(lengths))
+            return int(lengths[i]), date_of(int(traded[run_starts[i]]))
+
+        longest_win, win_start = longest(1)
+        longest_loss, loss_start = longest(-1)
+        current_streak = int(run_lengths[-1]) * int(run_signs[-1]) if run_lengths.size else 0
+
+        return {
+            'days': int(daily.size),
+            'max_drawdown_amount': max_dd,
+            'max_drawdown_pct': float(drawdown_pct[trough]) if max_dd > 0 else 0.0,
+            'deepest_drawdown_pct': float(drawdown_pct.max()) if daily.size else 0.0,
+            'peak_date': date_of(peak_idx) if max_dd > 0 else None,
+            'trough_date': date_of(trough) if max_dd > 0 else None,
+            'recovery_date': date_of(recovery_idx) if recovery_idx is not None else None,
+            # Duraciones en días de trading
+            'drawdown_duration': trough - peak_idx,
+            'time_to_recover': recovery_idx - trough if recovery_idx is not None else None,
+            'longest_underwater': int(underwater_lengths.max()) if underwater_lengths.size else 0,
+            'current_drawdown_amount': float(drawdown[-1]) if daily.size else 0.0,
+            'current_underwater': current_underwater,
+            'longest_win_streak': longest_win,
+            'longest_win_start': win_start,
+            'longest_loss_streak': longest_loss,
+            'longest_loss_start': loss_start,
+            'current_streak': current_streak
+        }
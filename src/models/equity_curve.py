@@ -0,0 +1,54 @@
+"""
+Curva de capital, drawdown y rachas compartidos por las métricas del historial
+AnalyticsEngine, IncrementalStats y DrawdownAnalyzer usan estas mismas funciones
+"""
+
+from typing import Optional, Tuple
+import numpy as np
+
+
+def drawdown_curve(daily, start: float, peak: Optional[float] = None) -> Tuple[np.ndarray, ...]:
+    """Capital, máximo previo, drawdown y drawdown relativo al cierre de cada día.
+
+    start es el capital antes del primer día y cuenta como máximo inicial; peak permite
+    continuar una curva ya recorrida (el máximo alcanzado hasta start).
+    """
+    daily = np.asarray(daily, dtype=np.float64)
+    start = float(start)
+    equity = start + np.cumsum(daily)
+    running = np.maximum.accumulate(np.concatenate(([start if peak is None else max(peak, start)], equity)))[1:]
+    drawdown = running - equity
+    drawdown_pct = np.divide(drawdown, running, out=np.zeros_like(drawdown), where=running > 0)
+    return equity, running, drawdown, drawdown_pct
+
+
+def sign_runs(values) -> Tuple[np.ndarray, ...]:
+    """Rachas de signo sobre los días operados (los días en cero no rompen ni suman).
+    Devuelve (índices operados, inicio de cada racha entre ellos, longitudes, signos)."""
+    values = np.asarray(values, dtype=np.float64)
+    traded = np.flatnonzero(values != 0)
+    signs = np.sign(values[traded])
+    if signs.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return traded, empty, empty, empty
+    # Codificación por longitud de rachas (run-length encoding)
+    starts = np.flatnonzero(np.concatenate(([True], signs[1:] != signs[:-1])))
+    lengths = np.diff(np.append(starts, signs.size))
+    return traded, starts, lengths, signs[starts].astype(int)
+
+
+def advance_streaks(values, state: Optional[tuple] = None) -> tuple:
+    """Avanzar las rachas (signo actual, longitud, mayor racha ganadora, mayor racha perdedora).
+    Con state se continúan las rachas de un tramo anterior."""
+    sign, length, longest_win, longest_loss = state or (0, 0, 0, 0)
+    _, _, lengths, run_signs = sign_runs(values)
+    if lengths.size == 0:
+        return sign, length, longest_win, longest_loss
+    lengths = lengths.copy()
+    if run_signs[0] == sign:
+        lengths[0] += length
+    wins = lengths[run_signs > 0]
+    losses = lengths[run_signs < 0]
+    longest_win = max(longest_win, int(wins.max()) if wins.size else 0)
+    longest_loss = max(longest_loss, int(losses.max()) if losses.size else 0)
+    return int(run_signs[-1]), int(lengths[-1]), longest_win, longest_loss
@@ -0,0 +1,162 @@
+"""
+Solver de metas de capital
+Calcula el rendimiento diario promedio necesario para llegar a un balance objetivo
+en una fecha, aplicando la política de rollover (retiro del 30% de las ganancias
+semanales; el resto, incluida la reinversión del miércoles, pasa a la semana siguiente)
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List, Sequence, Union
+import numpy as np
+
+DAYS_PER_WEEK = 5
+# Rendimiento diario mínimo: por debajo de -20% diario se pierde toda la semana
+MIN_DAILY_RETURN = -1.0 / DAYS_PER_WEEK
+
+
+class GoalSolver:
+    """Resuelve el rendimiento diario requerido para una o muchas metas a la vez.
+
+    El rendimiento r es el monto diario promedio como fracción del capital inicial
+    de cada semana (así se miden los montos en la app). El balance en la fecha
+    objetivo es el capital que queda tras el rollover de la última semana cerrada.
+    """
+
+    def __init__(self, withdrawal_rate: float = 0.30, iterations: int = 100):
+        self.withdrawal_rate = withdrawal_rate
+        self.iterations = iterations
+
+    # ------------------------------------------------------------------
+    # Entradas desde el modelo
+    # ------------------------------------------------------------------
+    @staticmethod
+    def model_state(model) -> Dict:
+        """Estado de la semana activa necesario para resolver"""
+        amounts = [float(model.daily_amounts.get(day, 0.0)) for day in model.days]
+        # Días restantes: los que siguen al último día con monto cargado
+        entered = [i for i, amount in enumerate(amounts) if amount != 0]
+        remaining = DAYS_PER_WEEK - (entered[-1] + 1 if entered else 0)
+        return {
+            'capital': float(model.initial_capital),
+            'week_total': float(model.get_total_profit_loss()),
+            'remaining_days': remaining,
+            'week_start': model.week_start_date
+        }
+
+    def weeks_until(self, week_start: date, target_dates) -> np.ndarray:
+        """Semanas completas (lunes a viernes) posteriores a la activa que cierran antes de cada fecha"""
+        next_monday = np.datetime64(week_start + timedelta(days=7), 'D')
+        offsets = (np.asarray(target_dates, dtype='datetime64[D]') - next_monday).astype(np.int64)
+        return np.where(offsets >= DAYS_PER_WEEK - 1, (offsets - (DAYS_PER_WEEK - 1)) // 7 + 1, 0)
+
+    # ------------------------------------------------------------------
+    # Política de rollover vectorizada
+    # ------------------------------------------------------------------
+    def _rollover(self, capital, profit):
+        return capital + profit - self.withdrawal_rate * np.maximum(profit, 0.0)
+
+    def balance_at(self, r, state: Dict, weeks) -> np.ndarray:
+        """Capital tras el rollover de la última semana para rendimientos r (vectorizado)"""
+        r = np.asarray(r, dtype=np.float64)
+        capital = state['capital']
+        after_current = self._rollover(capital, state['week_total'] + state['remaining_days'] * r * capital)
+        weekly = self._rollover(1.0, DAYS_PER_WEEK * r)
+        return after_current * weekly ** np.asarray(weeks)
+
+    # ------------------------------------------------------------------
+    # Resolución
+    # ------------------------------------------------------------------
+    def solve(self, state: Dict, targets: Union[float, Sequence[float]],
+              target_dates: Union[date, Sequence[date]]) -> Dict:
+        """Rendimiento diario requerido para cada par (meta, fecha).
+
+        Con la semana activa ya cerrada (sin días restantes) hay forma cerrada;
+        si no, se usa bisección vectorizada sobre todas las metas a la vez.
+        """
+        targets = np.atleast_1d(np.asarray(targets, dtype=np.float64))
+        dates = np.atleast_1d(np.asarray(target_dates, dtype='datetime64[D]'))
+        targets, dates = np.broadcast_arrays(targets, dates)
+        weeks = self.weeks_until(state['week_start'], dates)
+        capital = state['capital']
+        rate = np.full(targets.shape, np.nan)
+
+        if state['remaining_days'] == 0:
+            method = 'closed_form'
+            base = self._rollover(capital, state['week_total'])
+            solvable = (weeks > 0) & (targets > 0) & (base > 0)
+            growth = np.ones(targets.shape)
+            growth[solvable] = (targets[solvable] / base) ** (1.0 / weeks[solvable]) - 1.0
+            # Semanas ganadoras retienen (1 - retiro) de la ganancia; las perdedoras no retiran
+            gains = solvable & (growth >= 0)
+            losses = solvable & (growth < 0)
+            rate[gains] = growth[gains] / (DAYS_PER_WEEK * (1.0 - self.withdrawal_rate))
+            rate[losses] = growth[losses] / DAYS_PER_WEEK
+        else:
+            method = 'bisection'
+            solvable = (targets > 0) & ((weeks > 0) | (state['remaining_days'] > 0))
+            low = np.full(targets.shape, MIN_DAILY_RETURN)
+            high = np.full(targets.shape, 0.01)
+            # Ampliar el límite superior hasta cubrir cada meta
+            for _ in range(60):
+                short = solvable & (self.balance_at(high, state, weeks) < targets)
+                if not short.any():
+                    break
+                high[short] *= 2.0
+            for _ in range(self.iterations):
+                mid = (low + high) / 2.0
+                below = self.balance_at(mid, state, weeks) < targets
+                low = np.where(below, mid, low)
+                high = np.where(below, high, mid)
+            rate[solvable] = high[solvable]
+
+        feasible = solvable & np.isfinite(rate) & (rate > MIN_DAILY_RETURN)
+        # Metas que el saldo ya alcanza sin operar (por ejemplo, fecha dentro de la semana
+        # activa ya cerrada): factibles con rendimiento requerido 0
+        reached = self.balance_at(0.0, state, weeks) >= targets
+        rate = np.where(reached & ~feasible, 0.0, rate)
+        feasible = feasible | reached
+        return {
+            'method': method,
+            'targets': targets.tolist(),
+            'target_dates': [str(d) for d in dates],
+            'weeks': weeks.tolist(),
+            'remaining_days': state['remaining_days'],
+            'required_daily_return': np.where(feasible, rate, np.nan).tolist(),
+            'required_daily_amount': np.where(feasible, rate * capital, np.nan).tolist(),
+            'already_reached': reached.tolist(),
+            'feasible': feasible.tolist()
+        }
+
+    def schedule(self, state: Dict, daily_return: float, weeks: int) -> List[Dict]:
+        """Tabla semana a semana aplicando el rendimiento diario y la política de rollover"""
+        rows = []
+        capital = state['capital']
+        week_start = state['week_start']
+        profit = state['week_total'] + state['remaining_days'] * daily_return * capital
+        for week in range(weeks + 1):
+            if week > 0:
+                profit = DAYS_PER_WEEK * daily_return * capital
+            withdrawal = self.withdrawal_rate * max(0.0, profit)
+            end_capital = capital + profit - withdrawal
+            rows.append({
+                'week_start': (week_start + timedelta(days=7 * week)).isoformat(),
+                'start_capital': capital,
+                'daily_amount': daily_return * capital,
+                'weekly_profit': profit,
+                'withdrawal': withdrawal,
+                'end_capital': end_capital
+            })
+            capital = end_capital
+        return rows
+
+    def solve_for_model(self, model, targets, target_dates) -> Dict:
+        """Resolver con el estado actual del modelo y agregar la tabla de la primera meta.
+        Crear el solver con GoalSolver(model.withdrawal_rate) para usar la política del modelo.
+        """
+        state = self.model_state(model)
+        result = self.solve(state, targets, target_dates)
+        result['current_balance'] = float(model.get_current_balance())
+        result['schedule'] = []
+        if result['feasible'] and result['feasible'][0]:
+            result['schedule'] = self.schedule(state, result['required_daily_return'][0], result['weeks'][0])
+        return result
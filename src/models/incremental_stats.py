@@ -0,0 +1,249 @@
+"""
+Acumulador incremental de estadísticas del historial
+Mantiene métricas de todo el historial actualizadas en O(1) por cada edición de un día
+"""
+
+import copy
+from typing import Dict, Optional
+import numpy as np
+from .equity_curve import advance_streaks, drawdown_curve
+
+
+class IncrementalStats:
+    """Estadísticas del historial actualizadas con deltas.
+
+    Las métricas que no dependen del orden (media/varianza de Welford, sumas,
+    conteos) se corrigen con la diferencia entre el monto anterior y el nuevo.
+    Las que dependen del orden (drawdown, rachas, EWMA) guardan el estado al
+    final de las semanas anteriores a la activa y solo re-escanean sus 5 días.
+    Si la semana activa no es la última del historial, las semanas posteriores
+    se recorren con NumPy al leer las métricas.
+    """
+
+    def __init__(self, ewma_alpha: float = 0.1, rolling_window: int = 4, periods_per_year: int = 52):
+        self.ewma_alpha = ewma_alpha
+        self.rolling_window = max(1, int(rolling_window))
+        self.periods_per_year = periods_per_year
+        self.amounts = None
+        self.capitals = None
+        self.current_row = 0
+        self.full_recomputes = 0
+
+    # ------------------------------------------------------------------
+    # Recalculo completo (cargas de historial o importaciones)
+    # ------------------------------------------------------------------
+    def rebuild(self, amounts: np.ndarray, capitals: np.ndarray, current_row: int):
+        """Recalcular todo el estado a partir de la matriz semanas x días.
+        amounts y capitals se guardan por referencia: el modelo los mantiene sincronizados.
+        """
+        self.amounts = amounts
+        self.capitals = capitals
+        self.current_row = current_row
+        self.full_recomputes += 1
+
+        daily = amounts.ravel()
+        weekly = amounts.sum(axis=1)
+        returns = self._weekly_returns(weekly, capitals)
+
+        # Welford sobre días, totales semanales y rendimientos semanales
+        self.n_days = daily.size
+        self.day_mean = float(daily.mean()) if daily.size else 0.0
+        self.day_m2 = float(((daily - self.day_mean) ** 2).sum())
+        self.n_weeks = weekly.size
+        self.week_mean = float(weekly.mean()) if weekly.size else 0.0
+        self.week_m2 = float(((weekly - self.week_mean) ** 2).sum())
+        self.ret_mean = float(returns.mean()) if returns.size else 0.0
+        self.ret_m2 = float(((returns - self.ret_mean) ** 2).sum())
+        self.ret_downside_sq = float((np.minimum(returns, 0.0) ** 2).sum())
+
+        # Conteos y sumas de días ganadores/perdedores
+        self.wins = int((daily > 0).sum())
+        self.losses = int((daily < 0).sum())
+        self.gross_profit = float(daily[daily > 0].sum())
+        self.gross_loss = float(-daily[daily < 0].sum())
+
+        self._commit_prefix()
+
+    def _commit_prefix(self):
+        """Guardar el estado dependiente del orden al final de las semanas previas a la activa"""
+        prefix = self.amounts[:self.current_row].ravel()
+        start = float(self.capitals[0]) if self.capitals.size else 0.0
+
+        equity, peak, drawdown, drawdown_pct = drawdown_curve(prefix, start)
+
+        self.prefix_equity = float(equity[-1]) if equity.size else start
+        self.prefix_peak = float(peak[-1]) if peak.size else start
+        self.prefix_max_dd = float(drawdown.max()) if drawdown.size else 0.0
+        self.prefix_max_dd_pct = float(drawdown_pct.max()) if drawdown_pct.size else 0.0
+        self.prefix_ewma = self._ewma(prefix)
+        self.prefix_streak = advance_streaks(prefix)
+
+    def detached(self) -> 'IncrementalStats':
+        """Copia del estado acumulado (solo escalares, O(1)) sin los arrays del historial.
+        Sirve para leer las métricas en otro hilo: ver attach()."""
+        state = copy.copy(self)
+        state.amounts = None
+        state.capitals = None
+        return state
+
+    def attach(self, amounts: np.ndarray, capitals: np.ndarray):
+        """Asociar a un estado separado los arrays con los que se corresponde"""
+        self.amounts = amounts
+        self.capitals = capitals
+
+    # ------------------------------------------------------------------
+    # Actualizaciones O(1)
+    # ------------------------------------------------------------------
+    def update_day(self, col: int, new: float):
+        """Aplicar el nuevo monto de un día de la semana activa usando el delta con el anterior"""
+        if self.amounts is None:
+            return
+        row = self.current_row
+        old = float(self.amounts[row, col])
+        if old == new:
+            return
+        delta = new - old
+        self.amounts[row, col] = new
+
+        # Welford con reemplazo de un valor (n constante)
+        mean_old = self.day_mean
+        self.day_mean += delta / self.n_days
+        self.day_m2 += delta * (new - self.day_mean + old - mean_old)
+
+        week_new = float(self.amounts[row].sum())
+        self._replace_week(week_new - delta, week_new, self.capitals[row], self.capitals[row])
+
+        # Conteos de días ganadores/perdedores
+        self._count_day(old, -1)
+        self._count_day(new, 1)
+
+    def update_capital(self, new: float):
+        """Aplicar el cambio del capital inicial de la semana activa"""
+        if self.amounts is None:
+            return
+        old = float(self.capitals[self.current_row])
+        if old == new:
+            return
+        self.capitals[self.current_row] = new
+        week = float(self.amounts[self.current_row].sum())
+        self._replace_week(week, week, old, new)
+        if self.current_row == 0:
+            # El capital de la primera semana es el origen de la curva de capital
+            self._commit_prefix()
+
+    def _replace_week(self, week_old: float, week_new: float, cap_old: float, cap_new: float):
+        """Reemplazar el total y el rendimiento de una semana en los acumuladores de Welford"""
+        mean_old = self.week_mean
+        self.week_mean += (week_new - week_old) / self.n_weeks
+        self.week_m2 += (week_new - week_old) * (week_new - self.week_mean + week_old - mean_old)
+
+        ret_old = week_old / cap_old if cap_old > 0 else 0.0
+        ret_new = week_new / cap_new if cap_new > 0 else 0.0
+        mean_old = self.ret_mean
+        self.ret_mean += (ret_new - ret_old) / self.n_weeks
+        self.ret_m2 += (ret_new - ret_old) * (ret_new - self.ret_mean + ret_old - mean_old)
+        self.ret_downside_sq += min(ret_new, 0.0) ** 2 - min(ret_old, 0.0) ** 2
+
+    def _count_day(self, value: float, sign: int):
+        """Sumar (sign=1) o restar (sign=-1) un día en los conteos de ganancias/pérdidas"""
+        if value > 0:
+            self.wins += sign
+            self.gross_profit += sign * value
+        elif value < 0:
+            self.losses += sign
+            self.gross_loss -= sign * value
+
+    # ------------------------------------------------------------------
+    # Lectura de métricas
+    # ------------------------------------------------------------------
+    def snapshot(self) -> Dict:
+        """Devolver las métricas con las mismas claves que AnalyticsEngine.compute"""
+        if self.amounts is None or self.n_weeks == 0:
+            return {'weeks': 0, 'days': 0}
+
+        # Estado dependiente del orden: prefijo + 5 días de la semana activa
+        # (y las semanas posteriores si se cargó una semana antigua)
+        tail = self.amounts[self.current_row:].ravel()
+        _, _, drawdown, drawdown_pct = drawdown_curve(tail, self.prefix_equity, self.prefix_peak)
+        # Máximos independientes: el porcentual puede darse en otro tramo que el de mayor monto
+        max_dd = max(self.prefix_max_dd, float(drawdown.max()))
+        max_dd_pct = max(self.prefix_max_dd_pct, float(drawdown_pct.max()))
+        ewma = self._ewma(tail, self.prefix_ewma)
+        streak = advance_streaks(tail, self.prefix_streak)
+        current_sign, current_len, longest_win, longest_loss = streak
+
+        # Media y volatilidad móviles sobre las últimas semanas (O(ventana))
+        window = min(self.rolling_window, self.n_weeks)
+        weekly_tail = self.amounts[-(window + 1):].sum(axis=1)
+        recent = weekly_tail[-window:]
+        previous = weekly_tail[:window] if weekly_tail.size > window else recent
+
+        sharpe = 0.0
+        sortino = 0.0
+        if self.n_weeks > 1:
+            std_ret = np.sqrt(max(self.ret_m2, 0.0) / (self.n_weeks - 1))
+            if std_ret > 0:
+                sharpe = self.ret_mean / std_ret * np.sqrt(self.periods_per_year)
+            downside = np.sqrt(self.ret_downside_sq / self.n_weeks)
+            if downside > 0:
+                sortino = self.ret_mean / downside * np.sqrt(self.periods_per_year)
+
+        active = self.wins + self.losses
+        avg_win = self.gross_profit / self.wins if self.wins else 0.0
+        avg_loss = self.gross_loss / self.losses if self.losses else 0.0
+        win_rate = self.wins / active if active else 0.0
+
+        return {
+            'weeks': self.n_weeks,
+            'days': self.n_days,
+            'active_days': active,
+            'total_profit_loss': self.week_mean * self.n_weeks,
+            'mean_weekly': self.week_mean,
+            'weekly_volatility': float(np.sqrt(max(self.week_m2, 0.0) / max(self.n_weeks - 1, 1))),
+            'daily_mean': self.day_mean,
+            'daily_volatility': float(np.sqrt(max(self.day_m2, 0.0) / max(self.n_days - 1, 1))),
+            'rolling_window': window,
+            'rolling_mean': float(recent.mean()),
+            'rolling_mean_previous': float(previous.mean()),
+            'rolling_volatility': float(recent.std()),
+            'sharpe_ratio': float(sharpe),
+            'sortino_ratio': float(sortino),
+            'max_drawdown': float(max_dd_pct),
+            'max_drawdown_amount': float(max_dd),
+            'win_rate': win_rate,
+            'win_loss_ratio': self._ratio(avg_win, avg_loss),
+            'profit_factor': self._ratio(self.gross_profit, self.gross_loss),
+            'expectancy': win_rate * avg_win - (1.0 - win_rate) * avg_loss if active else 0.0,
+            'ewma': ewma,
+            'current_streak': current_sign * current_len,
+            'longest_win_streak': longest_win,
+            'longest_loss_streak': longest_loss
+        }
+
+    # ------------------------------------------------------------------
+    # Utilidades
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _weekly_returns(weekly: np.ndarray, capitals: np.ndarray) -> np.ndarray:
+        """Rendimiento de cada semana respecto a su capital inicial"""
+        return np.divide(weekly, capitals, out=np.zeros_like(weekly), where=capitals > 0)
+
+    def _ewma(self, values, state: Optional[float] = None) -> Optional[float]:
+        """Avanzar la media móvil exponencial sobre los valores dados"""
+        alpha = self.ewma_alpha
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return state
+        if state is None:
+            state = float(values[0])
+            values = values[1:]
+        # Forma cerrada vectorizada: pesos alpha * (1 - alpha)^k
+        decay = (1.0 - alpha) ** np.arange(values.size - 1, -1, -1)
+        return float(state * (1.0 - alpha) ** values.size + alpha * np.dot(decay, values))
+
+    @staticmethod
+    def _ratio(numerator: float, denominator: float) -> float:
+        """Cociente seguro: infinito si no hay pérdidas pero sí ganancias"""
+        if denominator > 0:
+            return float(numerator / denominator)
+        return float('inf') if numerator > 0 else 0.0
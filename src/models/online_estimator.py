@@ -0,0 +1,175 @@
+"""
+Estimador online del P/L de la próxima sesión
+Mínimos cuadrados ponderados con olvido exponencial (la misma solución que RLS) sobre
+el día de la semana, los días recientes y el capital. Se acumulan las estadísticas
+suficientes: cada día nuevo cuesta O(p²) más un sistema p x p (p = 8).
+"""
+
+import copy
+from statistics import NormalDist
+from typing import Dict
+import numpy as np
+
+CAPITAL = 7  # columna del capital en las características
+
+
+class OnlineRLSEstimator:
+    """Predice el P/L del siguiente día operado con un intervalo esperado.
+
+    Características: día de la semana (one-hot), P/L del último día operado,
+    media de los últimos `recent_days` días operados y capital de la semana
+    (en miles) centrado en su media ponderada. Los días en cero se consideran
+    no operados y no entrenan.
+
+    El one-hot del día ya hace de término independiente: sin centrar, un capital
+    constante (lo habitual) sería colineal con él. Centrado, esa columna queda en
+    cero y la penalización `ridge` (fija, no se diluye con el olvido) anula su peso,
+    así que el sistema sigue bien condicionado con cualquier cantidad de historial.
+    """
+
+    def __init__(self, forgetting: float = 0.99, recent_days: int = 5, ridge: float = 0.1,
+                 coverage: float = 0.80):
+        self.forgetting = forgetting
+        self.recent_days = recent_days
+        self.ridge = ridge
+        # Probabilidad cubierta por el rango esperado
+        self.z = NormalDist().inv_cdf(0.5 + coverage / 2)
+        self.coverage = coverage
+        self.n_features = 8
+        self.reset()
+
+    def reset(self):
+        """Volver al estado sin entrenar"""
+        p = self.n_features
+        # Sumas ponderadas por λ^(antigüedad) de las características sin centrar (z)
+        self._zz = np.zeros((p, p))
+        self._z = np.zeros(p)
+        self._w = 0.0
+        self._zy = np.zeros(p)
+        self._y = 0.0
+        self._A = np.eye(p) * self.ridge
+        self.capital_mean = 0.0
+        self.weights = np.zeros(p)
+        self.residual_var = 0.0
+        self.samples = 0
+        self.recent = []
+
+    def copy(self) -> 'OnlineRLSEstimator':
+        """Copia independiente del estado (matrices pequeñas)"""
+        return copy.deepcopy(self)
+
+    def _raw_features(self, weekday: int, capital: float) -> np.ndarray:
+        z = np.zeros(self.n_features)
+        z[weekday] = 1.0
+        if self.recent:
+            z[5] = self.recent[-1]
+            z[6] = sum(self.recent) / len(self.recent)
+        z[CAPITAL] = capital / 1000.0
+        return z
+
+    def _features(self, weekday: int, capital: float) -> np.ndarray:
+        x = self._raw_features(weekday, capital)
+        x[CAPITAL] -= self.capital_mean
+        return x
+
+    def _solve(self):
+        """Pesos de la regresión ridge sobre las características centradas.
+        Σw(z - m·e)(z - m·e)ᵀ y Σw·y(z - m·e) salen de las sumas sin centrar."""
+        p = self.n_features
+        m = self._z[CAPITAL] / self._w if self._w > 0 else 0.0
+        A = self._zz.copy()
+        A[CAPITAL, :] -= m * self._z
+        A[:, CAPITAL] -= m * self._z
+        A[CAPITAL, CAPITAL] += m * m * self._w
+        b = self._zy.copy()
+        b[CAPITAL] -= m * self._y
+        self._A = A + np.eye(p) * self.ridge
+        self.capital_mean = m
+        self.weights = np.linalg.solve(self._A, b)
+
+    def update(self, weekday: int, amount: float, capital: float):
+        """Incorporar un día operado: olvido sobre las sumas y nueva solución"""
+        error = amount - self.weights @ self._features(weekday, capital)
+        z = self._raw_features(weekday, capital)
+        lam = self.forgetting
+        self._zz = lam * self._zz + np.outer(z, z)
+        self._z = lam * self._z + z
+        self._w = lam * self._w + 1.0
+        self._zy = lam * self._zy + amount * z
+        self._y = lam * self._y + amount
+        self._solve()
+        # Varianza del error de predicción (a priori) con el mismo olvido
+        if self.samples == 0:
+            self.residual_var = error * error
+        else:
+            self.residual_var = lam * self.residual_var + (1 - lam) * error * error
+        self.samples += 1
+        self.recent = (self.recent + [amount])[-self.recent_days:]
+
+    def fit(self, amounts, capitals):
+        """Entrenar desde cero con la matriz semanas x días.
+        Las sumas quedan iguales a aplicar update() día a día (pesos λ^(n-1-t)),
+        pero se calculan con operaciones vectorizadas.
+        """
+        self.reset()
+        amounts = np.asarray(amounts, dtype=np.float64).reshape(-1, 5)
+        capitals = np.asarray(capitals, dtype=np.float64)
+        traded = amounts != 0
+        y = amounts[traded]
+        n = y.size
+        if n == 0:
+            return
+
+        # Matriz de diseño: los rezagos solo consideran días operados anteriores
+        Z = np.zeros((n, self.n_features))
+        Z[np.arange(n), np.nonzero(traded)[1]] = 1.0
+        Z[1:, 5] = y[:-1]
+        cumulative = np.concatenate(([0.0], np.cumsum(y)))
+        ends = np.arange(n)
+        starts = np.maximum(ends - self.recent_days, 0)
+        counts = ends - starts
+        Z[1:, 6] = (cumulative[ends] - cumulative[starts])[1:] / counts[1:]
+        Z[:, CAPITAL] = np.broadcast_to(capitals[:, None], amounts.shape)[traded] / 1000.0
+
+        lam = self.forgetting
+        weights = lam ** np.arange(n - 1, -1, -1, dtype=np.float64)
+        weighted = Z * weights[:, None]
+        self._zz = weighted.T @ Z
+        self._z = weighted.sum(axis=0)
+        self._w = float(weights.sum())
+        self._zy = weighted.T @ y
+        self._y = float(weights @ y)
+        self._solve()
+
+        # Errores a priori aproximados con el ajuste final, ponderados igual que update()
+        X = Z.copy()
+        X[:, CAPITAL] -= self.capital_mean
+        errors = y - X @ self.weights
+        ew = (1 - lam) * lam ** np.arange(n - 2, -1, -1, dtype=np.float64)
+        self.residual_var = float(errors[0] ** 2 * lam ** (n - 1) + (ew * errors[1:] ** 2).sum())
+        self.samples = n
+        self.recent = y[-self.recent_days:].tolist()
+
+    def forecast(self, weekday: int, capital: float) -> Dict:
+        """P/L esperado del próximo día operado y rango con la cobertura configurada"""
+        x = self._features(weekday, capital)
+        expected = float(self.weights @ x)
+        # Incertidumbre del ruido más la de los coeficientes (x·A⁻¹·x sin invertir A)
+        leverage = float(x @ np.linalg.solve(self._A, x))
+        spread = self.z * float(np.sqrt(max(self.residual_var * (1.0 + leverage), 0.0)))
+        return {
+            'weekday': weekday,
+            'expected': expected,
+            'low': expected - spread,
+            'high': expected + spread,
+            'coverage': self.coverage,
+            'samples': self.samples
+        }
+
+    def forecast_after(self, week_amounts, capital: float, weekday: int) -> Dict:
+        """Pronóstico tras incorporar los días ya cargados de la semana activa, sin alterar el estado"""
+        estimator = self.copy()
+        for day, amount in enumerate(week_amounts):
+            if amount != 0:
+                estimator.update(day, float(amount), capital)
+        return estimator.forecast(weekday, capital)
@@ -0,0 +1,124 @@
+"""
+Métricas de riesgo de cola: Value-at-Risk y Expected Shortfall
+Versiones histórica (order statistics con np.partition) y paramétrica (normal)
+sobre P/L diario y semanal, globales y por ventana móvil
+"""
+
+from datetime import date
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class TailRiskAnalyzer:
+    """Calcula VaR/ES a varios niveles de confianza. Las pérdidas se expresan en positivo."""
+
+    def __init__(self, confidence_levels: Sequence[float] = (0.95, 0.99),
+                 rolling_window: int = 60, chunk_rows: int = 4096):
+        self.confidence_levels = tuple(confidence_levels)
+        self.rolling_window = rolling_window
+        # Filas de ventanas procesadas por bloque en el cálculo móvil (memoria acotada)
+        self.chunk_rows = chunk_rows
+
+    @staticmethod
+    def _tail_index(n: int, level: float) -> int:
+        """Índice del estadístico de orden que corresponde al cuantil (1 - level)"""
+        return min(n - 1, max(0, int(np.floor((1.0 - level) * n))))
+
+    def historical(self, pnl, level: float) -> Dict:
+        """VaR y ES históricos en O(n) con np.partition"""
+        pnl = np.asarray(pnl, dtype=np.float64)
+        if pnl.size == 0:
+            return {'var': 0.0, 'es': 0.0}
+        k = self._tail_index(pnl.size, level)
+        tail = np.partition(pnl, k)[:k + 1]
+        return {'var': float(-tail[k]), 'es': float(-tail.mean())}
+
+    @staticmethod
+    def parametric(pnl, level: float) -> Dict:
+        """VaR y ES bajo una distribución normal ajustada (media y desviación)"""
+        pnl = np.asarray(pnl, dtype=np.float64)
+        if pnl.size < 2:
+            return {'var': 0.0, 'es': 0.0}
+        mu = float(pnl.mean())
+        sigma = float(pnl.std(ddof=1))
+        normal = NormalDist()
+        z = normal.inv_cdf(level)
+        return {
+            'var': -mu + z * sigma,
+            'es': -mu + sigma * normal.pdf(z) / (1.0 - level)
+        }
+
+    def rolling_historical(self, pnl, level: float, window: Optional[int] = None) -> Dict:
+        """VaR y ES históricos en cada ventana móvil, vectorizado por bloques de ventanas.
+        Serie completa bajo pedido: report() solo necesita la última ventana (latest_window)."""
+        pnl = np.asarray(pnl, dtype=np.float64)
+        window = window or self.rolling_window
+        if pnl.size < window:
+            return {'var': np.empty(0), 'es': np.empty(0)}
+        windows = sliding_window_view(pnl, window)
+        k = self._tail_index(window, level)
+        var = np.empty(windows.shape[0])
+        es = np.empty(windows.shape[0])
+        for start in range(0, windows.shape[0], self.chunk_rows):
+            block = np.partition(windows[start:start + self.chunk_rows], k, axis=1)[:, :k + 1]
+            var[start:start + block.shape[0]] = -block[:, k]
+            es[start:start + block.shape[0]] = -block.mean(axis=1)
+        return {'var': var, 'es': es}
+
+    def latest_window(self, pnl, level: float, window: Optional[int] = None) -> Optional[Dict]:
+        """VaR y ES históricos de la última ventana móvil (None si no hay datos suficientes).
+        Equivale al último punto de rolling_historical con un solo np.partition de la ventana."""
+        pnl = np.asarray(pnl, dtype=np.float64)
+        window = window or self.rolling_window
+        if pnl.size < window:
+            return None
+        return self.historical(pnl[-window:], level)
+
+    @staticmethod
+    def observed(amounts, dates: Optional[List[str]] = None, today: Optional[date] = None):
+        """P/L observado: (días operados, sus fechas, totales de semanas cerradas con operaciones).
+        Los días sin operar y los posteriores a hoy (resto de la semana activa o semanas
+        futuras) valen 0 en la matriz; incluirlos acercaría VaR/ES a cero."""
+        amounts = np.asarray(amounts, dtype=np.float64).reshape(-1, 5)
+        traded = amounts != 0
+        day_dates = None
+        if dates is not None and len(dates) == amounts.shape[0]:
+            day_dates = np.array([str(d)[:10] for d in dates], dtype='datetime64[D]')[:, None] + np.arange(5)
+            elapsed = day_dates <= np.datetime64(today or date.today())
+        else:
+            elapsed = np.ones(amounts.shape, dtype=bool)
+        observed = traded & elapsed
+        closed = elapsed.all(axis=1) & traded.any(axis=1)
+        return (amounts[observed], day_dates[observed] if day_dates is not None else None,
+                amounts[closed].sum(axis=1))
+
+    def report(self, amounts, dates: Optional[List[str]] = None, today: Optional[date] = None,
+               include_rolling: bool = False) -> Dict:
+        """Informe de riesgo de cola sobre la matriz semanas x días de una cuenta.
+        dates (lunes de cada semana) permite excluir los días posteriores a hoy; con
+        include_rolling cada nivel incluye además la serie móvil completa (rolling_historical)."""
+        daily, day_dates, weekly = self.observed(amounts, dates, today)
+        report = {'days': int(daily.size), 'weeks': int(weekly.size), 'levels': {}}
+        for level in self.confidence_levels:
+            recent = self.latest_window(daily, level)
+            report['levels'][level] = {
+                'daily_historical': self.historical(daily, level),
+                'daily_parametric': self.parametric(daily, level),
+                'weekly_historical': self.historical(weekly, level),
+                'weekly_parametric': self.parametric(weekly, level),
+                'rolling_window': self.rolling_window,
+                'rolling_var': recent['var'] if recent else None,
+                'rolling_es': recent['es'] if recent else None
+            }
+            if include_rolling:
+                rolling = self.rolling_historical(daily, level)
+                # Cada ventana se fecha con su último día
+                ends = day_dates[self.rolling_window - 1:] if day_dates is not None and rolling['var'].size else []
+                report['levels'][level]['rolling_series'] = {
+                    'dates': [str(d) for d in ends],
+                    'var': rolling['var'].tolist(),
+                    'es': rolling['es'].tolist()
+                }
+        return report
@@ -0,0 +1,303 @@
+"""
+Registro en memoria de operaciones individuales
+Columnas en un array estructurado de NumPy (31 bytes por operación) en lugar de un dict
+por registro: millones de operaciones por sesión, cortes por día sin copias y
+agregados con NumPy, sin bucles de Python. Los montos son centavos int64 (sumas exactas).
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+import numpy as np
+from ..utils.money import from_cents
+
+TRADE_DTYPE = np.dtype([
+    ('closed_at', np.int64),   # segundos desde 1970 (reloj del extracto)
+    ('day', np.int32),         # días desde 1970 (closed_at // 86400)
+    ('asset', np.int16),       # índice en TradeLedger.assets (-1 = sin activo)
+    ('direction', np.int8),    # 1 = arriba/call, -1 = abajo/put, 0 = desconocida
+    ('stake_cents', np.int64),
+    ('profit_cents', np.int64)
+])
+SECONDS_PER_DAY = 86400
+DAYS_PER_WEEK = 5
+
+
+def _epoch_day(value: Union[str, date]) -> int:
+    return int(np.datetime64(str(value)[:10], 'D').astype(np.int64))
+
+
+class TradeView:
+    """Vista de una operación del registro (sin copiar sus campos).
+    El índice es posicional: deja de ser válido si el registro se reordena al agregar
+    operaciones fuera de orden."""
+
+    __slots__ = ('_ledger', '_index')
+
+    def __init__(self, ledger: 'TradeLedger', index: int):
+        self._ledger = ledger
+        self._index = index
+
+    def _field(self, name: str):
+        return self._ledger._records[name][self._index]
+
+    @property
+    def closed_at(self) -> int:
+        return int(self._field('closed_at'))
+
+    @property
+    def date(self) -> date:
+        return date(1970, 1, 1) + timedelta(days=int(self._field('day')))
+
+    @property
+    def asset(self) -> Optional[str]:
+        code = int(self._field('asset'))
+        return self._ledger.assets[code] if code >= 0 else None
+
+    @property
+    def direction(self) -> int:
+        return int(self._field('direction'))
+
+    @property
+    def stake_cents(self) -> int:
+        return int(self._field('stake_cents'))
+
+    @property
+    def profit_cents(self) -> int:
+        return int(self._field('profit_cents'))
+
+    @property
+    def stake(self) -> float:
+        return from_cents(self.stake_cents)
+
+    @property
+    def profit(self) -> float:
+        return from_cents(self.profit_cents)
+
+    def __repr__(self) -> str:
+        return (f"TradeView({self.date.isoformat()}, asset={self.asset!r}, "
+                f"stake={self.stake:.2f}, profit={self.profit:.2f})")
+
+
+class TradeLedger:
+    """Operaciones de la sesión en un array estructurado que crece por duplicación.
+
+    Las operaciones se mantienen ordenadas por día (se reordenan solo si llegan fuera
+    de orden) y los desplazamientos de cada día se calculan una vez por cambio:
+    day_slice devuelve una vista del array y daily_totals agrega con np.add.reduceat.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._records = np.zeros(max(1, int(capacity)), dtype=TRADE_DTYPE)
+        self._size = 0
+        self.assets: List[str] = []
+        self._asset_codes: Dict[str, int] = {}
+        self._ordered = True
+        self._days: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._day_profit: Optional[np.ndarray] = None
+        self.version = 0
+
+    # ------------------------------------------------------------------
+    # Construcción
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_db(cls, db_manager, start: Optional[str] = None, end: Optional[str] = None,
+                chunk_size: int = 50000) -> 'TradeLedger':
+        """Cargar las operaciones guardadas (trade_date entre start y end) por bloques"""
+        ledger = cls()
+        batch = []
+        for row in db_manager.iter_trades(start=start, end=end, chunk_size=chunk_size):
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                ledger.extend_rows(batch)
+                batch = []
+        if batch:
+            ledger.extend_rows(batch)
+        return ledger
+
+    def asset_code(self, asset: Optional[str]) -> int:
+        """Código del activo en el registro (lo agrega si es nuevo)"""
+        if asset is None or asset == '':
+            return -1
+        code = self._asset_codes.get(asset)
+        if code is None:
+            code = self._asset_codes[asset] = len(self.assets)
+            self.assets.append(asset)
+        return code
+
+    def _reserve(self, extra: int):
+        needed = self._size + extra
+        if needed > len(self._records):
+            grown = np.zeros(max(needed, 2 * len(self._records)), dtype=TRADE_DTYPE)
+            grown[:self._size] = self._records[:self._size]
+            self._records = grown
+
+    def append(self, closed_at: int, profit_cents: int, stake_cents: int = 0,
+               asset: Optional[str] = None, direction: int = 0):
+        """Agregar una operación (montos en centavos)"""
+        self._reserve(1)
+        day = int(closed_at) // SECONDS_PER_DAY
+        if self._size and day < self._records['day'][self._size - 1]:
+            self._ordered = False
+        self._records[self._size] = (closed_at, day, self.asset_code(asset), direction, stake_cents, profit_cents)
+        self._size += 1
+        self._changed()
+
+    def extend(self, closed_at: Sequence[int], profit_cents: Sequence[int],
+               stake_cents: Optional[Sequence[int]] = None,
+               asset: Optional[Sequence[Optional[str]]] = None,
+               direction: Optional[Sequence[int]] = None):
+        """Agregar muchas operaciones de una vez a partir de columnas (montos en centavos)"""
+        closed_at = np.asarray(closed_at, dtype=np.int64)
+        count = len(closed_at)
+        if count == 0:
+            return
+        self._reserve(count)
+        block = self._records[self._size:self._size + count]
+        block['closed_at'] = closed_at
+        block['day'] = closed_at // SECONDS_PER_DAY
+        block['profit_cents'] = profit_cents
+        block['stake_cents'] = 0 if stake_cents is None else stake_cents
+        block['direction'] = 0 if direction is None else direction
+        if asset is None:
+            block['asset'] = -1
+        else:
+            names, inverse = np.unique(np.asarray([a or '' for a in asset], dtype=object).astype(str),
+                                       return_inverse=True)
+            codes = np.array([self.asset_code(name) for name in names.tolist()], dtype=np.int16)
+            block['asset'] = codes[inverse]
+        days = block['day']
+        if (self._size and days[0] < self._records['day'][self._size - 1]) or (np.diff(days) < 0).any():
+            self._ordered = False
+        self._size += count
+        self._changed()
+
+    def extend_rows(self, rows: Iterable[tuple]):
+        """Agregar filas de DatabaseManager.iter_trades:
+        (trade_id, trade_date, closed_at, asset, direction, stake_cents, profit_cents)"""
+        rows = list(rows)
+        if not rows:
+            return
+        _, _, closed_at, asset, direction, stake_cents, profit_cents = zip(*rows)
+        self.extend(closed_at, profit_cents, stake_cents=stake_cents, asset=asset, direction=direction)
+
+    def _changed(self):
+        self._days = None
+        self._offsets = None
+        self._day_profit = None
+        self.version += 1
+
+    # ------------------------------------------------------------------
+    # Acceso
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def records(self) -> np.ndarray:
+        """Vista del array estructurado con las operaciones (ordenadas por día)"""
+        self._index()
+        return self._records[:self._size]
+
+    def __getitem__(self, index: int) -> TradeView:
+        self._index()
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("índice de operación fuera de rango")
+        return TradeView(self, index)
+
+    def __iter__(self) -> Iterator[TradeView]:
+        self._index()
+        for index in range(self._size):
+            yield TradeView(self, index)
+
+    def _index(self):
+        """Ordenar por día si hace falta y calcular los desplazamientos de cada día"""
+        if self._offsets is not None:
+            return
+        records = self._records[:self._size]
+        if not self._ordered:
+            records[:] = records[np.argsort(records['day'], kind='stable')]
+            self._ordered = True
+        days = records['day']
+        if self._size:
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(days)) + 1))
+        else:
+            starts = np.empty(0, dtype=np.int64)
+        self._days = days[starts]
+        self._offsets = np.append(starts, self._size).astype(np.int64)
+        self._day_profit = (np.add.reduceat(records['profit_cents'], starts) if self._size
+                            else np.empty(0, dtype=np.int64))
+
+    def days(self) -> np.ndarray:
+        """Días con operaciones (datetime64[D], en orden)"""
+        self._index()
+        return self._days.astype('datetime64[D]')
+
+    def day_slice(self, day: Union[str, date]) -> np.ndarray:
+        """Operaciones de un día como vista del array (vacía si no hay)"""
+        self._index()
+        target = _epoch_day(day)
+        position = int(np.searchsorted(self._days, target))
+        if position < len(self._days) and self._days[position] == target:
+            return self._records[self._offsets[position]:self._offsets[position + 1]]
+        return self._records[:0]
+
+    # ------------------------------------------------------------------
+    # Agregados
+    # ------------------------------------------------------------------
+    def daily_totals(self) -> Dict[str, np.ndarray]:
+        """Por día con operaciones: cantidad, ganancia neta e inversión (centavos) y ganadoras"""
+        self._index()
+        records = self._records[:self._size]
+        starts = self._offsets[:-1]
+        if not self._size:
+            empty = np.empty(0, dtype=np.int64)
+            return {'days': empty.astype('datetime64[D]'), 'trades': empty, 'profit_cents': empty,
+                    'stake_cents': empty, 'wins': empty}
+        return {
+            'days': self._days.astype('datetime64[D]'),
+            'trades': np.diff(self._offsets),
+            'profit_cents': self._day_profit.copy(),
+            'stake_cents': np.add.reduceat(records['stake_cents'], starts),
+            'wins': np.add.reduceat((records['profit_cents'] > 0).astype(np.int64), starts)
+        }
+
+    def week_totals(self, week_start: Union[str, date]) -> Dict[int, int]:
+        """Ganancia neta en centavos de cada día hábil de la semana con operaciones (0 = lunes)"""
+        self._index()
+        monday = _epoch_day(week_start)
+        targets = monday + np.arange(DAYS_PER_WEEK)
+        positions = np.searchsorted(self._days, targets)
+        found = positions < len(self._days)
+        found[found] = self._days[positions[found]] == targets[found]
+        return {int(weekday): int(self._day_profit[positions[weekday]])
+                for weekday in np.flatnonzero(found).tolist()}
+
+    def asset_totals(self) -> Dict[str, Dict]:
+        """Operaciones y ganancia neta (centavos) por activo"""
+        records = self._records[:self._size]
+        codes = records['asset'].astype(np.int64) + 1  # -1 (sin activo) pasa a 0
+        size = len(self.assets) + 1
+        counts = np.bincount(codes, minlength=size)
+        # Los pesos se suman en float64: exacto para centavos enteros por debajo de 2**53
+        profits = np.bincount(codes, weights=records['profit_cents'], minlength=size)
+        names = [None] + self.assets
+        return {names[i]: {'trades': int(counts[i]), 'profit_cents': int(profits[i])}
+                for i in np.flatnonzero(counts).tolist()}
+
+    def summary(self) -> Dict:
+        """Totales del registro completo (montos decimales, para mostrar)"""
+        records = self._records[:self._size]
+        profit = records['profit_cents']
+        return {
+            'trades': self._size,
+            'profit': from_cents(int(profit.sum())),
+            'stake': from_cents(int(records['stake_cents'].sum())),
+            'wins': int((profit > 0).sum()),
+            'losses': int((profit < 0).sum()),
+            'win_rate': float((profit > 0).mean()) if self._size else 0.0,
+            'best_trade': from_cents(int(profit.max())) if self._size else 0.0,
+            'worst_trade': from_cents(int(profit.min())) if self._size else 0.0
+        }
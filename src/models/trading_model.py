@@ -5,6 +5,7 @@ Contiene las clases principales para manejar los datos de trading
 
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
+from ..utils.money import from_cents, quantize, to_cents
 
 class TradingDataModel:
     """Modelo de datos para los resultados de trading"""
@@ -22,37 +23,40 @@ class TradingDataModel:
         self.week_start_date = datetime.now().date()
         
     def update_day(self, day: str, amount: float):
-        """Actualizar el monto para un día específico"""
+        """Actualizar el monto para un día específico (redondeado al centavo)"""
         if day in self.data:
-            self.data[day]['amount'] = amount
+            self.data[day]['amount'] = quantize(amount)
             
     def get_weekly_summary(self) -> Dict:
-        """Calcular el resumen semanal"""
-        total_weekly = sum(self.data[day]['amount'] for day in self.days)
-        total_withdrawal = sum(self.data[day]['amount'] for day in self.days 
+        """Calcular el resumen semanal.
+        Las sumas se hacen en centavos enteros y se convierten a decimales al final.
+        """
+        cents = {day: to_cents(self.data[day]['amount']) for day in self.days}
+        total_weekly = sum(cents.values())
+        total_withdrawal = sum(cents[day] for day in self.days 
                               if self.data[day]['destination'] == 'Retiro Personal')
-        total_reinvestment = sum(self.data[day]['amount'] for day in self.days 
+        total_reinvestment = sum(cents[day] for day in self.days 
                                if self.data[day]['destination'] == 'Reinversión')
         
         # Calcular promedio diario
-        daily_average = total_weekly / 5  # 5 días hábiles
+        daily_average = from_cents(total_weekly) / 5  # 5 días hábiles
         
         # Calcular porcentaje de cambio
-        total_positive = sum(max(0, self.data[day]['amount']) for day in self.days)
-        total_negative = sum(abs(min(0, self.data[day]['amount'])) for day in self.days)
+        total_positive = sum(max(0, value) for value in cents.values())
+        total_negative = sum(abs(min(0, value)) for value in cents.values())
         
         performance_percentage = 0
         if total_positive + total_negative > 0:
             performance_percentage = (total_positive - total_negative) / (total_positive + total_negative) * 100
         
         return {
-            'total_weekly': total_weekly,
-            'total_withdrawal': total_withdrawal,
-            'total_reinvestment': total_reinvestment,
+            'total_weekly': from_cents(total_weekly),
+            'total_withdrawal': from_cents(total_withdrawal),
+            'total_reinvestment': from_cents(total_reinvestment),
             'daily_average': daily_average,
             'performance_percentage': performance_percentage,
-            'positive_days': sum(1 for day in self.days if self.data[day]['amount'] > 0),
-            'negative_days': sum(1 for day in self.days if self.data[day]['amount'] < 0)
+            'positive_days': sum(1 for value in cents.values() if value > 0),
+            'negative_days': sum(1 for value in cents.values() if value < 0)
         }
     
     def to_dict(self) -> Dict:
@@ -2,14 +2,26 @@
 Modelo de datos mejorado con integración de base de datos
 """
 
-from datetime import datetime
-from typing import Dict, Optional
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+import numpy as np
 from .trading_model import TradingDataModel
+from .incremental_stats import IncrementalStats
+from .drawdown import DrawdownAnalyzer
+from .online_estimator import OnlineRLSEstimator
+from .custom_metrics import CustomMetricsEngine
+from .trade_ledger import TradeLedger
+from ..utils.money import from_cents, quantize, to_cents, units_array
 from ..database.database_manager import DatabaseManager
 
 class TradingDataModelWithDB(TradingDataModel):
     """Modelo de datos con persistencia en base de datos"""
     
+    # Fracción de la ganancia semanal que se retira en el rollover
+    withdrawal_rate = 0.30
+    
     def __init__(self):
         super().__init__()
         self.db_manager = DatabaseManager()
@@ -21,6 +33,22 @@ class TradingDataModelWithDB(TradingDataModel):
         # Capital inicial de la semana
         self.initial_capital = 100.0  # Valor por defecto
         
+        # Historial completo en memoria (se carga una sola vez desde la BD)
+        self._history = None
+        # Copia de solo lectura compartida con las fotos del análisis (ver get_history_base)
+        self._history_base = None
+        self.stats = IncrementalStats()
+        self.drawdown = DrawdownAnalyzer()
+        # Entrenado con las semanas previas a la activa; la activa se aplica al pronosticar
+        self.estimator = OnlineRLSEstimator()
+        # Se incrementa con cada cambio de datos; sirve de clave para cachés derivadas
+        self.data_version = 0
+        # Métricas definidas por el usuario (guardadas en app_config)
+        self.custom_metrics = CustomMetricsEngine()
+        self.load_custom_metric_formulas()
+        # Operaciones individuales de la semana activa (se cargan al pedirlas)
+        self._trade_ledger = None
+        
         # Cargar datos guardados automáticamente al iniciar
         self.load_saved_data()
         
@@ -29,8 +57,11 @@ class TradingDataModelWithDB(TradingDataModel):
         super().update_day(day, amount)
         # Actualizar daily_amounts y daily_destinations para compatibilidad con el gráfico
         if day in self.daily_amounts:
-            self.daily_amounts[day] = amount
+            self.daily_amounts[day] = quantize(amount)
             self.daily_destinations[day] = self.data[day].get('destination', self.destinations[day])
+            # Propagar el delta a las estadísticas del historial (O(1))
+            self.get_history()
+            self.data_version += 1
         # Guardar automáticamente en la base de datos
         self.db_manager.save_weekly_data(self.to_dict())
         
@@ -64,11 +95,17 @@ class TradingDataModelWithDB(TradingDataModel):
                 self.daily_amounts[day] = self.data[day].get('amount', 0.0)
                 self.daily_destinations[day] = self.data[day].get('destination', self.destinations[day])
         # Cargar capital inicial si existe
-        self.initial_capital = data.get('initial_capital', 100.0)
+        self.initial_capital = quantize(data.get('initial_capital', 100.0))
+        # La semana activa cambió: recargar historial y operaciones en el próximo acceso
+        self._history = None
+        self._trade_ledger = None
+        self.data_version += 1
     
     def save_current_week(self):
         """Guardar la semana actual en la base de datos"""
         try:
+            # El capital inicial puede haberse asignado directamente antes de guardar
+            self.data_version += 1
             self.db_manager.save_weekly_data(self.to_dict())
             return True
         except Exception as e:
@@ -149,14 +186,17 @@ class TradingDataModelWithDB(TradingDataModel):
             print(f"Error al cargar desde archivo: {e}")
             return False
     
+    def get_total_profit_loss_cents(self) -> int:
+        """Total de ganancias/pérdidas de la semana en centavos (suma exacta)"""
+        return sum(to_cents(self.daily_amounts[day]) for day in self.days)
+
     def get_current_balance(self):
         """Obtener el balance actual (capital inicial + total ganancias/pérdidas)"""
-        total_change = sum(self.daily_amounts[day] for day in self.days)
-        return self.initial_capital + total_change
+        return from_cents(to_cents(self.initial_capital) + self.get_total_profit_loss_cents())
     
     def get_total_profit_loss(self):
         """Obtener el total de ganancias/pérdidas de la semana"""
-        return sum(self.daily_amounts[day] for day in self.days)
+        return from_cents(self.get_total_profit_loss_cents())
     
     def get_profit_loss_percentage(self):
         """Obtener el porcentaje de ganancia/pérdida respecto al capital inicial"""
@@ -167,10 +207,18 @@ class TradingDataModelWithDB(TradingDataModel):
     
     def set_initial_capital(self, capital: float):
         """Establecer el capital inicial de la semana"""
-        self.initial_capital = max(0.0, capital)  # Asegurar que no sea negativo
+        self.initial_capital = max(0.0, quantize(capital))  # Asegurar que no sea negativo
+        self.data_version += 1
         # Guardar automáticamente en la base de datos
         self.db_manager.save_weekly_data(self.to_dict())
     
+    def get_rollover_capital(self) -> float:
+        """Capital inicial de la semana siguiente: balance menos el retiro de las ganancias"""
+        total = self.get_total_profit_loss_cents()
+        balance = to_cents(self.initial_capital) + total
+        withdrawal = to_cents(from_cents(max(0, total)) * self.withdrawal_rate)
+        return from_cents(max(0, balance - withdrawal))
+    
     def get_weekly_data(self):
         """Obtener todos los datos de la semana actual para exportación"""
         return {
@@ -200,7 +248,7 @@ class TradingDataModelWithDB(TradingDataModel):
                 self.week_start_date = datetime.fromisoformat(str(next_monday_date)).date()
 
             # Establecer capital inicial para la nueva semana
-            self.initial_capital = max(0.0, float(new_initial_capital or 0.0))
+            self.initial_capital = max(0.0, quantize(new_initial_capital))
 
             # Reiniciar datos diarios y destinos al valor por defecto
             self.data = {day: {'amount': 0.0, 'destination': self.destinations[day]} for day in self.days}
@@ -208,7 +256,162 @@ class TradingDataModelWithDB(TradingDataModel):
             self.daily_destinations = self.destinations.copy()
 
             # Guardar registro de nueva semana en la base de datos
+            self._history = None
+            self.data_version += 1
             return self.db_manager.save_weekly_data(self.to_dict())
         except Exception as e:
             print(f"Error al iniciar nueva semana: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    def get_history(self) -> Dict:
+        """Obtener el historial completo como arrays de NumPy.
+        Devuelve 'dates' (lista ISO), 'amounts' (semanas x 5) y 'capitals' en decimales,
+        más 'amounts_cents' / 'capitals_cents' (int64), la fuente exacta para sumas.
+        La semana activa se sincroniza con los valores en memoria en O(1),
+        aplicando los cambios como deltas sobre las estadísticas incrementales.
+        """
+        if self._history is None:
+            self._history = self._build_history()
+            self._history_base = None
+            self.stats.rebuild(self._history['amounts'], self._history['capitals'],
+                               self._history['current_row'])
+            row = self._history['current_row']
+            self.estimator.fit(self._history['amounts'][:row], self._history['capitals'][:row])
+
+        row = self._history['current_row']
+        for col, day in enumerate(self.days):
+            amount = self.daily_amounts.get(day, 0.0)
+            self._history['amounts_cents'][row, col] = to_cents(amount)
+            self.stats.update_day(col, float(amount))
+        self._history['capitals_cents'][row] = to_cents(self.initial_capital)
+        self.stats.update_capital(float(self.initial_capital))
+        return self._history
+
+    def get_trade_ledger(self) -> TradeLedger:
+        """Operaciones guardadas de la semana activa (de lunes a domingo)"""
+        if self._trade_ledger is None:
+            start = self.week_start_date
+            self._trade_ledger = TradeLedger.from_db(self.db_manager, start.isoformat(),
+                                                     (start + timedelta(days=6)).isoformat())
+        return self._trade_ledger
+
+    def set_trade_ledger(self, ledger: TradeLedger, touched_days: Iterable[str] = ()):
+        """Adoptar el registro de la semana activa armado fuera del hilo de la interfaz
+        (tras una ingesta). Si se importaron días de otras semanas, el historial en memoria
+        se recarga desde la BD en el próximo acceso; si no, basta con apply_trade_totals."""
+        self._trade_ledger = ledger
+        start = self.week_start_date.isoformat()
+        end = (self.week_start_date + timedelta(days=6)).isoformat()
+        if any(not start <= day <= end for day in touched_days):
+            self._history = None
+            self.data_version += 1
+
+    def apply_trade_totals(self, ledger: Optional[TradeLedger] = None) -> int:
+        """Pasar a la tabla el total de cada día hábil con operaciones en el registro.
+        Solo se llama a update_day en los días cuyo monto cambia; devuelve cuántos.
+        """
+        ledger = ledger if ledger is not None else self.get_trade_ledger()
+        changed = 0
+        for weekday, cents in ledger.week_totals(self.week_start_date).items():
+            day = self.days[weekday]
+            if cents == to_cents(self.daily_amounts.get(day, 0.0)):
+                continue
+            self.update_day(day, from_cents(cents))
+            changed += 1
+        return changed
+
+    def snapshot(self):
+        """Obtener una foto inmutable del estado para analizarla en otro hilo"""
+        from .week_snapshot import WeekSnapshot
+        return WeekSnapshot(self)
+
+    def get_history_base(self) -> Dict:
+        """Historial de solo lectura para las fotos: se copia una vez por carga del historial
+        (no por edición) y se comparte por referencia. La fila de la semana activa puede estar
+        desactualizada: cada foto lleva sus propios montos de la semana."""
+        history = self.get_history()
+        if self._history_base is None:
+            base = dict(history)
+            for key in ('amounts', 'capitals', 'amounts_cents', 'capitals_cents'):
+                base[key] = history[key].copy()
+                base[key].setflags(write=False)
+            # Las fechas solo cambian al reconstruir el historial: se comparte la lista
+            self._history_base = base
+        return self._history_base
+
+    def get_history_fingerprint(self) -> str:
+        """Huella del historial sin la semana activa (para claves de caché)"""
+        return self.get_history()['fingerprint']
+
+    def get_history_metrics(self) -> Dict:
+        """Obtener las métricas de todo el historial sin recorrerlo de nuevo"""
+        self.get_history()
+        return self.stats.snapshot()
+
+    def get_drawdown_report(self) -> Dict:
+        """Drawdown, recuperación y rachas de todo el historial (en caché por data_version)"""
+        history = self.get_history()
+        capitals = history['capitals']
+        return self.drawdown.analyze(history['amounts'], capitals[0] if capitals.size else 0.0,
+                                     history['dates'], version=self.data_version)
+
+    def get_next_session_forecast(self, weekday: int) -> Dict:
+        """Rango esperado de P/L para el día weekday (0=Lunes) con lo cargado esta semana"""
+        self.get_history()
+        week = [float(self.daily_amounts.get(day, 0.0)) for day in self.days]
+        return self.estimator.forecast_after(week, float(self.initial_capital), weekday)
+
+    def load_custom_metric_formulas(self):
+        """Cargar las definiciones de métricas personalizadas desde la configuración"""
+        try:
+            raw = self.db_manager.get_config('custom_metrics')
+            self.custom_metrics.set_formulas(json.loads(raw) if raw else [])
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Error al cargar las métricas personalizadas: {e}")
+            self.custom_metrics.set_formulas([])
+
+    def set_custom_metric_formulas(self, formulas: List[Dict]) -> bool:
+        """Reemplazar y guardar las métricas personalizadas ({'name', 'formula'})"""
+        self.custom_metrics.set_formulas(formulas)
+        return self.db_manager.set_config(
+            'custom_metrics', json.dumps(self.custom_metrics.formulas, ensure_ascii=False))
+
+    def get_custom_metrics(self) -> List[Dict]:
+        """Valor de cada métrica personalizada en la semana activa y media del historial"""
+        history = self.get_history()
+        return self.custom_metrics.evaluate(history, [self.destinations[day] for day in self.days],
+                                            self.days, version=self.data_version)
+
+    def _build_history(self) -> Dict:
+        """Construir los arrays del historial desde la BD e insertar la semana activa"""
+        rows = self.db_manager.load_history(cents=True)
+        dates = [row[0] for row in rows]
+        amounts_cents = np.array([row[1:6] for row in rows], dtype=np.int64).reshape(-1, 5)
+        capitals_cents = np.array([row[6] for row in rows], dtype=np.int64)
+
+        current = self.week_start_date.isoformat()
+        if current in dates:
+            current_row = dates.index(current)
+        else:
+            # Semana aún no persistida: insertarla en su posición cronológica
+            current_row = sum(1 for d in dates if d < current)
+            dates.insert(current_row, current)
+            amounts_cents = np.insert(amounts_cents, current_row, 0, axis=0)
+            capitals_cents = np.insert(capitals_cents, current_row, to_cents(self.initial_capital))
+
+        # Huella del resto del historial (todo salvo la semana activa) para claves de caché
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update("|".join(dates).encode('utf-8'))
+        digest.update(np.delete(amounts_cents, current_row, axis=0).tobytes())
+        digest.update(np.delete(capitals_cents, current_row).tobytes())
+
+        # Los centavos son la fuente exacta; las estadísticas usan su vista decimal
+        return {
+            'dates': dates,
+            'amounts': units_array(amounts_cents),
+            'capitals': units_array(capitals_cents),
+            'amounts_cents': amounts_cents,
+            'capitals_cents': capitals_cents,
+            'current_row': current_row,
+            'fingerprint': digest.hexdigest()
+        }
@@ -0,0 +1,192 @@
+"""
+Patrones recurrentes en la forma de las semanas
+Normaliza el vector de P/L de cinco días de cada semana y lo agrupa con k-means
+vectorizado; las semanas nuevas solo se asignan al centroide más cercano
+"""
+
+import hashlib
+import threading
+from typing import Dict, List, Optional
+import numpy as np
+
+# Nombres de las formas según el tipo de centroide ({day} = día destacado)
+SHAPE_NAMES = {
+    'steady_gain': "Ganancia constante",
+    'steady_loss': "Pérdida constante",
+    'strong_start_fade': "{day} fuerte y luego se desvanece",
+    'late_recovery': "Recuperación el {day}",
+    'peak_day': "Pico el {day}",
+    'drop_day': "Caída el {day}"
+}
+
+
+class WeekPatternFinder:
+    """Agrupa semanas por forma y mantiene las asignaciones entre llamadas.
+
+    El ajuste se hace sobre las semanas cerradas (todas menos la activa). Si en
+    la siguiente llamada esas semanas no cambiaron y solo se agregaron otras al
+    final, las nuevas se asignan a los centroides existentes sin re-ajustar,
+    hasta que superan refit_fraction de las semanas ajustadas.
+    """
+
+    def __init__(self, k: int = 4, n_init: int = 4, max_iter: int = 100, tol: float = 1e-8,
+                 seed: Optional[int] = 0, min_weeks: int = 8, refit_fraction: float = 0.25):
+        self.k = k
+        self.n_init = n_init
+        self.max_iter = max_iter
+        self.tol = tol
+        self.seed = seed
+        self.min_weeks = min_weeks
+        self.refit_fraction = refit_fraction
+        self.refits = 0
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """Descartar el ajuste actual"""
+        self.centroids = None
+        self.shapes = []
+        self.dates = []
+        self.labels = np.empty(0, dtype=np.int64)
+        self.fitted_weeks = 0
+        self.incremental_weeks = 0
+        self._digest = None
+
+    @staticmethod
+    def normalize(amounts) -> tuple:
+        """Vectores de forma de norma 1 y máscara de semanas con algún día operado"""
+        amounts = np.asarray(amounts, dtype=np.float64).reshape(-1, 5)
+        norms = np.linalg.norm(amounts, axis=1)
+        valid = norms > 0
+        return amounts[valid] / norms[valid, None], valid
+
+    def update(self, history: Dict, day_names: Optional[List[str]] = None) -> Dict:
+        """Ajustar o actualizar incrementalmente con el historial del modelo y devolver el informe"""
+        day_names = list(day_names) if day_names else [f"Día {i + 1}" for i in range(5)]
+        amounts = np.asarray(history['amounts'], dtype=np.float64).reshape(-1, 5)
+        current_row = history.get('current_row')
+        closed = np.array([i for i in range(amounts.shape[0]) if i != current_row], dtype=np.int64)
+        vectors, valid = self.normalize(amounts[closed])
+        rows = closed[valid]
+        dates = [history['dates'][i] for i in rows]
+
+        with self._lock:
+            known = len(self.dates)
+            if (self.centroids is not None and dates[:known] == self.dates
+                    and self._hash(vectors[:known]) == self._digest
+                    and self.incremental_weeks + len(dates) - known <= self.refit_fraction * self.fitted_weeks):
+                if len(dates) > known:
+                    self.labels = np.concatenate((self.labels, self.assign(vectors[known:])))
+                    self.incremental_weeks += len(dates) - known
+                    self.dates = dates
+                    self._digest = self._hash(vectors)
+            elif len(dates) >= self.min_weeks:
+                self._fit(vectors, dates, day_names)
+            else:
+                self._reset()
+                return {'clusters': [], 'current_cluster': None, 'fitted_weeks': 0,
+                        'incremental_weeks': 0, 'refits': self.refits}
+
+            current_cluster = None
+            if current_row is not None:
+                current, current_valid = self.normalize(amounts[current_row])
+                if current_valid[0]:
+                    current_cluster = int(self.assign(current)[0])
+
+            clusters = []
+            for c, centroid in enumerate(self.centroids):
+                kind, day = self.shapes[c]
+                members = np.flatnonzero(self.labels == c)
+                clusters.append({
+                    'name': SHAPE_NAMES[kind].format(day=day_names[day]),
+                    'shape': kind,
+                    'day': day,
+                    'centroid': centroid.tolist(),
+                    'size': int(members.size),
+                    'weeks': [self.dates[i] for i in members]
+                })
+            return {
+                'clusters': clusters,
+                'current_cluster': current_cluster,
+                'fitted_weeks': self.fitted_weeks,
+                'incremental_weeks': self.incremental_weeks,
+                'refits': self.refits
+            }
+
+    def assign(self, vectors) -> np.ndarray:
+        """Índice del centroide más cercano para cada vector normalizado"""
+        return self._distances(np.atleast_2d(vectors), self.centroids).argmin(axis=1)
+
+    @staticmethod
+    def _distances(x: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Distancias euclídeas al cuadrado (n x k) sin bucles"""
+        return ((x ** 2).sum(axis=1)[:, None] - 2.0 * x @ centroids.T
+                + (centroids ** 2).sum(axis=1)[None, :]).clip(min=0.0)
+
+    @staticmethod
+    def _hash(vectors: np.ndarray) -> str:
+        return hashlib.blake2b(np.ascontiguousarray(vectors).tobytes(), digest_size=16).hexdigest()
+
+    def _fit(self, vectors: np.ndarray, dates: List[str], day_names: List[str]):
+        """Ajuste completo: k-means++ con n_init reinicios, clusters ordenados por tamaño"""
+        k = min(self.k, len(np.unique(vectors.round(12), axis=0)))
+        rng = np.random.default_rng(self.seed)
+        best = None
+        for _ in range(self.n_init):
+            centroids, labels, inertia = self._kmeans(vectors, k, rng)
+            if best is None or inertia < best[2]:
+                best = (centroids, labels, inertia)
+        centroids, labels, _ = best
+
+        order = np.argsort(-np.bincount(labels, minlength=k), kind='stable')
+        remap = np.empty(k, dtype=np.int64)
+        remap[order] = np.arange(k)
+        self.centroids = centroids[order]
+        self.labels = remap[labels]
+        self.shapes = [self._shape(c) for c in self.centroids]
+        self.dates = dates
+        self.fitted_weeks = len(dates)
+        self.incremental_weeks = 0
+        self._digest = self._hash(vectors)
+        self.refits += 1
+
+    def _kmeans(self, x: np.ndarray, k: int, rng: np.random.Generator) -> tuple:
+        """Un ajuste de k-means (Lloyd) con inicialización k-means++"""
+        n = x.shape[0]
+        centroids = np.empty((k, x.shape[1]))
+        centroids[0] = x[rng.integers(n)]
+        closest = ((x - centroids[0]) ** 2).sum(axis=1)
+        for i in range(1, k):
+            total = closest.sum()
+            pick = rng.choice(n, p=closest / total) if total > 0 else rng.integers(n)
+            centroids[i] = x[pick]
+            closest = np.minimum(closest, ((x - centroids[i]) ** 2).sum(axis=1))
+
+        for _ in range(self.max_iter):
+            labels = self._distances(x, centroids).argmin(axis=1)
+            counts = np.bincount(labels, minlength=k).astype(np.float64)
+            sums = np.stack([np.bincount(labels, weights=x[:, j], minlength=k) for j in range(x.shape[1])], axis=1)
+            # Un cluster vacío conserva su centroide anterior
+            updated = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1.0)[:, None], centroids)
+            shift = ((updated - centroids) ** 2).sum()
+            centroids = updated
+            if shift <= self.tol:
+                break
+
+        distances = self._distances(x, centroids)
+        labels = distances.argmin(axis=1)
+        return centroids, labels, float(distances[np.arange(n), labels].sum())
+
+    @staticmethod
+    def _shape(centroid: np.ndarray) -> tuple:
+        """Clasificar la forma de un centroide: (tipo, índice del día destacado)"""
+        if (centroid > 0.15).all():
+            return 'steady_gain', int(np.argmax(centroid))
+        if (centroid < -0.15).all():
+            return 'steady_loss', int(np.argmin(centroid))
+        day = int(np.argmax(np.abs(centroid)))
+        if centroid[day] > 0 and day <= 1 and centroid[day + 1:].sum() <= 0:
+            return 'strong_start_fade', day
+        if centroid[day] > 0 and day >= 3 and centroid[:day].sum() < 0:
+            return 'late_recovery', day
+        return ('peak_day' if centroid[day] > 0 else 'drop_day'), day
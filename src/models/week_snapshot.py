@@ -0,0 +1,81 @@
+"""
+Foto inmutable del estado del modelo para analizar fuera del hilo de la GUI
+"""
+
+import copy
+from typing import Dict
+from .trading_model import TradingDataModel
+from .trading_model_with_db import TradingDataModelWithDB
+from ..utils.money import from_cents, to_cents
+
+
+class WeekSnapshot(TradingDataModel):
+    """Foto de la semana activa y del historial con la misma interfaz de lectura que el modelo.
+
+    Tomarla cuesta O(1) en el hilo de la GUI: guarda los montos de la semana activa, el
+    estado escalar de las estadísticas incrementales y una referencia al historial de solo
+    lectura del modelo (que se reemplaza al recargarlo, nunca se modifica). Los arrays con
+    la semana activa y las métricas del historial se arman al pedirlos, en el worker.
+    """
+
+    # Reutilizar los cálculos del modelo: solo dependen de los atributos copiados
+    get_total_profit_loss_cents = TradingDataModelWithDB.get_total_profit_loss_cents
+    get_current_balance = TradingDataModelWithDB.get_current_balance
+    get_total_profit_loss = TradingDataModelWithDB.get_total_profit_loss
+    get_profit_loss_percentage = TradingDataModelWithDB.get_profit_loss_percentage
+    get_rollover_capital = TradingDataModelWithDB.get_rollover_capital
+    withdrawal_rate = TradingDataModelWithDB.withdrawal_rate
+
+    def __init__(self, model: TradingDataModelWithDB):
+        super().__init__()
+        self.days = list(model.days)
+        self.destinations = dict(model.destinations)
+        self.data = copy.deepcopy(model.data)
+        self.daily_amounts = dict(model.daily_amounts)
+        self.daily_destinations = dict(model.daily_destinations)
+        self.initial_capital = model.initial_capital
+        self.week_start_date = model.week_start_date
+
+        # Referencias de solo lectura (sin copiar el historial) y estado escalar de las estadísticas
+        self._base = model.get_history_base()
+        self._stats = model.stats.detached()
+        self._history = None
+        self._metrics = None
+        self.drawdown = model.drawdown
+        self.estimator = model.estimator.copy()
+        self.data_version = model.data_version
+        self.custom_metrics = model.custom_metrics
+
+    def get_history_fingerprint(self) -> str:
+        """Huella del historial sin la semana activa (no arma los arrays)"""
+        return self._base['fingerprint']
+
+    def get_history(self) -> Dict:
+        """Historial con la semana activa de la foto (se arma una vez, en el hilo que lo pide)"""
+        if self._history is None:
+            base = self._base
+            row = base['current_row']
+            amounts_cents = base['amounts_cents'].copy()
+            capitals_cents = base['capitals_cents'].copy()
+            amounts_cents[row] = [to_cents(self.daily_amounts.get(day, 0.0)) for day in self.days]
+            capitals_cents[row] = to_cents(self.initial_capital)
+            amounts = base['amounts'].copy()
+            capitals = base['capitals'].copy()
+            amounts[row] = [from_cents(cents) for cents in amounts_cents[row].tolist()]
+            capitals[row] = from_cents(int(capitals_cents[row]))
+            self._history = dict(base, amounts=amounts, capitals=capitals,
+                                 amounts_cents=amounts_cents, capitals_cents=capitals_cents)
+        return self._history
+
+    def get_history_metrics(self) -> Dict:
+        """Métricas del historial en el momento de la foto (calculadas al pedirlas)"""
+        if self._metrics is None:
+            history = self.get_history()
+            self._stats.attach(history['amounts'], history['capitals'])
+            self._metrics = self._stats.snapshot()
+        return self._metrics
+
+    # Mismo cálculo que el modelo, sobre los arrays de la foto y con la caché compartida
+    get_drawdown_report = TradingDataModelWithDB.get_drawdown_report
+    get_next_session_forecast = TradingDataModelWithDB.get_next_session_forecast
+    get_custom_metrics = TradingDataModelWithDB.get_custom_metrics
@@ -0,0 +1,99 @@
+"""
+Efecto día de la semana sobre todo el historial
+Media, varianza, tasa de acierto e intervalos bootstrap por día, sobre una sola
+matriz semanas x días y con el remuestreo vectorizado
+"""
+
+from typing import Dict, List, Optional
+import numpy as np
+
+
+class WeekdayEffectAnalyzer:
+    """Estadísticas por día de la semana con intervalos de confianza bootstrap.
+
+    Solo cuentan los días operados (monto distinto de cero). El bootstrap
+    remuestrea semanas completas, de modo que se conserva la relación entre
+    días de una misma semana; cada remuestreo se representa con el conteo de
+    veces que aparece cada semana y las medias salen de un producto de matrices.
+    """
+
+    def __init__(self, n_boot: int = 1000, confidence: float = 0.95, seed: Optional[int] = 0,
+                 block_cells: int = 2_000_000):
+        self.n_boot = n_boot
+        self.confidence = confidence
+        self.seed = seed
+        # Tamaño máximo (remuestreos x semanas) de la matriz de conteos por bloque
+        self.block_cells = block_cells
+
+    def compute(self, amounts, day_names: Optional[List[str]] = None) -> Dict:
+        """Calcular el informe para la matriz semanas x días"""
+        amounts = np.asarray(amounts, dtype=np.float64).reshape(-1, 5)
+        day_names = list(day_names) if day_names else [f"Día {i + 1}" for i in range(5)]
+        traded = (amounts != 0).astype(np.float64)
+        wins = (amounts > 0).astype(np.float64)
+
+        n = traded.sum(axis=0)
+        sums = amounts.sum(axis=0)
+        mean = np.divide(sums, n, out=np.zeros(5), where=n > 0)
+        sq_dev = (((amounts - mean) ** 2) * traded).sum(axis=0)
+        variance = np.divide(sq_dev, n - 1, out=np.zeros(5), where=n > 1)
+        hit_rate = np.divide(wins.sum(axis=0), n, out=np.zeros(5), where=n > 0)
+
+        low, high, hit_low, hit_high = np.full((4, 5), np.nan)
+        weeks = amounts.shape[0]
+        active = n > 0
+        if weeks >= 2 and self.n_boot > 0 and active.any():
+            boot_mean, boot_hit = self._bootstrap(amounts, traded, wins)
+            tail = (1.0 - self.confidence) / 2 * 100
+            # Solo días con operaciones: un remuestreo sin ese día no aporta (NaN)
+            low[active], high[active] = np.nanpercentile(boot_mean[:, active], [tail, 100 - tail], axis=0)
+            hit_low[active], hit_high[active] = np.nanpercentile(boot_hit[:, active], [tail, 100 - tail], axis=0)
+
+        days = []
+        for i, name in enumerate(day_names):
+            days.append({
+                'day': name,
+                'n': int(n[i]),
+                'total': float(sums[i]),
+                'mean': float(mean[i]),
+                'variance': float(variance[i]),
+                'hit_rate': float(hit_rate[i]),
+                'ci_low': self._finite(low[i]),
+                'ci_high': self._finite(high[i]),
+                'hit_rate_ci_low': self._finite(hit_low[i]),
+                'hit_rate_ci_high': self._finite(hit_high[i])
+            })
+
+        traded_days = [d for d in days if d['n'] > 0]
+        return {
+            'weeks': int(weeks),
+            'confidence': self.confidence,
+            'n_boot': self.n_boot,
+            'days': days,
+            'best_day': max(traded_days, key=lambda d: d['mean'])['day'] if traded_days else None,
+            'worst_day': min(traded_days, key=lambda d: d['mean'])['day'] if traded_days else None
+        }
+
+    def _bootstrap(self, amounts, traded, wins):
+        """Medias y tasas de acierto de cada remuestreo (n_boot x 5), por bloques de remuestreos"""
+        weeks = amounts.shape[0]
+        rng = np.random.default_rng(self.seed)
+        boot_mean = np.empty((self.n_boot, 5))
+        boot_hit = np.empty((self.n_boot, 5))
+        block = max(1, self.block_cells // weeks)
+        for start in range(0, self.n_boot, block):
+            rows = min(block, self.n_boot - start)
+            # Conteo de apariciones de cada semana en cada remuestreo con un solo bincount
+            picks = rng.integers(0, weeks, size=(rows, weeks)) + np.arange(rows)[:, None] * weeks
+            counts = np.bincount(picks.ravel(), minlength=rows * weeks).reshape(rows, weeks).astype(np.float64)
+            boot_n = counts @ traded
+            with np.errstate(invalid='ignore', divide='ignore'):
+                boot_mean[start:start + rows] = np.where(boot_n > 0, (counts @ amounts) / boot_n, np.nan)
+                boot_hit[start:start + rows] = np.where(boot_n > 0, (counts @ wins) / boot_n, np.nan)
+        return boot_mean, boot_hit
+
+    @staticmethod
+    def _finite(value) -> Optional[float]:
+        """Convertir NaN (sin datos suficientes) a None"""
+        value = float(value)
+        return value if np.isfinite(value) else None
@@ -0,0 +1,51 @@
+"""
+Worker para ejecutar el análisis del resumen fuera del hilo de la GUI
+"""
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+
+
+class AnalysisWorker(QObject):
+    """Ejecuta AnalysisService.analyze en un hilo propio.
+
+    Cada solicitud lleva un número de generación; las solicitudes que quedan
+    obsoletas porque llegó otra más reciente se descartan sin calcularse.
+    """
+
+    analysis_requested = pyqtSignal(int, object)  # (generación, WeekSnapshot)
+    analysis_ready = pyqtSignal(int, object)      # (generación, resultado)
+    analysis_failed = pyqtSignal(int, str)        # (generación, error)
+
+    def __init__(self, analysis_service):
+        super().__init__()
+        self.analysis_service = analysis_service
+        self.latest_generation = 0
+
+        self._thread = QThread()
+        self._thread.setObjectName("AnalysisWorker")
+        self.moveToThread(self._thread)
+        # Conexión entre hilos: la solicitud se encola en el hilo del worker
+        self.analysis_requested.connect(self._run)
+        self._thread.start()
+
+    def request(self, generation: int, snapshot):
+        """Encolar un análisis (llamar desde el hilo de la GUI)"""
+        self.latest_generation = generation
+        self.analysis_requested.emit(generation, snapshot)
+
+    @pyqtSlot(int, object)
+    def _run(self, generation: int, snapshot):
+        """Ejecutar el análisis en el hilo del worker"""
+        if generation != self.latest_generation:
+            return
+        try:
+            result = self.analysis_service.analyze(snapshot)
+        except Exception as e:
+            self.analysis_failed.emit(generation, str(e))
+            return
+        self.analysis_ready.emit(generation, result)
+
+    def stop(self):
+        """Detener el hilo del worker"""
+        self._thread.quit()
+        self._thread.wait()
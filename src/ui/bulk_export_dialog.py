@@ -0,0 +1,185 @@
+"""
+Diálogo de exportación masiva: cada semana de un rango de fechas a Excel, CSV y/o JSON
+"""
+
+import os
+from datetime import date, timedelta
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QDateEdit,
+                             QCheckBox, QLineEdit, QPushButton, QProgressBar,
+                             QFileDialog, QMessageBox)
+from PyQt5.QtCore import QDate, QTimer
+from src.ui.export_dialog import format_eta
+from src.utils.i18n import tr
+
+
+class BulkExportDialog(QDialog):
+    """Encola un trabajo en el servicio de exportación y muestra avance, ETA y cancelación"""
+
+    def __init__(self, db_manager, service, destinations=None, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.service = service
+        self.destinations = destinations
+        self.job = None
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(200)
+        self.poll_timer.timeout.connect(self.poll)
+        self.setWindowTitle(tr("export_bulk_title"))
+        self.setModal(True)
+        self.resize(560, 260)
+        self.setup_ui()
+        self.update_count()
+
+    def setup_ui(self):
+        """Configurar la interfaz del diálogo"""
+        layout = QVBoxLayout()
+
+        today = date.today()
+        month_start = today.replace(day=1)
+        dates = QHBoxLayout()
+        dates.addWidget(QLabel(tr("export_bulk_from")))
+        self.from_input = QDateEdit()
+        self.from_input.setCalendarPopup(True)
+        self.from_input.setDate(QDate(month_start.year, month_start.month, month_start.day))
+        dates.addWidget(self.from_input)
+        dates.addWidget(QLabel(tr("export_bulk_to")))
+        self.to_input = QDateEdit()
+        self.to_input.setCalendarPopup(True)
+        self.to_input.setDate(QDate(today.year, today.month, today.day))
+        dates.addWidget(self.to_input)
+        dates.addStretch(1)
+        layout.addLayout(dates)
+        self.from_input.dateChanged.connect(self.update_count)
+        self.to_input.dateChanged.connect(self.update_count)
+
+        formats = QHBoxLayout()
+        formats.addWidget(QLabel(tr("export_bulk_formats")))
+        self.format_checks = {}
+        for file_format, label in (('xlsx', "Excel"), ('csv', "CSV"), ('json', "JSON")):
+            check = QCheckBox(label)
+            check.setChecked(file_format == 'xlsx')
+            formats.addWidget(check)
+            self.format_checks[file_format] = check
+        formats.addStretch(1)
+        layout.addLayout(formats)
+
+        folder = QHBoxLayout()
+        folder.addWidget(QLabel(tr("export_bulk_folder")))
+        self.folder_input = QLineEdit()
+        folder.addWidget(self.folder_input, 1)
+        self.folder_button = QPushButton(tr("export_bulk_select_folder"))
+        self.folder_button.clicked.connect(self.select_folder)
+        folder.addWidget(self.folder_button)
+        layout.addLayout(folder)
+
+        self.skip_unchanged_check = QCheckBox(tr("export_bulk_skip_unchanged"))
+        self.skip_unchanged_check.setChecked(True)
+        layout.addWidget(self.skip_unchanged_check)
+
+        self.count_label = QLabel("")
+        layout.addWidget(self.count_label)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setTextVisible(False)
+        layout.addWidget(self.progress_bar)
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch(1)
+        self.start_button = QPushButton(tr("export_bulk_start"))
+        self.start_button.clicked.connect(self.start)
+        buttons.addWidget(self.start_button)
+        self.cancel_button = QPushButton(tr("cancel"))
+        self.cancel_button.clicked.connect(self.cancel_or_close)
+        buttons.addWidget(self.cancel_button)
+        layout.addLayout(buttons)
+
+        self.setLayout(layout)
+
+    def _range(self):
+        """Rango de lunes (ISO) que cubre las fechas elegidas"""
+        start = self.from_input.date().toPyDate()
+        end = self.to_input.date().toPyDate()
+        start -= timedelta(days=start.weekday())
+        return start.isoformat(), end.isoformat()
+
+    def update_count(self):
+        start, end = self._range()
+        self.count_label.setText(tr("export_bulk_weeks").format(weeks=self.db_manager.count_weeks(start, end)))
+
+    def select_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, tr("export_bulk_select_folder"), self.folder_input.text())
+        if folder:
+            self.folder_input.setText(folder)
+
+    def set_running(self, running: bool):
+        for widget in (self.from_input, self.to_input, self.folder_input, self.folder_button,
+                       self.start_button, self.skip_unchanged_check, *self.format_checks.values()):
+            widget.setEnabled(not running)
+
+    def start(self):
+        """Crear una tarea por semana y formato y encolarlas"""
+        folder = self.folder_input.text().strip()
+        formats = [f for f, check in self.format_checks.items() if check.isChecked()]
+        if not folder or not os.path.isdir(folder) or not formats:
+            QMessageBox.warning(self, tr("warning"), tr("export_bulk_no_folder"))
+            return
+        start, end = self._range()
+        try:
+            tasks = self.service.weeks_tasks(self.db_manager.iter_history(start=start, end=end),
+                                             folder, formats, self.destinations,
+                                             skip_unchanged=self.skip_unchanged_check.isChecked())
+        except Exception as e:
+            QMessageBox.critical(self, tr("export_error"), f"{tr('export_failed')}:\n\n{e}")
+            return
+        if not tasks:
+            QMessageBox.information(self, tr("export_bulk_title"), tr("export_bulk_no_weeks"))
+            return
+        self.set_running(True)
+        self.progress_bar.setValue(0)
+        self.status_label.setText(tr("starting_export"))
+        self.job = self.service.submit(tasks, tr("export_bulk_title"))
+        self.poll_timer.start()
+
+    def poll(self):
+        """Avance real del trabajo (filas escritas) y tiempo restante estimado"""
+        if self.job is None:
+            self.poll_timer.stop()
+            return
+        state = self.job.snapshot()
+        self.progress_bar.setValue(int(state['progress'] * 1000))
+        self.status_label.setText(tr("export_progress_eta").format(
+            done=state['done_rows'], total=state['total_rows'], eta=format_eta(state['eta'])))
+        if not self.job.finished:
+            return
+        self.poll_timer.stop()
+        self.job = None
+        self.set_running(False)
+        if state['status'] == 'cancelled':
+            self.status_label.setText(tr("export_cancelled"))
+            return
+        message = tr("export_bulk_done").format(files=len(state['outputs']), folder=self.folder_input.text())
+        if state['skipped']:
+            message += "\n" + tr("export_bulk_skipped").format(count=len(state['skipped']))
+        if state['errors']:
+            message += "\n\n" + tr("export_bulk_errors").format(count=len(state['errors']))
+            message += "\n" + "\n".join(state['errors'][:10])
+            QMessageBox.warning(self, tr("export_bulk_title"), message)
+        else:
+            QMessageBox.information(self, tr("export_bulk_title"), message)
+        self.status_label.setText(message.split("\n\n")[0])
+
+    def cancel_or_close(self):
+        """Cancelar el trabajo en curso o cerrar el diálogo"""
+        if self.job is not None and not self.job.finished:
+            self.job.cancel()
+        else:
+            self.reject()
+
+    def done(self, result: int):
+        if self.job is not None:
+            self.job.cancel()
+        self.poll_timer.stop()
+        super().done(result)
@@ -0,0 +1,91 @@
+"""
+Diálogo para definir métricas personalizadas con fórmulas
+"""
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox)
+from src.models.custom_metrics import FormulaError
+from src.utils.i18n import tr
+
+
+class CustomMetricsDialog(QDialog):
+    """Tabla nombre / fórmula; al guardar se validan todas las fórmulas"""
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.setWindowTitle(tr("custom_metrics_title"))
+        self.setModal(True)
+        self.resize(720, 420)
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Configurar la interfaz del diálogo"""
+        layout = QVBoxLayout()
+
+        help_label = QLabel(tr("custom_metrics_help"))
+        help_label.setWordWrap(True)
+        help_label.setStyleSheet("font-size: 9pt;")
+        layout.addWidget(help_label)
+
+        self.table = QTableWidget(0, 2)
+        self.table.setHorizontalHeaderLabels([tr("custom_metrics_col_name"), tr("custom_metrics_col_formula")])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        for definition in self.model.custom_metrics.formulas:
+            self._add_row(definition['name'], definition['formula'])
+        layout.addWidget(self.table, 1)
+
+        buttons = QHBoxLayout()
+        self.add_button = QPushButton(tr("custom_metrics_add"))
+        self.add_button.clicked.connect(lambda: self._add_row("", ""))
+        buttons.addWidget(self.add_button)
+        self.remove_button = QPushButton(tr("custom_metrics_remove"))
+        self.remove_button.clicked.connect(self._remove_rows)
+        buttons.addWidget(self.remove_button)
+        buttons.addStretch(1)
+        self.save_button = QPushButton(tr("save"))
+        self.save_button.clicked.connect(self.save)
+        buttons.addWidget(self.save_button)
+        self.cancel_button = QPushButton(tr("cancel"))
+        self.cancel_button.clicked.connect(self.reject)
+        buttons.addWidget(self.cancel_button)
+        layout.addLayout(buttons)
+
+        self.setLayout(layout)
+
+    def _add_row(self, name: str, formula: str):
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.table.setItem(row, 0, QTableWidgetItem(name))
+        self.table.setItem(row, 1, QTableWidgetItem(formula))
+
+    def _remove_rows(self):
+        for row in sorted({index.row() for index in self.table.selectedIndexes()}, reverse=True):
+            self.table.removeRow(row)
+
+    def _definitions(self) -> list:
+        """Filas no vacías de la tabla como definiciones"""
+        definitions = []
+        for row in range(self.table.rowCount()):
+            name_item, formula_item = self.table.item(row, 0), self.table.item(row, 1)
+            name = name_item.text().strip() if name_item else ""
+            formula = formula_item.text().strip() if formula_item else ""
+            if name or formula:
+                definitions.append({'name': name or formula, 'formula': formula})
+        return definitions
+
+    def save(self):
+        """Validar todas las fórmulas y guardarlas"""
+        definitions = self._definitions()
+        for definition in definitions:
+            try:
+                self.model.custom_metrics.validate(definition['formula'])
+            except FormulaError as e:
+                QMessageBox.warning(self, tr("warning"), tr("custom_metrics_invalid").format(
+                    name=definition['name'], error=e))
+                return
+        if not self.model.set_custom_metric_formulas(definitions):
+            QMessageBox.warning(self, tr("warning"), tr("operation_failed"))
+            return
+        self.accept()
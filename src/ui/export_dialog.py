@@ -10,82 +10,45 @@ Versión: 2.1.0
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QComboBox, QGroupBox, QTextEdit,
                              QProgressBar, QFileDialog, QMessageBox, QCheckBox)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, pyqtSlot, QTimer
+from PyQt5.QtCore import Qt, pyqtSlot, QTimer
 from PyQt5.QtGui import QIcon, QPixmap, QFont
 import os
-import pandas as pd
+from datetime import datetime
 from typing import Dict, Any, Optional
 from src.utils.i18n import tr
 
-# Importar nuestro gestor de exportación
-from ..utils.export_manager import ExportManager
+# Servicio de exportación en segundo plano (cola de trabajos con avance real)
+from ..utils.export_service import ExportService, FORMATS
 
 
-class ExportWorker(QThread):
-    """Worker thread para exportación sin bloquear la UI."""
-    
-    progress_updated = pyqtSignal(int)
-    status_message = pyqtSignal(str)
-    export_completed = pyqtSignal(str)
-    export_error = pyqtSignal(str)
-    
-    def __init__(self, export_manager: ExportManager, data: Dict[str, Any], 
-                 week_number: int, file_path: str, include_charts: bool = False):
-        super().__init__()
-        self.export_manager = export_manager
-        self.data = data
-        self.week_number = week_number
-        self.file_path = file_path
-        self.include_charts = include_charts
-        
-    def run(self):
-        """Ejecuta la exportación en segundo plano."""
-        try:
-            self.status_message.emit("Preparando datos para exportación...")
-            self.progress_updated.emit(10)
-            
-            # Conectar señales del export manager
-            self.export_manager.export_completed.connect(self.on_export_completed)
-            self.export_manager.export_error.connect(self.on_export_error)
-            
-            self.status_message.emit("Exportando datos...")
-            self.progress_updated.emit(50)
-            
-            # Realizar exportación
-            success = self.export_manager.export_data(
-                self.data, self.week_number, self.file_path
-            )
-            
-            if success:
-                self.progress_updated.emit(100)
-                self.status_message.emit("¡Exportación completada exitosamente!")
-            else:
-                self.export_error.emit("La exportación falló")
-                
-        except Exception as e:
-            self.export_error.emit(f"Error durante la exportación: {str(e)}")
-    
-    @pyqtSlot(str)
-    def on_export_completed(self, message: str):
-        """Maneja la finalización exitosa de la exportación."""
-        self.export_completed.emit(message)
-    
-    @pyqtSlot(str)
-    def on_export_error(self, error: str):
-        """Maneja errores de exportación."""
-        self.export_error.emit(error)
+def format_eta(seconds: Optional[float]) -> str:
+    """Tiempo restante como m:ss (o h:mm:ss)"""
+    if seconds is None:
+        return "--:--"
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
 
 
 class ExportDialog(QDialog):
     """Diálogo principal de exportación con opciones avanzadas."""
     
-    def __init__(self, data: Dict[str, Any], week_number: int, parent=None):
+    # Formatos de cada opción del selector; la última escribe los tres en paralelo
+    FORMAT_CHOICES = (('xlsx',), ('csv',), ('json',), ('xlsx', 'csv', 'json'))
+
+    def __init__(self, data: Dict[str, Any], week_number: int, parent=None,
+                 service: Optional[ExportService] = None):
         super().__init__(parent)
         self.data = data
         self.week_number = week_number
-        self.export_manager = ExportManager()
-        self.export_worker = None
+        self.export_service = service or ExportService()
+        self._owns_service = service is None
+        self.export_job = None
         self.selected_file_path = None
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(100)
+        self.poll_timer.timeout.connect(self.poll_export)
         
         # Configurar diálogo
         self.setWindowTitle(tr("export_dialog_title"))
@@ -151,7 +114,8 @@ class ExportDialog(QDialog):
         self.format_combo.addItems([
             tr("format_excel_recommended"),
             tr("format_csv_compatible"),
-            tr("format_json_developers")
+            tr("format_json_developers"),
+            tr("format_all")
         ])
         format_selector_layout.addWidget(format_label)
         format_selector_layout.addWidget(self.format_combo)
@@ -301,26 +265,30 @@ class ExportDialog(QDialog):
         """Conecta las señales de la interfaz."""
         self.select_file_btn.clicked.connect(self.select_file)
         self.export_btn.clicked.connect(self.start_export)
-        self.cancel_btn.clicked.connect(self.reject)
-        self.format_combo.currentTextChanged.connect(self.update_preview)
+        self.cancel_btn.clicked.connect(self.cancel_or_close)
+        self.format_combo.currentIndexChanged.connect(self.update_preview)
         self.include_charts_check.stateChanged.connect(self.update_preview)
         self.include_summary_check.stateChanged.connect(self.update_preview)
-        
-        # Conectar señales del export manager
-        self.export_manager.export_completed.connect(self.on_export_success)
-        self.export_manager.export_error.connect(self.on_export_error)
+
+    def selected_formats(self) -> tuple:
+        """Formatos de la opción elegida en el selector"""
+        return self.FORMAT_CHOICES[max(0, self.format_combo.currentIndex())]
     
     def update_preview(self):
         """Actualiza la vista previa según el formato seleccionado."""
-        format_text = self.format_combo.currentText()
+        formats = self.selected_formats()
         
-        if "Excel" in format_text:
+        if len(formats) > 1:
+            preview = """📦 Excel + CSV + JSON
+✅ Los tres archivos se escriben en paralelo
+✅ Mismo nombre base, una extensión por formato"""
+        elif formats[0] == 'xlsx':
             preview = """📊 Formato Excel (.xlsx)
 ✅ Tabla con formato profesional
 ✅ Resumen con gráficos incluidos
 ✅ Múltiples hojas de trabajo
 ✅ Fórmulas y formatos de moneda"""
-        elif "CSV" in format_text:
+        elif formats[0] == 'csv':
             preview = """📋 Formato CSV (.csv)
 ✅ Compatible con Excel, Google Sheets
 ✅ Formato simple y universal
@@ -352,21 +320,21 @@ class ExportDialog(QDialog):
     
     def select_file(self):
         """Muestra diálogo para seleccionar archivo de destino."""
-        format_text = self.format_combo.currentText()
+        formats = self.selected_formats()
         
         # Determinar extensión y filtro
-        if "Excel" in format_text:
+        if len(formats) > 1 or formats[0] == 'xlsx':
             ext = ".xlsx"
             filter_text = "Excel Files (*.xlsx)"
-        elif "CSV" in format_text:
+        elif formats[0] == 'csv':
             ext = ".csv"
-            filter_text = "CSV Files (*.csv)"
+            filter_text = "CSV Files (*.csv);;CSV gzip (*.csv.gz)"
         else:
             ext = ".json"
             filter_text = "JSON Files (*.json)"
         
         # Generar nombre por defecto
-        default_name = f"trading_semana_{self.week_number}_{pd.Timestamp.now().strftime('%Y%m%d')}{ext}"
+        default_name = f"trading_semana_{self.week_number}_{datetime.now().strftime('%Y%m%d')}{ext}"
         
         file_path, _ = QFileDialog.getSaveFileName(
             self,
@@ -381,13 +349,28 @@ class ExportDialog(QDialog):
             self.status_label.setText(f"{tr('selected_file')}: {os.path.basename(file_path)}")
             self.status_label.setStyleSheet("color: #27AE60; font-style: italic;")
     
+    def export_paths(self) -> Dict[str, str]:
+        """Ruta de cada formato elegido; con varios formatos se reemplaza la extensión"""
+        formats = self.selected_formats()
+        if len(formats) == 1:
+            return {formats[0]: self.selected_file_path}
+        base = self.selected_file_path
+        if base.lower().endswith('.csv.gz'):
+            base = base[:-len('.csv.gz')]
+        else:
+            base = os.path.splitext(base)[0]
+        return {file_format: base + FORMATS[file_format] for file_format in formats}
+
     def start_export(self):
-        """Inicia el proceso de exportación."""
+        """Encola la exportación en el servicio y consulta su avance con un temporizador."""
         if not self.selected_file_path:
             QMessageBox.warning(self, tr("warning"), tr("export_failed"))
             return
         
         try:
+            tasks = [self.export_service.week_task(self.data, self.week_number, path, file_format)
+                     for file_format, path in self.export_paths().items()]
+
             # Deshabilitar controles durante la exportación
             self.set_controls_enabled(False)
             self.progress_bar.setVisible(True)
@@ -395,27 +378,52 @@ class ExportDialog(QDialog):
             self.status_label.setText(tr("starting_export"))
             self.status_label.setStyleSheet("color: #3498DB; font-style: italic;")
             
-            # Crear y ejecutar worker
-            self.export_worker = ExportWorker(
-                self.export_manager,
-                self.data,
-                self.week_number,
-                self.selected_file_path,
-                self.include_charts_check.isChecked()
-            )
-            
-            # Conectar señales del worker
-            self.export_worker.progress_updated.connect(self.update_progress)
-            self.export_worker.status_message.connect(self.update_status)
-            self.export_worker.export_completed.connect(self.on_export_success)
-            self.export_worker.export_error.connect(self.on_export_error)
-            
-            # Iniciar exportación
-            self.export_worker.start()
+            self.export_job = self.export_service.submit(tasks, f"{tr('week')} #{self.week_number}")
+            self.poll_timer.start()
             
         except Exception as e:
             self.on_export_error(f"{tr('export_error')}: {str(e)}")
     
+    def poll_export(self):
+        """Refleja el avance real del trabajo y atiende su final."""
+        job = self.export_job
+        if job is None:
+            self.poll_timer.stop()
+            return
+        state = job.snapshot()
+        self.update_progress(int(state['progress'] * 100))
+        self.update_status(tr("export_progress_eta").format(
+            done=state['done_rows'], total=state['total_rows'], eta=format_eta(state['eta'])))
+        if not job.finished:
+            return
+        self.poll_timer.stop()
+        self.export_job = None
+        if state['status'] == 'done':
+            self.on_export_success("\n".join(state['outputs']))
+        elif state['status'] == 'cancelled':
+            self.progress_bar.setVisible(False)
+            self.status_label.setText(tr("export_cancelled"))
+            self.status_label.setStyleSheet("color: #E67E22; font-style: italic;")
+            self.set_controls_enabled(True)
+        else:
+            self.on_export_error("\n".join(state['errors']))
+
+    def cancel_or_close(self):
+        """Cancela la exportación en curso o cierra el diálogo."""
+        if self.export_job is not None and not self.export_job.finished:
+            self.export_job.cancel()
+        else:
+            self.reject()
+
+    def done(self, result: int):
+        """Al cerrar, cancela lo pendiente y libera el servicio propio."""
+        if self.export_job is not None:
+            self.export_job.cancel()
+        self.poll_timer.stop()
+        if self._owns_service:
+            self.export_service.shutdown(wait=False)
+        super().done(result)
+
     def set_controls_enabled(self, enabled: bool):
         """Habilita/deshabilita controles durante la exportación."""
         self.format_combo.setEnabled(enabled)
@@ -455,7 +463,6 @@ class ExportDialog(QDialog):
             self.open_file_location()
         
         # Cerrar diálogo después de un breve delay
-        self.export_worker = None
         QTimer.singleShot(1500, self.accept)
     
     @pyqtSlot(str)
@@ -465,7 +472,6 @@ class ExportDialog(QDialog):
         self.status_label.setStyleSheet("color: #E74C3C; font-weight: bold;")
         self.progress_bar.setVisible(False)
         self.set_controls_enabled(True)
-        self.export_worker = None
         
         QMessageBox.critical(self, tr("export_error"), 
                            f"{tr('export_failed')}:\n\n{error}")
@@ -482,7 +488,8 @@ class ExportDialog(QDialog):
 # 🎯 FUNCIONES DE UTILIDAD
 # =============================================================================
 
-def show_export_dialog(data: Dict[str, Any], week_number: int, parent=None) -> bool:
+def show_export_dialog(data: Dict[str, Any], week_number: int, parent=None,
+                       service: Optional[ExportService] = None) -> bool:
     """
     Muestra el diálogo de exportación y retorna True si fue exitoso.
     
@@ -490,10 +497,11 @@ def show_export_dialog(data: Dict[str, Any], week_number: int, parent=None) -> b
         data: Datos de trading a exportar
         week_number: Número de semana
         parent: Widget padre
+        service: Servicio de exportación compartido (opcional)
         
     Returns:
         bool: True si la exportación fue exitosa
     """
-    dialog = ExportDialog(data, week_number, parent)
+    dialog = ExportDialog(data, week_number, parent, service)
     result = dialog.exec_()
     return result == QDialog.Accepted
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Diálogo para calcular el rendimiento diario necesario para llegar a una meta de capital
+"""
+
+from datetime import timedelta
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
+                             QDateEdit, QPushButton, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QMessageBox)
+from PyQt5.QtCore import Qt, QDate
+from src.models.goal_solver import GoalSolver
+from src.utils.i18n import tr
+
+
+class GoalDialog(QDialog):
+    """Metas de capital: rendimiento diario requerido y tabla semana a semana"""
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.solver = GoalSolver(model.withdrawal_rate)
+        self.setWindowTitle(tr("goal_title"))
+        self.setModal(True)
+        self.resize(720, 520)
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Configurar la interfaz del diálogo"""
+        layout = QVBoxLayout()
+
+        inputs = QHBoxLayout()
+        inputs.addWidget(QLabel(tr("goal_targets_label")))
+        self.targets_input = QLineEdit()
+        balance = self.model.get_current_balance()
+        self.targets_input.setText(f"{balance * 1.5:.2f}, {balance * 2:.2f}")
+        inputs.addWidget(self.targets_input, 1)
+
+        inputs.addWidget(QLabel(tr("goal_date_label")))
+        self.date_input = QDateEdit()
+        self.date_input.setCalendarPopup(True)
+        target = self.model.week_start_date + timedelta(weeks=12, days=4)
+        self.date_input.setDate(QDate(target.year, target.month, target.day))
+        inputs.addWidget(self.date_input)
+
+        self.calculate_button = QPushButton(tr("goal_calculate"))
+        self.calculate_button.clicked.connect(self.calculate)
+        inputs.addWidget(self.calculate_button)
+        layout.addLayout(inputs)
+
+        self.result_label = QLabel("")
+        self.result_label.setWordWrap(True)
+        self.result_label.setStyleSheet("font-size: 10pt;")
+        layout.addWidget(self.result_label)
+
+        self.schedule_table = QTableWidget(0, 6)
+        self.schedule_table.setHorizontalHeaderLabels([
+            tr("goal_col_week"), tr("goal_col_start"), tr("goal_col_daily"),
+            tr("goal_col_profit"), tr("goal_col_withdrawal"), tr("goal_col_end")
+        ])
+        self.schedule_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.schedule_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.schedule_table, 1)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch(1)
+        self.close_button = QPushButton(tr("close"))
+        self.close_button.clicked.connect(self.accept)
+        buttons.addWidget(self.close_button)
+        layout.addLayout(buttons)
+
+        self.setLayout(layout)
+        self.calculate()
+
+    def _parse_targets(self):
+        """Metas separadas por comas o punto y coma"""
+        text = self.targets_input.text().replace(';', ',')
+        return [float(part) for part in text.split(',') if part.strip()]
+
+    def calculate(self):
+        """Resolver todas las metas a la vez y mostrar la tabla de la primera"""
+        try:
+            targets = self._parse_targets()
+        except ValueError:
+            QMessageBox.warning(self, tr("warning"), tr("goal_invalid_targets"))
+            return
+        if not targets:
+            QMessageBox.warning(self, tr("warning"), tr("goal_invalid_targets"))
+            return
+
+        target_date = self.date_input.date().toPyDate()
+        result = self.solver.solve_for_model(self.model, targets, target_date)
+
+        lines = []
+        for i, target in enumerate(result['targets']):
+            if not result['feasible'][i] and not result['already_reached'][i]:
+                lines.append(tr("goal_infeasible").format(target=target, date=result['target_dates'][i]))
+                continue
+            line = tr("goal_result_line").format(
+                target=target,
+                date=result['target_dates'][i],
+                daily_pct=result['required_daily_return'][i] * 100,
+                daily=result['required_daily_amount'][i],
+                weeks=result['weeks'][i]
+            )
+            if result['already_reached'][i]:
+                line += " " + tr("goal_reached")
+            lines.append(line)
+        self.result_label.setText("\n".join(lines))
+
+        rows = result['schedule']
+        self.schedule_table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            values = [row['week_start'], row['start_capital'], row['daily_amount'],
+                      row['weekly_profit'], row['withdrawal'], row['end_capital']]
+            for c, value in enumerate(values):
+                text = value if isinstance(value, str) else f"${value:,.2f}"
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignCenter if c == 0 else Qt.AlignRight | Qt.AlignVCenter)
+                self.schedule_table.setItem(r, c, item)
@@ -1,11 +1,35 @@
 from PyQt5.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
-    QPushButton, QMessageBox
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QPushButton, QMessageBox, QHeaderView, QAbstractItemView
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QFileSystemWatcher, QTimer
+from datetime import datetime
 import os
 import sys
 
+from ..utils.money import from_cents
+from ..utils.saved_weeks import SavedWeeksIndex
+
+SORT_ROLE = Qt.UserRole + 1
+# Per-file watches cost a descriptor (kqueue) or an inotify watch each: above this many
+# week files only the folder is watched
+MAX_WATCHED_FILES = 64
+
+
+class _SortableItem(QTableWidgetItem):
+    """Cell that sorts by a raw key (cents, bytes, ns) instead of its display text."""
+
+    def __init__(self, text: str, key):
+        super().__init__(text)
+        self.setData(SORT_ROLE, key)
+
+    def __lt__(self, other):
+        mine, theirs = self.data(SORT_ROLE), other.data(SORT_ROLE)
+        if mine is None or theirs is None:
+            # Unreadable files (no metrics) sort before any value
+            return mine is None and theirs is not None
+        return mine < theirs
+
 
 class LoadWeekDialog(QDialog):
     def __init__(self, parent=None, tr=lambda k: k):
@@ -15,9 +39,40 @@ class LoadWeekDialog(QDialog):
         self.setModal(True)
 
         self.selected_file_path = None
+        self.index = None
+        self._week_items = {}  # file name -> week cell (its row changes when sorting)
+
+        # Live refresh: folder events (files added/removed/replaced) and, for small folders,
+        # in-place writes to the week files are collected and applied together after a short pause.
+        # The app's own saves always reach the folder: SavedWeeksIndex.record() replaces the
+        # index file by rename, and the rescan compares every file's size and mtime
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._on_directory_changed)
+        self.watcher.fileChanged.connect(self._on_file_changed)
+        self._rescan_pending = False
+        self._pending_files = set()
+        self._per_file_watches = False
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(250)
+        self._refresh_timer.timeout.connect(self._apply_pending_changes)
 
-        self.list_widget = QListWidget(self)
-        self.list_widget.itemDoubleClicked.connect(self._load_selected_and_accept)
+        # One row per saved week, metrics read from the folder index (not from each file)
+        self.table = QTableWidget(0, 7, self)
+        self.table.setHorizontalHeaderLabels([
+            self.tr("week_label"), self.tr("saved_col_total"), self.tr("saved_col_capital"),
+            self.tr("saved_col_balance"), self.tr("saved_col_days"), self.tr("saved_col_modified"),
+            self.tr("saved_col_size")
+        ])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.sortByColumn(0, Qt.DescendingOrder)
+        self.table.cellDoubleClicked.connect(lambda *_: self._load_selected_and_accept())
+        self.resize(760, 420)
 
         btn_load = QPushButton(self.tr("load_week_action"))
         btn_delete = QPushButton(self.tr("delete_week"))
@@ -35,7 +90,7 @@ class LoadWeekDialog(QDialog):
         buttons_layout.addStretch(1)
         buttons_layout.addWidget(btn_cancel)
 
-        main_layout.addWidget(self.list_widget)
+        main_layout.addWidget(self.table)
         main_layout.addLayout(buttons_layout)
         self.setLayout(main_layout)
 
@@ -51,7 +106,9 @@ class LoadWeekDialog(QDialog):
                 pass
 
     def _populate(self):
-        self.list_widget.clear()
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(0)
+        self._week_items.clear()
         saved_dir = self._get_saved_dir()
 
         if not os.path.isdir(saved_dir):
@@ -59,20 +116,145 @@ class LoadWeekDialog(QDialog):
             QMessageBox.information(self, self.tr("information"), self.tr("no_saved_weeks"))
             return
 
-        files = [f for f in os.listdir(saved_dir) if f.lower().endswith(".json")]
-        if not files:
+        # Only new or modified files (by size/mtime) are opened to update the index
+        self.index = SavedWeeksIndex(saved_dir)
+        try:
+            self.index.refresh()
+        except Exception as e:
+            print(f"Error al actualizar el índice de semanas guardadas: {e}")
+        entries = self.index.weeks()
+        self._watch(saved_dir, [entry['file'] for entry in entries])
+        if not entries:
             QMessageBox.information(self, self.tr("information"), self.tr("no_saved_weeks"))
             return
 
-        # Sort by filename descending (recent first) if names contain date
-        files.sort(reverse=True)
+        self.table.setRowCount(len(entries))
+        for row, entry in enumerate(entries):
+            self._set_row(row, entry, os.path.join(saved_dir, entry['file']))
+        # Re-enabling sorting applies the current header sort (newest week first by default)
+        self.table.setSortingEnabled(True)
+
+    def _set_row(self, row: int, entry: dict, full_path: str):
+        def money(key):
+            cents = entry.get(key)
+            return _SortableItem("—" if cents is None else f"${from_cents(cents):,.2f}", cents)
+
+        positive, negative = entry.get('positive_days'), entry.get('negative_days')
+        modified = datetime.fromtimestamp(entry['mtime_ns'] / 1e9)
+        week_item = _SortableItem(self._format_label(entry['file'], entry['week']), entry['week'])
+        week_item.setData(Qt.UserRole, full_path)
+        self._week_items[entry['file']] = week_item
+        if entry.get('error'):
+            week_item.setToolTip(entry['error'])
+        total_item = money('total_cents')
+        if entry.get('total_cents'):
+            total_item.setForeground(Qt.darkGreen if entry['total_cents'] > 0 else Qt.red)
+
+        cells = [
+            week_item,
+            total_item,
+            money('capital_cents'),
+            money('balance_cents'),
+            _SortableItem("—" if positive is None else f"{positive} / {negative}", positive),
+            _SortableItem(modified.strftime("%Y-%m-%d %H:%M"), entry['mtime_ns']),
+            _SortableItem(f"{entry['size'] / 1024:.1f} KB", entry['size'])
+        ]
+        for column, item in enumerate(cells):
+            if column:
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            self.table.setItem(row, column, item)
+
+    # ------------------------------------------------------------------
+    # Live refresh
+    # ------------------------------------------------------------------
+    def _watch(self, saved_dir: str, file_names):
+        """Watch the folder, plus its week files while there are at most MAX_WATCHED_FILES."""
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+        if self.watcher.files():
+            self.watcher.removePaths(self.watcher.files())
+        self.watcher.addPath(saved_dir)
+        self._per_file_watches = len(file_names) <= MAX_WATCHED_FILES
+        if file_names and self._per_file_watches:
+            self.watcher.addPaths([os.path.join(saved_dir, name) for name in file_names])
+
+    def _watch_files(self, paths):
+        """Add per-file watches; past MAX_WATCHED_FILES fall back to folder events only."""
+        if not self._per_file_watches or not paths:
+            return
+        if len(self.index.entries) > MAX_WATCHED_FILES:
+            self._per_file_watches = False
+            if self.watcher.files():
+                self.watcher.removePaths(self.watcher.files())
+            return
+        self.watcher.addPaths(paths)
+
+    def _on_directory_changed(self, _path: str):
+        # Added, removed or replaced files: needs a listing (stat only, no file is opened)
+        self._rescan_pending = True
+        self._refresh_timer.start()
+
+    def _on_file_changed(self, path: str):
+        # Written in place: only this file is checked, without listing the folder
+        self._pending_files.add(os.path.basename(path))
+        self._refresh_timer.start()
+
+    def _apply_pending_changes(self):
+        if self.index is None:
+            return
+        pending, self._pending_files = self._pending_files, set()
+        rescan, self._rescan_pending = self._rescan_pending, False
+        try:
+            # A listing already stats every file, so it covers the pending ones too
+            changes = self.index.refresh() if rescan else self.index.refresh_files(pending)
+        except Exception as e:
+            print(f"Error al actualizar el índice de semanas guardadas: {e}")
+            return
+        # A file replaced by rename is a new inode and the OS drops its watch: add it again
+        watched = set(self.watcher.files())
+        lost = [path for path in (os.path.join(self.index.folder, name) for name in pending)
+                if path not in watched and os.path.isfile(path)]
+        self._watch_files(lost)
+        self._apply_changes(changes)
+
+    def _apply_changes(self, changes: dict):
+        """Apply an index diff to the table: only the affected rows are touched."""
+        if not any(changes.values()):
+            return
+        saved_dir = self.index.folder
+        selected = self._get_selected_path()
+        watched = set(self.watcher.files())
+        new_watches = []
+        self.table.setSortingEnabled(False)
+
+        for name in changes['removed']:
+            item = self._week_items.pop(name, None)
+            if item is not None:
+                self.table.removeRow(self.table.row(item))
+            path = os.path.join(saved_dir, name)
+            if path in watched:
+                self.watcher.removePath(path)
+        for name in changes['added'] + changes['changed']:
+            entry = self.index.entries.get(name)
+            if entry is None:
+                continue
+            item = self._week_items.get(name)
+            if item is None:
+                row = self.table.rowCount()
+                self.table.insertRow(row)
+            else:
+                row = self.table.row(item)
+            path = os.path.join(saved_dir, name)
+            self._set_row(row, entry, path)
+            if path not in watched:
+                new_watches.append(path)
 
-        for fname in files:
-            full_path = os.path.join(saved_dir, fname)
-            label = self._format_label(fname)
-            item = QListWidgetItem(label)
-            item.setData(Qt.UserRole, full_path)
-            self.list_widget.addItem(item)
+        self._watch_files(new_watches)
+        self.table.setSortingEnabled(True)
+        if selected:
+            item = self._week_items.get(os.path.basename(selected))
+            if item is not None:
+                self.table.selectRow(self.table.row(item))
 
     def _get_saved_dir(self) -> str:
         """Resolve the Weekend-Saved path near the executable when frozen, else project root."""
@@ -85,16 +267,15 @@ class LoadWeekDialog(QDialog):
         except Exception:
             return os.path.join(os.getcwd(), "Weekend-Saved")
 
-    def _format_label(self, fname: str) -> str:
+    def _format_label(self, fname: str, week: str) -> str:
         # Expect pattern like weekend_trading_YYYY-MM-DD.json
-        base = os.path.splitext(fname)[0]
-        if "weekend_trading_" in base:
-            date_part = base.split("weekend_trading_")[-1]
-            return f"{self.tr('week_label')} {date_part}"
-        return base
+        if "weekend_trading_" in fname:
+            return f"{self.tr('week_label')} {week}"
+        return os.path.splitext(fname)[0]
 
     def _get_selected_path(self):
-        item = self.list_widget.currentItem()
+        row = self.table.currentRow()
+        item = self.table.item(row, 0) if row >= 0 else None
         if item is None:
             return None
         return item.data(Qt.UserRole)
@@ -125,8 +306,10 @@ class LoadWeekDialog(QDialog):
 
         try:
             os.remove(path)
+            if self.index is not None:
+                self.index.forget(path)
+            self._apply_changes({'added': [], 'removed': [os.path.basename(path)], 'changed': []})
             QMessageBox.information(self, self.tr("operation_completed"), self.tr("delete_success"))
-            self._populate()
         except Exception:
             QMessageBox.critical(self, self.tr("error"), self.tr("delete_error"))
 
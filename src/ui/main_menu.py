@@ -27,9 +27,20 @@ class MainMenuBar(QMenuBar):
     daily_advice_visibility_changed = pyqtSignal(bool)
     show_weekly_summary_triggered = pyqtSignal()
     start_new_week_triggered = pyqtSignal()
+    show_projection_triggered = pyqtSignal()
+    show_patterns_triggered = pyqtSignal()
+    show_goal_solver_triggered = pyqtSignal()
+    show_custom_metrics_triggered = pyqtSignal()
     export_excel_triggered = pyqtSignal()
     export_csv_triggered = pyqtSignal()
     export_json_triggered = pyqtSignal()
+    export_history_excel_triggered = pyqtSignal()
+    export_history_csv_triggered = pyqtSignal()
+    export_history_columnar_triggered = pyqtSignal()
+    import_history_columnar_triggered = pyqtSignal()
+    import_spreadsheet_triggered = pyqtSignal()
+    import_trades_triggered = pyqtSignal()
+    export_bulk_triggered = pyqtSignal()
     language_changed = pyqtSignal(str)
     
     def __init__(self, parent=None):
@@ -66,6 +77,24 @@ class MainMenuBar(QMenuBar):
         self._actions['load_db'].setStatusTip(tr('status_load_db'))
         self._actions['load_db'].triggered.connect(self.load_from_db_triggered.emit)
         self._menus['file'].addAction(self._actions['load_db'])
+
+        # Acción Importar historial desde Parquet / Arrow
+        self._actions['import_history_columnar'] = QAction(tr('import_history_columnar'), self)
+        self._actions['import_history_columnar'].setStatusTip(tr('status_import_history_columnar'))
+        self._actions['import_history_columnar'].triggered.connect(self.import_history_columnar_triggered.emit)
+        self._menus['file'].addAction(self._actions['import_history_columnar'])
+
+        # Acción Importar historial desde Excel / CSV
+        self._actions['import_spreadsheet'] = QAction(tr('import_spreadsheet'), self)
+        self._actions['import_spreadsheet'].setStatusTip(tr('status_import_spreadsheet'))
+        self._actions['import_spreadsheet'].triggered.connect(self.import_spreadsheet_triggered.emit)
+        self._menus['file'].addAction(self._actions['import_spreadsheet'])
+
+        # Acción Importar operaciones desde un extracto de la plataforma
+        self._actions['import_trades'] = QAction(tr('import_trades'), self)
+        self._actions['import_trades'].setStatusTip(tr('status_import_trades'))
+        self._actions['import_trades'].triggered.connect(self.import_trades_triggered.emit)
+        self._menus['file'].addAction(self._actions['import_trades'])
         
         self._menus['file'].addSeparator()
         
@@ -133,6 +162,30 @@ class MainMenuBar(QMenuBar):
         self._actions['start_new_week_reset'].setStatusTip(tr('status_start_new_week_reset'))
         self._actions['start_new_week_reset'].triggered.connect(self.start_new_week_triggered.emit)
         self._menus['assistant'].addAction(self._actions['start_new_week_reset'])
+
+        # Acción: Proyección Monte Carlo del capital
+        self._actions['monte_carlo'] = QAction(tr('monte_carlo'), self)
+        self._actions['monte_carlo'].setStatusTip(tr('status_monte_carlo'))
+        self._actions['monte_carlo'].triggered.connect(self.show_projection_triggered.emit)
+        self._menus['assistant'].addAction(self._actions['monte_carlo'])
+
+        # Acción: Patrones semanales del historial
+        self._actions['week_patterns'] = QAction(tr('week_patterns'), self)
+        self._actions['week_patterns'].setStatusTip(tr('status_week_patterns'))
+        self._actions['week_patterns'].triggered.connect(self.show_patterns_triggered.emit)
+        self._menus['assistant'].addAction(self._actions['week_patterns'])
+
+        # Acción: Meta de capital (rendimiento diario requerido)
+        self._actions['goal_solver'] = QAction(tr('goal_solver'), self)
+        self._actions['goal_solver'].setStatusTip(tr('status_goal_solver'))
+        self._actions['goal_solver'].triggered.connect(self.show_goal_solver_triggered.emit)
+        self._menus['assistant'].addAction(self._actions['goal_solver'])
+
+        # Acción: Métricas personalizadas con fórmulas
+        self._actions['custom_metrics'] = QAction(tr('custom_metrics'), self)
+        self._actions['custom_metrics'].setStatusTip(tr('status_custom_metrics'))
+        self._actions['custom_metrics'].triggered.connect(self.show_custom_metrics_triggered.emit)
+        self._menus['assistant'].addAction(self._actions['custom_metrics'])
         
         # Menú Exportar
         self._menus['export'] = self.addMenu(tr('menu_export'))
@@ -153,6 +206,28 @@ class MainMenuBar(QMenuBar):
         self._actions['export_json'].setStatusTip(tr('status_export_json'))
         self._actions['export_json'].triggered.connect(self.export_json_triggered)
         self._menus['export'].addAction(self._actions['export_json'])
+
+        # Historial completo (todas las semanas guardadas)
+        self._menus['export'].addSeparator()
+        self._actions['export_history_excel'] = QAction(tr('export_history_excel'), self)
+        self._actions['export_history_excel'].setStatusTip(tr('status_export_history_excel'))
+        self._actions['export_history_excel'].triggered.connect(self.export_history_excel_triggered)
+        self._menus['export'].addAction(self._actions['export_history_excel'])
+
+        self._actions['export_history_csv'] = QAction(tr('export_history_csv'), self)
+        self._actions['export_history_csv'].setStatusTip(tr('status_export_history_csv'))
+        self._actions['export_history_csv'].triggered.connect(self.export_history_csv_triggered)
+        self._menus['export'].addAction(self._actions['export_history_csv'])
+
+        self._actions['export_history_columnar'] = QAction(tr('export_history_columnar'), self)
+        self._actions['export_history_columnar'].setStatusTip(tr('status_export_history_columnar'))
+        self._actions['export_history_columnar'].triggered.connect(self.export_history_columnar_triggered)
+        self._menus['export'].addAction(self._actions['export_history_columnar'])
+
+        self._actions['export_bulk'] = QAction(tr('export_bulk'), self)
+        self._actions['export_bulk'].setStatusTip(tr('status_export_bulk'))
+        self._actions['export_bulk'].triggered.connect(self.export_bulk_triggered)
+        self._menus['export'].addAction(self._actions['export_bulk'])
         
         # Menú Ayuda
         self._menus['help'] = self.addMenu(tr('menu_help'))
@@ -340,12 +415,34 @@ class MainMenuBar(QMenuBar):
             self._actions['weekly_summary'].setText(tr('weekly_summary'))
         if 'start_new_week_reset' in self._actions:
             self._actions['start_new_week_reset'].setText(tr('start_new_week_reset'))
+        if 'monte_carlo' in self._actions:
+            self._actions['monte_carlo'].setText(tr('monte_carlo'))
+        if 'week_patterns' in self._actions:
+            self._actions['week_patterns'].setText(tr('week_patterns'))
+        if 'goal_solver' in self._actions:
+            self._actions['goal_solver'].setText(tr('goal_solver'))
+        if 'custom_metrics' in self._actions:
+            self._actions['custom_metrics'].setText(tr('custom_metrics'))
         if 'export_excel' in self._actions:
             self._actions['export_excel'].setText(tr('export_excel'))
         if 'export_csv' in self._actions:
             self._actions['export_csv'].setText(tr('export_csv'))
         if 'export_json' in self._actions:
             self._actions['export_json'].setText(tr('export_json'))
+        if 'export_history_excel' in self._actions:
+            self._actions['export_history_excel'].setText(tr('export_history_excel'))
+        if 'export_history_csv' in self._actions:
+            self._actions['export_history_csv'].setText(tr('export_history_csv'))
+        if 'export_history_columnar' in self._actions:
+            self._actions['export_history_columnar'].setText(tr('export_history_columnar'))
+        if 'export_bulk' in self._actions:
+            self._actions['export_bulk'].setText(tr('export_bulk'))
+        if 'import_history_columnar' in self._actions:
+            self._actions['import_history_columnar'].setText(tr('import_history_columnar'))
+        if 'import_spreadsheet' in self._actions:
+            self._actions['import_spreadsheet'].setText(tr('import_spreadsheet'))
+        if 'import_trades' in self._actions:
+            self._actions['import_trades'].setText(tr('import_trades'))
         if 'about' in self._actions:
             self._actions['about'].setText(tr('about'))
         if 'instructions' in self._actions:
@@ -378,12 +475,34 @@ class MainMenuBar(QMenuBar):
             self._actions['weekly_summary'].setStatusTip(tr('status_weekly_summary'))
         if 'start_new_week_reset' in self._actions:
             self._actions['start_new_week_reset'].setStatusTip(tr('status_start_new_week_reset'))
+        if 'monte_carlo' in self._actions:
+            self._actions['monte_carlo'].setStatusTip(tr('status_monte_carlo'))
+        if 'week_patterns' in self._actions:
+            self._actions['week_patterns'].setStatusTip(tr('status_week_patterns'))
+        if 'goal_solver' in self._actions:
+            self._actions['goal_solver'].setStatusTip(tr('status_goal_solver'))
+        if 'custom_metrics' in self._actions:
+            self._actions['custom_metrics'].setStatusTip(tr('status_custom_metrics'))
         if 'export_excel' in self._actions:
             self._actions['export_excel'].setStatusTip(tr('status_export_excel'))
         if 'export_csv' in self._actions:
             self._actions['export_csv'].setStatusTip(tr('status_export_csv'))
         if 'export_json' in self._actions:
             self._actions['export_json'].setStatusTip(tr('status_export_json'))
+        if 'export_history_excel' in self._actions:
+            self._actions['export_history_excel'].setStatusTip(tr('status_export_history_excel'))
+        if 'export_history_csv' in self._actions:
+            self._actions['export_history_csv'].setStatusTip(tr('status_export_history_csv'))
+        if 'export_history_columnar' in self._actions:
+            self._actions['export_history_columnar'].setStatusTip(tr('status_export_history_columnar'))
+        if 'export_bulk' in self._actions:
+            self._actions['export_bulk'].setStatusTip(tr('status_export_bulk'))
+        if 'import_history_columnar' in self._actions:
+            self._actions['import_history_columnar'].setStatusTip(tr('status_import_history_columnar'))
+        if 'import_spreadsheet' in self._actions:
+            self._actions['import_spreadsheet'].setStatusTip(tr('status_import_spreadsheet'))
+        if 'import_trades' in self._actions:
+            self._actions['import_trades'].setStatusTip(tr('status_import_trades'))
         if 'about' in self._actions:
             self._actions['about'].setStatusTip(tr('status_about'))
         if 'instructions' in self._actions:
@@ -17,6 +17,8 @@ class SummaryPanel(QWidget):
         # Mantener últimos datos para re-aplicar colores al cambiar tema
         self.last_summary = {}
         self.last_capital = {}
+        self.last_drawdown = {}
+        self.last_custom_metrics = []
     
     def setup_ui(self):
         """Configurar la interfaz del panel"""
@@ -131,6 +133,27 @@ class SummaryPanel(QWidget):
         self.advice_group.setLayout(advice_layout)
         layout.addWidget(self.advice_group)
 
+        # Sección de drawdown y rachas del historial
+        self.drawdown_group = QGroupBox(tr("drawdown_title"))
+        drawdown_layout = QVBoxLayout()
+        self.drawdown_label = QLabel(tr("drawdown_no_data"))
+        self.drawdown_label.setWordWrap(True)
+        self.drawdown_label.setStyleSheet("font-size: 10pt; color: #2c3e50;")
+        drawdown_layout.addWidget(self.drawdown_label)
+        self.drawdown_group.setLayout(drawdown_layout)
+        layout.addWidget(self.drawdown_group)
+
+        # Sección de métricas personalizadas (solo visible si hay definiciones)
+        self.custom_metrics_group = QGroupBox(tr("custom_metrics_title"))
+        custom_metrics_layout = QVBoxLayout()
+        self.custom_metrics_label = QLabel("")
+        self.custom_metrics_label.setWordWrap(True)
+        self.custom_metrics_label.setStyleSheet("font-size: 10pt; color: #2c3e50;")
+        custom_metrics_layout.addWidget(self.custom_metrics_label)
+        self.custom_metrics_group.setLayout(custom_metrics_layout)
+        self.custom_metrics_group.setVisible(False)
+        layout.addWidget(self.custom_metrics_group)
+
         # Sección de análisis AI
         self.ai_group = QGroupBox(tr("ai_analysis_title"))
         ai_layout = QVBoxLayout()
@@ -275,6 +298,55 @@ class SummaryPanel(QWidget):
         html = f"<b>{title}</b><br><br>{replaced}"
         self.daily_advice_label.setText(html)
 
+    def update_drawdown(self, report: dict):
+        """Actualizar la sección de drawdown y rachas del historial"""
+        self.last_drawdown = report
+        if not report or not report.get('days'):
+            self.drawdown_label.setText(tr("drawdown_no_data"))
+            return
+        lines = [tr("drawdown_max").format(
+            amount=report['max_drawdown_amount'],
+            pct=report['max_drawdown_pct'] * 100,
+            duration=report['drawdown_duration']
+        )]
+        if report['max_drawdown_amount'] > 0:
+            if report['time_to_recover'] is not None:
+                lines.append(tr("drawdown_recovery").format(
+                    days=report['time_to_recover'], date=report['recovery_date'] or ''
+                ))
+            else:
+                lines.append(tr("drawdown_not_recovered"))
+        lines.append(tr("drawdown_current").format(
+            amount=report['current_drawdown_amount'], days=report['current_underwater']
+        ))
+        lines.append(tr("drawdown_streaks").format(
+            wins=report['longest_win_streak'],
+            losses=report['longest_loss_streak'],
+            current=report['current_streak']
+        ))
+        self.drawdown_label.setText("\n".join(lines))
+
+    def update_custom_metrics(self, metrics: list):
+        """Actualizar la sección de métricas personalizadas"""
+        self.last_custom_metrics = metrics or []
+        self.custom_metrics_group.setVisible(bool(self.last_custom_metrics))
+        lines = []
+        for metric in self.last_custom_metrics:
+            if metric.get('error'):
+                lines.append(tr("custom_metric_error").format(name=metric['name'], error=metric['error']))
+            else:
+                lines.append(tr("custom_metric_line").format(
+                    name=metric['name'],
+                    value=self._format_metric(metric.get('value')),
+                    mean=self._format_metric(metric.get('mean'))
+                ))
+        self.custom_metrics_label.setText("\n".join(lines))
+
+    @staticmethod
+    def _format_metric(value) -> str:
+        """Formato compacto para valores de métricas personalizadas"""
+        return "—" if value is None else f"{value:,.4g}"
+
     def apply_language(self):
         """Aplicar traducciones a títulos y etiquetas del panel"""
         self.title_label.setText(tr("weekly_summary_panel"))
@@ -283,6 +355,10 @@ class SummaryPanel(QWidget):
         self.reinvestment_group.setTitle(tr("reinvestment"))
         self.performance_group.setTitle(tr("performance"))
         self.advice_group.setTitle(tr("daily_advice_title"))
+        self.drawdown_group.setTitle(tr("drawdown_title"))
+        self.update_drawdown(self.last_drawdown)
+        self.custom_metrics_group.setTitle(tr("custom_metrics_title"))
+        self.update_custom_metrics(self.last_custom_metrics)
         self.ai_group.setTitle(tr("ai_analysis_title"))
         # Encabezados principales (se actualizan con datos)
         # Mantener valores actuales pero traducir prefijos
@@ -414,7 +490,7 @@ class SummaryPanel(QWidget):
                 }
                 """
             )
-            for group in [self.withdrawal_group, self.total_group, self.reinvestment_group, self.performance_group, self.advice_group, self.ai_group]:
+            for group in [self.withdrawal_group, self.total_group, self.reinvestment_group, self.performance_group, self.advice_group, self.drawdown_group, self.custom_metrics_group, self.ai_group]:
                 group.setStyleSheet(
                     """
                     QGroupBox {
@@ -441,6 +517,8 @@ class SummaryPanel(QWidget):
             self.performance_label.setStyleSheet("font-size: 12pt; font-weight: bold; color: #e0e0e0;")
             self.days_label.setStyleSheet("font-size: 10pt; color: #b0b0b0;")
             self.daily_advice_label.setStyleSheet("font-size: 10pt; color: #e0e0e0;")
+            self.drawdown_label.setStyleSheet("font-size: 10pt; color: #e0e0e0;")
+            self.custom_metrics_label.setStyleSheet("font-size: 10pt; color: #e0e0e0;")
             self.ai_summary_label.setStyleSheet(
                 """
                 QLabel {
@@ -489,7 +567,7 @@ class SummaryPanel(QWidget):
                 }
                 """
             )
-            for group in [self.withdrawal_group, self.total_group, self.reinvestment_group, self.performance_group, self.advice_group, self.ai_group]:
+            for group in [self.withdrawal_group, self.total_group, self.reinvestment_group, self.performance_group, self.advice_group, self.drawdown_group, self.custom_metrics_group, self.ai_group]:
                 group.setStyleSheet("")
             self.initial_capital_label.setStyleSheet("font-size: 12pt; font-weight: bold; color: #34495e;")
             self.current_balance_label.setStyleSheet("font-size: 14pt; font-weight: bold; color: #2c3e50;")
@@ -499,6 +577,8 @@ class SummaryPanel(QWidget):
             self.performance_label.setStyleSheet("font-size: 12pt; font-weight: bold; color: #3498db;")
             self.days_label.setStyleSheet("font-size: 10pt; color: #7f8c8d;")
             self.daily_advice_label.setStyleSheet("font-size: 10pt; color: #2c3e50;")
+            self.drawdown_label.setStyleSheet("font-size: 10pt; color: #2c3e50;")
+            self.custom_metrics_label.setStyleSheet("font-size: 10pt; color: #2c3e50;")
             self.ai_summary_label.setStyleSheet(
                 """
                 QLabel {
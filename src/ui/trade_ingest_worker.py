@@ -0,0 +1,53 @@
+"""
+Hilo para ingerir extractos de operaciones sin bloquear la interfaz
+"""
+
+import threading
+from datetime import date, timedelta
+from typing import Optional
+from PyQt5.QtCore import QThread, pyqtSignal
+from src.models.trade_ledger import TradeLedger
+from src.utils.trade_ingest import IngestCancelled, TradeIngestor
+
+
+class TradeIngestWorker(QThread):
+    """Ejecuta TradeIngestor.ingest_file en un hilo propio.
+
+    progress informa las filas leídas tras cada lote; cancel() detiene la ingesta
+    al terminar el lote en curso (los lotes ya guardados se conservan).
+    Si se indica week_start, al terminar también arma en este hilo el registro de
+    operaciones de esa semana, para no leerlo de la BD en el hilo de la interfaz.
+    """
+
+    progress = pyqtSignal(int)          # filas leídas
+    completed = pyqtSignal(object, object)  # IngestReport, TradeLedger de week_start (o None)
+    failed = pyqtSignal(str)
+
+    def __init__(self, db_manager, file_path: str, week_start: Optional[date] = None, parent=None):
+        super().__init__(parent)
+        self.setObjectName("TradeIngestWorker")
+        self.db_manager = db_manager
+        self.ingestor = TradeIngestor(db_manager)
+        self.file_path = file_path
+        self.week_start = week_start
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _on_progress(self, rows: int):
+        if self._cancel.is_set():
+            raise IngestCancelled()
+        self.progress.emit(rows)
+
+    def run(self):
+        try:
+            report = self.ingestor.ingest_file(self.file_path, self._on_progress)
+            ledger = None
+            if self.week_start is not None:
+                ledger = TradeLedger.from_db(self.db_manager, self.week_start.isoformat(),
+                                             (self.week_start + timedelta(days=6)).isoformat())
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.completed.emit(report, ledger)
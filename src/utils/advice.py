@@ -3,13 +3,55 @@ Sistema de consejos diarios y resumen semanal con soporte i18n.
 """
 
 from datetime import datetime
-from .i18n import tr, current_language
+from . import i18n
+from .i18n import tr
 
-def get_daily_advice(model):
+# Días entrenados necesarios para mostrar el rango esperado de la próxima sesión
+MIN_FORECAST_SAMPLES = 10
+
+def get_daily_advice(model, today_idx=None):
     """Obtener consejo del día basado en el día actual y el rendimiento.
-    Devuelve un dict con 'title' y 'message'.
+    Si el modelo tiene historial suficiente, se agrega el rango esperado de P/L
+    de la próxima sesión. Devuelve un dict con 'title' y 'message'.
     """
-    today_idx = datetime.now().weekday()  # 0=Lunes ... 6=Domingo
+    if today_idx is None:
+        today_idx = datetime.now().weekday()  # 0=Lunes ... 6=Domingo
+    advice = _scripted_advice(model, today_idx)
+    forecast_line = _forecast_line(model, today_idx)
+    if forecast_line:
+        advice['message'] += f"\n\n{forecast_line}"
+    return advice
+
+
+def _forecast_line(model, today_idx):
+    """Texto con el rango esperado de la próxima sesión, o '' si no hay pronóstico"""
+    if not hasattr(model, 'get_next_session_forecast'):
+        return ''
+    # Próxima sesión: hoy si aún no tiene monto, si no el siguiente día hábil
+    if today_idx <= 4 and model.daily_amounts.get(model.days[today_idx], 0) == 0:
+        weekday = today_idx
+    else:
+        weekday = today_idx + 1 if today_idx < 4 else 0
+    try:
+        forecast = model.get_next_session_forecast(weekday)
+    except Exception as e:
+        print(f"Error al calcular el pronóstico de la próxima sesión: {e}")
+        return ''
+    if forecast['samples'] < MIN_FORECAST_SAMPLES:
+        return ''
+    day_keys = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday']
+    return tr('advice_forecast').format(
+        day=tr(day_keys[weekday]),
+        expected=forecast['expected'],
+        low=forecast['low'],
+        high=forecast['high'],
+        coverage=forecast['coverage'] * 100,
+        samples=forecast['samples']
+    )
+
+
+def _scripted_advice(model, today_idx):
+    """Consejo fijo según el día de la semana y el signo del resultado"""
     total = model.get_total_profit_loss()
     percentage = model.get_profit_loss_percentage()
     initial = model.initial_capital
@@ -29,7 +71,7 @@ def get_daily_advice(model):
     )
 
     if today_idx == 0:  # Lunes / Monday
-        if current_language == 'es':
+        if i18n.current_language == 'es':
             msg = (
                 "Arranca la semana con foco y energía 💪. Define 1-2 objetivos reales y planifica tus operaciones clave.\n"
                 "• Revisa capital y riesgos antes de operar.\n"
@@ -46,7 +88,7 @@ def get_daily_advice(model):
         return {"title": f"{tr('daily_advice_title')} - {day}", "message": f"{base}\n\n{msg}"}
 
     if today_idx == 1:  # Martes / Tuesday
-        if current_language == 'es':
+        if i18n.current_language == 'es':
             msg = (
                 "Consolida el momentum: busca confirmaciones, no persigas entradas tardías.\n"
                 "• Ajusta stops a estructura real, no a números redondos.\n"
@@ -61,7 +103,7 @@ def get_daily_advice(model):
         return {"title": f"{tr('daily_advice_title')} - {day}", "message": f"{base}\n\n{msg}"}
 
     if today_idx == 2:  # Miércoles / Wednesday
-        if current_language == 'es':
+        if i18n.current_language == 'es':
             msg = (
                 "Mitad de semana: evalúa progreso y ajusta el rumbo.\n"
                 "• Si vas bien, evita el exceso de confianza.\n"
@@ -78,7 +120,7 @@ def get_daily_advice(model):
         return {"title": f"{tr('daily_advice_title')} - {day}", "message": f"{base}\n\n{msg}"}
 
     if today_idx == 3:  # Jueves / Thursday
-        if current_language == 'es':
+        if i18n.current_language == 'es':
             msg = (
                 "Prepara el cierre semanal. Sé selectivo y evita forzar trades.\n"
                 "• Prioriza setups con confluencias claras.\n"
@@ -95,7 +137,7 @@ def get_daily_advice(model):
         return {"title": f"{tr('daily_advice_title')} - {day}", "message": f"{base}\n\n{msg}"}
 
     if today_idx == 4:  # Viernes / Friday
-        if current_language == 'es':
+        if i18n.current_language == 'es':
             msg = (
                 "Cierra la semana con cabeza fría.\n"
                 "• No arriesgues ganancias consolidadas.\n"
@@ -114,7 +156,7 @@ def get_daily_advice(model):
     if today_idx == 5:  # Sábado / Saturday
         withdraw = max(0.0, total) * 0.30
         reinvest = max(0.0, total) - withdraw
-        if current_language == 'es':
+        if i18n.current_language == 'es':
             msg = (
                 "Día de promedio semanal y retiros.\n"
                 f"• Resultado semanal: ${total:.2f}.\n"
@@ -135,7 +177,7 @@ def get_daily_advice(model):
         return {"title": f"{tr('daily_advice_title')} - {day}", "message": f"{base}\n\n{msg}"}
 
     # Domingo / Sunday
-    if current_language == 'es':
+    if i18n.current_language == 'es':
         msg = (
             "Descansa y prepara la estrategia de la próxima semana.\n"
             "• Revisa diarios y marcas clave.\n"
@@ -162,11 +204,11 @@ def get_weekly_summary_message(model):
     reinvest = max(0.0, total) - withdraw
 
     if total >= 0:
-        headline = ("¡Semana de ganancias! 🎉" if current_language == 'es' else "Profitable week! 🎉")
+        headline = ("¡Semana de ganancias! 🎉" if i18n.current_language == 'es' else "Profitable week! 🎉")
     else:
-        headline = ("Semana desafiante 💡" if current_language == 'es' else "Challenging week 💡")
+        headline = ("Semana desafiante 💡" if i18n.current_language == 'es' else "Challenging week 💡")
 
-    if current_language == 'es':
+    if i18n.current_language == 'es':
         message = (
             f"{headline}\n\n"
             f"Capital inicial: ${initial:.2f}\n"
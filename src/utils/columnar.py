@@ -0,0 +1,195 @@
+"""
+Exportación e importación columnar (Parquet / Arrow IPC) del historial a nivel de día
+pyarrow es opcional: se importa solo al usar estas funciones
+"""
+
+import os
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+import numpy as np
+from .money import cents_array
+
+# Columnas del archivo, una fila por día
+COLUMNS = ('account', 'date', 'weekday', 'amount', 'destination', 'capital')
+DAYS_PER_WEEK = 5
+
+
+def _pyarrow():
+    """Importar pyarrow de forma diferida con un mensaje claro si no está instalado"""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute  # noqa: F401
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError("La exportación Parquet/Arrow requiere pyarrow (pip install pyarrow)") from e
+    return pa
+
+
+def is_available() -> bool:
+    """Indica si pyarrow está instalado (sin importarlo)"""
+    import importlib.util
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def columnar_format(file_path: str) -> str:
+    """'parquet' o 'arrow' según la extensión del archivo"""
+    ext = os.path.splitext(file_path)[1].lower()
+    return 'parquet' if ext in ('.parquet', '.pq') else 'arrow'
+
+
+def _schema(pa):
+    return pa.schema([
+        ('account', pa.dictionary(pa.int8(), pa.string())),
+        ('date', pa.date32()),
+        ('weekday', pa.int8()),
+        ('amount', pa.float64()),
+        ('destination', pa.dictionary(pa.int8(), pa.string())),
+        ('capital', pa.float64())
+    ])
+
+
+def _chunks(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_history(rows: Iterable[tuple], file_path: str, account: str = "default",
+                  destinations: Optional[List[str]] = None, chunk_weeks: int = 8192,
+                  file_format: Optional[str] = None,
+                  progress: Optional[Callable[[int], None]] = None) -> int:
+    """Escribir el historial en Parquet o Arrow IPC por bloques de semanas.
+
+    rows: filas (week_start_date, lunes..viernes, initial_capital) en orden cronológico,
+    por ejemplo DatabaseManager.iter_history(). Cada bloque se convierte con NumPy en
+    un RecordBatch (un row group en Parquet) y se escribe de inmediato.
+    progress(n) recibe las semanas de cada bloque escrito y puede lanzar una excepción
+    para cancelar. Devuelve la cantidad de días escritos.
+    """
+    pa = _pyarrow()
+    file_format = file_format or columnar_format(file_path)
+    schema = _schema(pa)
+    destinations = list(destinations) if destinations else [''] * DAYS_PER_WEEK
+    unique_destinations = list(dict.fromkeys(destinations))
+    destination_codes = np.array([unique_destinations.index(d) for d in destinations], dtype=np.int8)
+    account_dictionary = pa.array([str(account)])
+    destination_dictionary = pa.array(unique_destinations)
+    offsets = np.arange(DAYS_PER_WEEK)
+
+    if file_format == 'parquet':
+        writer = pa.parquet.ParquetWriter(file_path, schema, compression='zstd')
+    else:
+        writer = pa.ipc.new_file(file_path, schema)
+
+    written = 0
+    try:
+        for chunk in _chunks(rows, chunk_weeks):
+            weeks = len(chunk)
+            mondays = np.array([str(r[0])[:10] for r in chunk], dtype='datetime64[D]')
+            amounts = np.array([r[1:6] for r in chunk], dtype=np.float64).reshape(-1, DAYS_PER_WEEK)
+            capitals = np.array([r[6] for r in chunk], dtype=np.float64)
+            days = weeks * DAYS_PER_WEEK
+            batch = pa.RecordBatch.from_arrays([
+                pa.DictionaryArray.from_arrays(pa.array(np.zeros(days, dtype=np.int8)), account_dictionary),
+                pa.array((mondays[:, None] + offsets).ravel()),
+                pa.array(np.tile(offsets.astype(np.int8), weeks)),
+                pa.array(np.nan_to_num(amounts).ravel()),
+                pa.DictionaryArray.from_arrays(pa.array(np.tile(destination_codes, weeks)),
+                                               destination_dictionary),
+                pa.array(np.repeat(np.nan_to_num(capitals), DAYS_PER_WEEK))
+            ], schema=schema)
+            writer.write_batch(batch)
+            written += days
+            if progress is not None:
+                progress(weeks)
+    finally:
+        writer.close()
+    return written
+
+
+def read_history(file_path: str):
+    """Abrir un archivo del historial como tabla de pyarrow.
+    Arrow IPC se lee con memory map: las columnas apuntan al archivo sin copiarse.
+    """
+    pa = _pyarrow()
+    if columnar_format(file_path) == 'parquet':
+        return pa.parquet.read_table(file_path, memory_map=True)
+    source = pa.memory_map(file_path, 'r')
+    return pa.ipc.open_file(source).read_all()
+
+
+def iter_weeks(table, account: Optional[str] = None) -> Iterator[tuple]:
+    """Filas (week_start_date, lunes..viernes, initial_capital) desde la tabla.
+
+    Recorre los record batches sin concatenarlos: los montos de cada batch se ven
+    como array de NumPy sin copia y se agrupan por semana con reshape. Si se indica
+    account, solo se consideran los días de esa cuenta.
+    """
+    pa = _pyarrow()
+    pending = None
+    for batch in table.to_batches():
+        if account is not None:
+            batch = batch.filter(pa.compute.equal(batch.column(0).cast(pa.string()), account))
+        if batch.num_rows == 0:
+            continue
+        dates = batch.column(1).to_numpy(zero_copy_only=False)
+        weekdays = batch.column(2).to_numpy()
+        amounts = batch.column(3).to_numpy()
+        capitals = batch.column(5).to_numpy()
+        if pending is not None:
+            dates, weekdays, amounts, capitals = (np.concatenate(pair) for pair in
+                                                  zip(pending, (dates, weekdays, amounts, capitals)))
+            pending = None
+        # Un batch puede cortar una semana: el resto se une al siguiente
+        complete = (len(amounts) // DAYS_PER_WEEK) * DAYS_PER_WEEK
+        if complete < len(amounts):
+            pending = (dates[complete:], weekdays[complete:], amounts[complete:], capitals[complete:])
+        yield from _weeks(dates[:complete], weekdays[:complete], amounts[:complete], capitals[:complete])
+    if pending is not None and len(pending[0]):
+        raise ValueError("El archivo tiene semanas incompletas (se esperan 5 días por semana)")
+
+
+def _weeks(dates, weekdays, amounts, capitals) -> Iterator[tuple]:
+    """Agrupar días consecutivos de a cinco y validar que sean de lunes a viernes"""
+    if len(amounts) == 0:
+        return
+    if not (weekdays.reshape(-1, DAYS_PER_WEEK) == np.arange(DAYS_PER_WEEK)).all():
+        raise ValueError("Los días del archivo no están ordenados de lunes a viernes")
+    mondays = dates.reshape(-1, DAYS_PER_WEEK)[:, 0].astype('datetime64[D]').astype(str)
+    week_amounts = amounts.reshape(-1, DAYS_PER_WEEK).tolist()
+    week_capitals = capitals.reshape(-1, DAYS_PER_WEEK)[:, 0].tolist()
+    for monday, days, capital in zip(mondays.tolist(), week_amounts, week_capitals):
+        yield (monday, *days, capital)
+
+
+def accounts_in(table) -> List[str]:
+    """Cuentas presentes en la tabla"""
+    pa = _pyarrow()
+    return pa.compute.unique(table.column('account').cast(pa.string())).to_pylist()
+
+
+def history_arrays(table, account: Optional[str] = None) -> Dict:
+    """Arrays del historial con el mismo formato que TradingDataModelWithDB.get_history().
+    Con un solo record batch los montos se ven sin copia; con varios se concatenan una vez.
+    """
+    pa = _pyarrow()
+    if account is not None:
+        table = table.filter(pa.compute.equal(table.column('account').cast(pa.string()), account))
+    weekdays = table.column('weekday').to_numpy()
+    if len(weekdays) % DAYS_PER_WEEK or not (weekdays.reshape(-1, DAYS_PER_WEEK) == np.arange(DAYS_PER_WEEK)).all():
+        raise ValueError("Los días del archivo no están ordenados de lunes a viernes")
+    dates = table.column('date').to_numpy().astype('datetime64[D]')
+    amounts = table.column('amount').to_numpy().reshape(-1, DAYS_PER_WEEK)
+    capitals = table.column('capital').to_numpy()[::DAYS_PER_WEEK]
+    return {
+        'dates': dates[::DAYS_PER_WEEK].astype(str).tolist(),
+        'amounts': amounts,
+        'capitals': capitals,
+        'amounts_cents': cents_array(amounts),
+        'capitals_cents': cents_array(capitals)
+    }
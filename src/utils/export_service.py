@@ -0,0 +1,296 @@
+"""
+Servicio de exportación en segundo plano
+Cola de trabajos sobre un pool de hilos persistente, con avance real por filas,
+cancelación cooperativa y varios formatos / semanas escritos en paralelo.
+No emite señales: la interfaz consulta el estado de cada trabajo (por ejemplo con un QTimer).
+"""
+
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional
+from .exporters import FORMATS, Exporter, format_from_path, week_export_data
+
+_job_ids = itertools.count(1)
+
+
+class ExportCancelled(Exception):
+    """El trabajo de exportación fue cancelado"""
+
+
+class ExportTask:
+    """Un archivo a escribir.
+
+    write(progress) escribe el archivo; rows es la cantidad de filas que aporta al avance.
+    Si incremental es True, write informa el avance llamando a progress(n) mientras
+    escribe; si no, las filas se cuentan juntas al terminar el archivo.
+    """
+
+    def __init__(self, path: str, rows: int, write: Callable, incremental: bool = False):
+        self.path = path
+        self.rows = max(1, int(rows))
+        self.write = write
+        self.incremental = incremental
+        # Registro en el manifiesto: (manifiesto, semana, formato, hash); skip reutiliza el archivo
+        self.manifest_entry = None
+        self.skip = False
+
+
+class ExportJob:
+    """Estado de un trabajo: filas escritas, errores, archivos generados y cancelación"""
+
+    def __init__(self, tasks: List[ExportTask], name: str = ""):
+        self.id = next(_job_ids)
+        self.name = name
+        # Las salidas sin cambios no se encolan ni cuentan para el avance y la ETA
+        self.skipped: List[str] = [task.path for task in tasks if task.skip]
+        self.tasks = [task for task in tasks if not task.skip]
+        self.total_rows = sum(task.rows for task in self.tasks)
+        self.outputs: List[str] = []
+        self.errors: List[str] = []
+        self.status = 'queued'
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._done_rows = 0
+        self._pending = len(self.tasks)
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+        if not self.tasks:
+            self._finish()
+
+    # ------------------------------------------------------------------
+    # Control
+    # ------------------------------------------------------------------
+    def cancel(self):
+        """Pedir la cancelación; las tareas en curso se detienen en la próxima fila"""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Esperar a que terminen todas las tareas"""
+        return self._finished.wait(timeout)
+
+    def advance(self, rows: int):
+        """Sumar filas escritas; lanza ExportCancelled si se pidió cancelar"""
+        if self._cancel.is_set():
+            raise ExportCancelled()
+        with self._lock:
+            self._done_rows += rows
+
+    # ------------------------------------------------------------------
+    # Avance
+    # ------------------------------------------------------------------
+    @property
+    def done_rows(self) -> int:
+        with self._lock:
+            return self._done_rows
+
+    def progress(self) -> float:
+        """Fracción de filas escritas (0 a 1)"""
+        return min(1.0, self.done_rows / self.total_rows) if self.total_rows else 1.0
+
+    def eta(self) -> Optional[float]:
+        """Segundos restantes estimados con el ritmo observado (None sin datos suficientes)"""
+        done = self.done_rows
+        if self.finished:
+            return 0.0
+        if self.started_at is None or done == 0:
+            return None
+        elapsed = time.monotonic() - self.started_at
+        return elapsed * (self.total_rows - done) / done
+
+    def snapshot(self) -> Dict:
+        """Estado actual para mostrar en la interfaz"""
+        eta = self.eta()
+        with self._lock:
+            return {
+                'id': self.id,
+                'name': self.name,
+                'status': self.status,
+                'done_rows': self._done_rows,
+                'total_rows': self.total_rows,
+                'progress': min(1.0, self._done_rows / self.total_rows) if self.total_rows else 1.0,
+                'eta': eta,
+                'outputs': list(self.outputs),
+                'skipped': list(self.skipped),
+                'errors': list(self.errors)
+            }
+
+    # ------------------------------------------------------------------
+    # Ejecución (llamado desde los hilos del pool)
+    # ------------------------------------------------------------------
+    def _run_task(self, task: ExportTask):
+        try:
+            with self._lock:
+                if self.started_at is None:
+                    self.started_at = time.monotonic()
+                    self.status = 'running'
+            if self._cancel.is_set():
+                raise ExportCancelled()
+            if task.incremental:
+                task.write(self.advance)
+            else:
+                task.write(None)
+                self.advance(task.rows)
+            if task.manifest_entry is not None:
+                manifest, week, file_format, content_hash = task.manifest_entry
+                manifest.record(week, file_format, content_hash, task.path)
+            with self._lock:
+                self.outputs.append(task.path)
+        except ExportCancelled:
+            self._remove_partial(task.path)
+        except Exception as e:
+            self._remove_partial(task.path)
+            with self._lock:
+                self.errors.append(f"{os.path.basename(task.path)}: {e}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+                last = self._pending == 0
+            if last:
+                self._finish()
+
+    @staticmethod
+    def _remove_partial(path: str):
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            print(f"No se pudo eliminar el archivo parcial {path}: {e}")
+
+    def _finish(self):
+        # Guardar los manifiestos con las salidas escritas (también si se canceló a mitad)
+        for manifest in {id(t.manifest_entry[0]): t.manifest_entry[0] for t in self.tasks
+                         if t.manifest_entry is not None}.values():
+            try:
+                manifest.save()
+            except OSError as e:
+                with self._lock:
+                    self.errors.append(f"{manifest.FILE_NAME}: {e}")
+        with self._lock:
+            if self._cancel.is_set():
+                self.status = 'cancelled'
+            elif self.errors:
+                self.status = 'failed'
+            else:
+                self.status = 'done'
+            self.finished_at = time.monotonic()
+        self._finished.set()
+
+
+class ExportService:
+    """Cola de trabajos de exportación sobre un pool de hilos que vive lo que la aplicación.
+
+    Los trabajos se atienden en orden de llegada; las tareas de un trabajo (formatos,
+    semanas) se reparten entre los hilos del pool. Las funciones write_* de
+    Exporter no emiten señales, así que se pueden usar desde cualquier hilo.
+    """
+
+    def __init__(self, exporter: Optional[Exporter] = None, max_workers: Optional[int] = None):
+        self.exporter = exporter or Exporter()
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='export')
+        self._lock = threading.Lock()
+        self.jobs: List[ExportJob] = []
+
+    # ------------------------------------------------------------------
+    # Construcción de tareas
+    # ------------------------------------------------------------------
+    def week_task(self, data: Dict, week_number: int, file_path: str,
+                  file_format: Optional[str] = None) -> ExportTask:
+        """Exportar una semana (xlsx, csv o json); aporta una fila por día"""
+        file_format = file_format or format_from_path(file_path)
+        if file_format not in FORMATS:
+            raise ValueError(f"Formato no soportado: {file_format}")
+        days = len(self.exporter._normalize_daily_data(data)) or 5
+        return ExportTask(file_path, days,
+                          lambda progress: self.exporter.write(data, file_path, week_number, file_format))
+
+    def history_task(self, rows_factory: Callable[[], Iterable[tuple]], total_weeks: int,
+                     file_path: str, destinations: Optional[List[str]] = None) -> ExportTask:
+        """Exportar el historial completo a xlsx o csv con avance por semana escrita.
+        rows_factory se llama dentro del hilo (por ejemplo, lambda: db.iter_history()).
+        """
+        if format_from_path(file_path) == 'xlsx':
+            def write(progress):
+                self.exporter.write_history_excel(rows_factory(), file_path, progress=progress)
+        else:
+            def write(progress):
+                self.exporter.write_history_csv(rows_factory(), file_path, destinations=destinations,
+                                                progress=progress)
+        return ExportTask(file_path, total_weeks, write, incremental=True)
+
+    def columnar_history_task(self, rows_factory: Callable[[], Iterable[tuple]], total_weeks: int,
+                              file_path: str, account: str = "default",
+                              destinations: Optional[List[str]] = None,
+                              chunk_weeks: int = 1024) -> ExportTask:
+        """Exportar el historial completo a Parquet o Arrow IPC con avance por bloque de semanas.
+        pyarrow se importa dentro del hilo: si falta, el error queda en job.errors.
+        """
+        def write(progress):
+            from . import columnar
+            columnar.write_history(rows_factory(), file_path, account, destinations,
+                                   chunk_weeks=chunk_weeks, progress=progress)
+        return ExportTask(file_path, total_weeks, write, incremental=True)
+
+    def weeks_tasks(self, rows: Iterable[tuple], folder: str, formats: Iterable[str],
+                    destinations: Optional[List[str]] = None,
+                    skip_unchanged: bool = True) -> List[ExportTask]:
+        """Una tarea por semana y formato, con nombres trading_semana_<fecha>.<ext> en folder.
+        Con skip_unchanged, las salidas cuyo hash coincide con el manifiesto de la carpeta
+        se reutilizan sin reescribirse (quedan en job.skipped).
+        """
+        tasks = []
+        formats = [f for f in formats if f in FORMATS]
+        manifest = self.exporter.manifest(folder)
+        for row in rows:
+            data = week_export_data(row, destinations)
+            week = data['week_start_date']
+            week_number = date.fromisoformat(week).isocalendar()[1]
+            for file_format in formats:
+                path = os.path.join(folder, f"trading_semana_{week}{FORMATS[file_format]}")
+                task = self.week_task(data, week_number, path, file_format)
+                content_hash = manifest.content_hash(data, file_format)
+                task.manifest_entry = (manifest, week, file_format, content_hash)
+                task.skip = skip_unchanged and manifest.is_current(path, content_hash)
+                tasks.append(task)
+        return tasks
+
+    # ------------------------------------------------------------------
+    # Cola
+    # ------------------------------------------------------------------
+    def submit(self, tasks: List[ExportTask], name: str = "") -> ExportJob:
+        """Encolar un trabajo y devolverlo para consultar su avance o cancelarlo"""
+        job = ExportJob(tasks, name)
+        with self._lock:
+            self.jobs = [j for j in self.jobs if not j.finished]
+            self.jobs.append(job)
+        for task in job.tasks:
+            self._pool.submit(job._run_task, task)
+        return job
+
+    def active_jobs(self) -> List[ExportJob]:
+        """Trabajos en cola o en curso"""
+        with self._lock:
+            return [job for job in self.jobs if not job.finished]
+
+    def cancel_all(self):
+        """Cancelar todos los trabajos pendientes"""
+        for job in self.active_jobs():
+            job.cancel()
+
+    def shutdown(self, wait: bool = True):
+        """Cancelar lo pendiente y detener el pool (al cerrar la aplicación)"""
+        self.cancel_all()
+        self._pool.shutdown(wait=wait)
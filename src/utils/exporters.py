@@ -0,0 +1,897 @@
+"""
+Núcleo de exportación sin dependencias de Qt
+Escritores de Excel, CSV y JSON, datos de exportación de semanas guardadas, resumen
+del historial y manifiesto de salidas. Lo usan ExportManager (interfaz), el servicio
+de exportación en segundo plano y la línea de comandos (python -m wtf).
+"""
+
+import csv
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import xlsxwriter
+from .i18n import tr
+from .money import from_cents, quantize, to_cents
+
+# Extensión de archivo de cada formato
+FORMATS = {'xlsx': '.xlsx', 'csv': '.csv', 'json': '.json'}
+
+
+def format_from_path(file_path: str) -> str:
+    """'xlsx', 'csv' o 'json' según la extensión (.csv.gz es CSV)"""
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == '.gz':
+        return 'csv'
+    return ext[1:] if ext[1:] in FORMATS else 'xlsx'
+
+
+# Días de la semana y destinos por defecto (los mismos que TradingDataModel)
+DAYS = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes']
+DEFAULT_DESTINATIONS = ['Retiro Personal', 'Retiro Personal', 'Reinversión', 'Retiro Personal', 'Retiro Personal']
+
+
+def week_export_data(row: tuple, destinations: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Datos de exportación de una semana guardada, con el mismo formato que
+    TradingDataModelWithDB.get_weekly_data() más el resumen de TradingDataModel.get_weekly_summary().
+    row: (week_start_date, lunes..viernes, initial_capital), como en DatabaseManager.iter_history().
+    """
+    week_start, *amounts, capital = row
+    cents = [to_cents(amount) for amount in amounts]
+    amounts = [from_cents(value) for value in cents]
+    destinations = list(destinations) if destinations else DEFAULT_DESTINATIONS
+    capital = quantize(capital)
+    total_cents = sum(cents)
+    total = from_cents(total_cents)
+    positive = sum(max(0, value) for value in cents)
+    negative = sum(abs(min(0, value)) for value in cents)
+    return {
+        'days': list(DAYS),
+        'daily_amounts': dict(zip(DAYS, amounts)),
+        'daily_destinations': dict(zip(DAYS, destinations)),
+        'initial_capital': capital,
+        'week_start_date': str(week_start)[:10],
+        'current_balance': from_cents(to_cents(capital) + total_cents),
+        'total_profit_loss': total,
+        'profit_loss_percentage': (total / capital * 100) if capital else 0.0,
+        'weekly_total': total,
+        'performance_percentage': (positive - negative) / (positive + negative) * 100 if positive + negative > 0 else 0,
+        'positive_days': sum(1 for amount in amounts if amount > 0),
+        'negative_days': sum(1 for amount in amounts if amount < 0),
+        'total_withdrawals': from_cents(sum(c for c, d in zip(cents, destinations) if d == 'Retiro Personal')),
+        'total_reinvestment': from_cents(sum(c for c, d in zip(cents, destinations) if d == 'Reinversión'))
+    }
+
+
+class HistorySummary:
+    """Resumen del historial acumulado en una sola pasada y con memoria constante.
+    Los totales se acumulan en centavos enteros: el resultado no depende del orden ni
+    de la cantidad de semanas."""
+
+    def __init__(self):
+        self.weeks = 0
+        self.total_cents = 0
+        self.positive_days = 0
+        self.negative_days = 0
+        self.best_cents: Optional[int] = None
+        self.worst_cents: Optional[int] = None
+        self.first: Optional[str] = None
+        self.last: Optional[str] = None
+        self.last_capital = 0.0
+
+    def add(self, week_start: str, amounts: Iterable[float], capital: float = 0.0) -> float:
+        """Sumar una semana; devuelve su total."""
+        week_cents = 0
+        for amount in amounts:
+            cents = to_cents(amount)
+            week_cents += cents
+            self.positive_days += cents > 0
+            self.negative_days += cents < 0
+        self.weeks += 1
+        self.total_cents += week_cents
+        self.best_cents = week_cents if self.best_cents is None else max(self.best_cents, week_cents)
+        self.worst_cents = week_cents if self.worst_cents is None else min(self.worst_cents, week_cents)
+        self.first = self.first or week_start
+        self.last = week_start
+        self.last_capital = quantize(capital)
+        return from_cents(week_cents)
+
+    @property
+    def total(self) -> float:
+        return from_cents(self.total_cents)
+
+    @property
+    def best(self) -> Optional[float]:
+        return None if self.best_cents is None else from_cents(self.best_cents)
+
+    @property
+    def worst(self) -> Optional[float]:
+        return None if self.worst_cents is None else from_cents(self.worst_cents)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'weeks': self.weeks,
+            'first_week': self.first,
+            'last_week': self.last,
+            'total': self.total,
+            'average_week': self.total / self.weeks if self.weeks else 0.0,
+            'best_week': self.best,
+            'worst_week': self.worst,
+            'positive_days': self.positive_days,
+            'negative_days': self.negative_days,
+            'last_initial_capital': self.last_capital
+        }
+
+
+def summarize_history(rows: Iterable[tuple]) -> Dict[str, Any]:
+    """Resumen de filas (week_start_date, lunes..viernes, initial_capital)."""
+    summary = HistorySummary()
+    for week_start, *amounts, capital in rows:
+        summary.add(week_start, amounts, capital)
+    return summary.to_dict()
+
+
+class ExportManifest:
+    """Registro de lo ya exportado en una carpeta: (semana, formato, hash del contenido, archivo).
+
+    Se guarda como JSON junto a los archivos. Una salida está al día si el archivo sigue
+    existiendo y el hash de los datos de origen no cambió, así que puede reutilizarse
+    en lugar de volver a escribirla. Es seguro usarlo desde varios hilos.
+    """
+
+    FILE_NAME = '.wtf_export_manifest.json'
+    # Subir al cambiar el contenido que producen los write_*: invalida todo lo registrado
+    VERSION = 1
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.path = os.path.join(folder, self.FILE_NAME)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get('version') == self.VERSION:
+                self.entries = stored.get('entries', {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Manifiesto de exportación ilegible, se regenera: {e}")
+
+    @classmethod
+    def content_hash(cls, data: Any, file_format: str) -> str:
+        """Hash de los datos de origen, el formato y el idioma de las etiquetas."""
+        payload = json.dumps([cls.VERSION, file_format, tr('monday'), data],
+                             sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def is_current(self, file_path: str, content_hash: str) -> bool:
+        """True si el archivo existe y se escribió con el mismo contenido."""
+        with self._lock:
+            entry = self.entries.get(os.path.basename(file_path))
+        return entry is not None and entry.get('hash') == content_hash and os.path.exists(file_path)
+
+    def record(self, week: str, file_format: str, content_hash: str, file_path: str):
+        """Registrar una salida recién escrita."""
+        with self._lock:
+            self.entries[os.path.basename(file_path)] = {
+                'week': week, 'format': file_format, 'hash': content_hash, 'path': file_path
+            }
+            self._dirty = True
+
+    def save(self):
+        """Escribir el manifiesto si hubo cambios (reemplazo atómico del archivo)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {'version': self.VERSION, 'entries': dict(self.entries)}
+            self._dirty = False
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=1, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+
+class Exporter:
+    """Escritores de archivos de exportación. Lanzan la excepción si algo falla y no
+    emiten señales, así que se pueden usar desde cualquier hilo o sin interfaz."""
+
+    def __init__(self):
+        self._manifests: Dict[str, ExportManifest] = {}
+        self._manifests_lock = threading.Lock()
+
+    def manifest(self, folder: str) -> ExportManifest:
+        """Manifiesto de exportaciones de la carpeta (uno por carpeta, compartido entre hilos)."""
+        key = os.path.abspath(folder)
+        with self._manifests_lock:
+            if key not in self._manifests:
+                self._manifests[key] = ExportManifest(key)
+            return self._manifests[key]
+
+    def _normalize_daily_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Normaliza el bloque de datos diarios desde diferentes esquemas."""
+        # Caso 1: ya viene como 'daily_data'
+        if isinstance(data.get('daily_data'), dict):
+            return data.get('daily_data') or {}
+        # Caso 2: viene como 'data' del modelo base/BD
+        if isinstance(data.get('data'), dict):
+            return data.get('data') or {}
+        # Caso 3: viene separado en 'daily_amounts' y 'daily_destinations'
+        amounts = data.get('daily_amounts')
+        dests = data.get('daily_destinations')
+        if isinstance(amounts, dict):
+            daily = {}
+            for day, amount in amounts.items():
+                daily[day] = {
+                    'amount': amount,
+                    'destination': dests.get(day, '') if isinstance(dests, dict) else '',
+                    'type': '',
+                    'comments': ''
+                }
+            return daily
+        return {}
+
+    def _summary_field(self, data: Dict[str, Any], *keys, default: Any = 0) -> Any:
+        """Obtiene un campo de resumen con clave alternativa y valor por defecto."""
+        for k in keys:
+            if k in data:
+                return data[k]
+        return default
+    
+    def _drawdown_rows(self, data: Dict[str, Any]) -> List[tuple]:
+        """Filas (etiqueta, valor, tipo) del informe de drawdown y rachas, si existe."""
+        report = data.get('drawdown')
+        if not isinstance(report, dict) or not report.get('days'):
+            return []
+        return [
+            ('Drawdown Máximo', report.get('max_drawdown_amount', 0), 'currency'),
+            ('Drawdown Máximo %', report.get('max_drawdown_pct', 0), 'percent'),
+            ('Inicio del Drawdown', report.get('peak_date'), 'text'),
+            ('Fondo del Drawdown', report.get('trough_date'), 'text'),
+            ('Duración (días)', report.get('drawdown_duration', 0), 'number'),
+            ('Días hasta Recuperar', report.get('time_to_recover'), 'number'),
+            ('Mayor Periodo Bajo Máximo', report.get('longest_underwater', 0), 'number'),
+            ('Drawdown Actual', report.get('current_drawdown_amount', 0), 'currency'),
+            ('Racha Ganadora Más Larga', report.get('longest_win_streak', 0), 'number'),
+            ('Racha Perdedora Más Larga', report.get('longest_loss_streak', 0), 'number'),
+            ('Racha Actual', report.get('current_streak', 0), 'number')
+        ]
+
+    def _tail_risk_rows(self, data: Dict[str, Any]) -> List[tuple]:
+        """Filas (etiqueta, valor) de VaR/ES por nivel de confianza, si el informe existe."""
+        report = data.get('tail_risk')
+        if not isinstance(report, dict) or not report.get('days'):
+            return []
+        rows = []
+        for level, tail in report.get('levels', {}).items():
+            pct = f"{float(level) * 100:.0f}%"
+            for key, label in (('daily_historical', 'diario histórico'), ('daily_parametric', 'diario normal'),
+                               ('weekly_historical', 'semanal histórico'), ('weekly_parametric', 'semanal normal')):
+                rows.append((f"VaR {pct} {label}", tail[key]['var']))
+                rows.append((f"ES {pct} {label}", tail[key]['es']))
+            window = tail.get('rolling_window')
+            rows.append((f"VaR {pct} últimos {window} días", tail.get('rolling_var')))
+            rows.append((f"ES {pct} últimos {window} días", tail.get('rolling_es')))
+        return rows
+
+    def _tail_risk_series(self, data: Dict[str, Any]):
+        """Serie móvil de VaR/ES: (encabezados, filas por fecha de cierre de cada ventana)."""
+        report = data.get('tail_risk')
+        if not isinstance(report, dict):
+            return [], []
+        levels = [(level, tail['rolling_series']) for level, tail in report.get('levels', {}).items()
+                  if tail.get('rolling_series') and tail['rolling_series']['var']]
+        if not levels:
+            return [], []
+        headers = ['Fecha']
+        for level, _ in levels:
+            pct = f"{float(level) * 100:.0f}%"
+            headers += [f"VaR {pct}", f"ES {pct}"]
+        # Todos los niveles comparten los días y la ventana: mismas fechas
+        dates = levels[0][1]['dates'] or [''] * len(levels[0][1]['var'])
+        columns = [values for _, series in levels for values in (series['var'], series['es'])]
+        return headers, [[day, *values] for day, *values in zip(dates, *columns)]
+
+    def _custom_metric_rows(self, data: Dict[str, Any]) -> List[tuple]:
+        """Filas (nombre, valor de la semana, media del historial) de las métricas personalizadas."""
+        metrics = data.get('custom_metrics')
+        if not isinstance(metrics, list):
+            return []
+        return [(m.get('name', ''), m.get('value'), m.get('mean')) for m in metrics if not m.get('error')]
+
+    def write_excel(self, data: Dict[str, Any], file_path: str, week_number: int):
+        """Exporta datos a formato Excel con estilo profesional y gráficos."""
+        # Crear workbook de xlsxwriter
+        workbook = xlsxwriter.Workbook(file_path)
+
+        # Paleta y formatos
+        header_format = workbook.add_format({
+            'bold': True,
+            'font_color': 'white',
+            'bg_color': '#1F4E79',  # azul profundo
+            'border': 1,
+            'align': 'center',
+            'valign': 'vcenter'
+        })
+
+        money_format = workbook.add_format({
+            'num_format': '$#,##0.00',
+            'border': 1,
+            'align': 'right'
+        })
+        green_money_format = workbook.add_format({
+            'num_format': '$#,##0.00',
+            'border': 1,
+            'align': 'right',
+            'font_color': '#1E8449'  # verde
+        })
+        red_money_format = workbook.add_format({
+            'num_format': '$#,##0.00',
+            'border': 1,
+            'align': 'right',
+            'font_color': '#C0392B'  # rojo
+        })
+
+        percentage_format = workbook.add_format({
+            'num_format': '0.00%',
+            'border': 1,
+            'align': 'right'
+        })
+
+        date_format = workbook.add_format({
+            'num_format': 'mm/dd/yyyy',
+            'border': 1,
+            'align': 'center'
+        })
+
+        border_format = workbook.add_format({'border': 1})
+
+        kpi_title = workbook.add_format({'bold': True, 'font_size': 16})
+        kpi_label = workbook.add_format({'bold': True, 'bg_color': '#F2F2F2', 'border': 1})
+        kpi_value_currency = workbook.add_format({'num_format': '$#,##0.00', 'border': 1, 'bold': True})
+        kpi_value_number = workbook.add_format({'border': 1, 'bold': True})
+        kpi_value_percent = workbook.add_format({'num_format': '0.00%', 'border': 1, 'bold': True})
+
+        # Hoja de datos diarios
+        sheet_name = f"{tr('week')} {week_number}"
+        worksheet = workbook.add_worksheet(sheet_name)
+
+        # Encabezados
+        headers = [
+            tr('day_column'),
+            'Fecha' if tr('monday') == 'Lunes' else 'Date',
+            tr('amount_column'),
+            tr('destination_column'),
+            tr('type_column') if tr('type_column', None) != 'type_column' else ('Tipo' if tr('monday') == 'Lunes' else 'Type'),
+            tr('comments_column') if tr('comments_column', None) != 'comments_column' else ('Comentarios' if tr('monday') == 'Lunes' else 'Comments')
+        ]
+        for col, header in enumerate(headers):
+            worksheet.write(0, col, header, header_format)
+
+        # Datos diarios
+        row = 1
+        daily_data = self._normalize_daily_data(data)
+        for day, day_data in daily_data.items():
+            worksheet.write(row, 0, day.capitalize(), border_format)
+            worksheet.write(row, 1, day_data.get('date', ''), date_format)
+            amount = day_data.get('amount', 0)
+            if amount > 0:
+                worksheet.write(row, 2, amount, green_money_format)
+            elif amount < 0:
+                worksheet.write(row, 2, amount, red_money_format)
+            else:
+                worksheet.write(row, 2, '', border_format)
+            worksheet.write(row, 3, day_data.get('destination', ''), border_format)
+            worksheet.write(row, 4, day_data.get('type', ''), border_format)
+            worksheet.write(row, 5, day_data.get('comments', ''), border_format)
+            row += 1
+
+        last_row = row - 1
+
+        # Tabla y estilos de la sección diaria
+        worksheet.add_table(0, 0, last_row, 5, {
+            'style': 'Table Style Medium 9',
+            'columns': [{'header': h} for h in headers]
+        })
+        worksheet.freeze_panes(1, 0)
+        column_widths = [12, 15, 15, 18, 14, 28]
+        for col, width in enumerate(column_widths):
+            worksheet.set_column(col, col, width)
+
+        # Formato condicional en montos
+        worksheet.conditional_format(1, 2, last_row, 2, {
+            'type': 'cell', 'criteria': '>', 'value': 0, 'format': green_money_format
+        })
+        worksheet.conditional_format(1, 2, last_row, 2, {
+            'type': 'cell', 'criteria': '<', 'value': 0, 'format': red_money_format
+        })
+
+        # Hoja de resumen (KPIs)
+        summary_sheet = workbook.add_worksheet('Resumen' if tr('monday') == 'Lunes' else 'Summary')
+        summary_sheet.write(0, 0, ('Resumen Semanal' if tr('monday') == 'Lunes' else 'Weekly Summary'), kpi_title)
+
+        # KPI labels
+        summary_sheet.write(2, 0, 'Capital Inicial', kpi_label)
+        summary_sheet.write(3, 0, 'Total Semanal', kpi_label)
+        summary_sheet.write(4, 0, 'Rendimiento %', kpi_label)
+        summary_sheet.write(5, 0, 'Días Positivos', kpi_label)
+        summary_sheet.write(6, 0, 'Días Negativos', kpi_label)
+
+        # KPI values (con fórmulas donde aplica)
+        initial_capital = self._summary_field(data, 'initial_capital', default=0)
+        summary_sheet.write(2, 1, initial_capital, kpi_value_currency)
+        # SUM de montos en hoja diaria
+        summary_sheet.write_formula(3, 1, f"=SUM('{sheet_name}'!C2:C{last_row})", kpi_value_currency)
+        # Rendimiento = Total / Capital
+        summary_sheet.write_formula(4, 1, f"=IF(B3>0,B4/B3,0)", kpi_value_percent)
+        summary_sheet.write_formula(5, 1, f"=COUNTIF('{sheet_name}'!C2:C{last_row},\">0\")", kpi_value_number)
+        summary_sheet.write_formula(6, 1, f"=COUNTIF('{sheet_name}'!C2:C{last_row},\"<0\")", kpi_value_number)
+        summary_sheet.set_column(0, 1, 22)
+
+        # Drawdown y rachas de todo el historial (si se incluyen en los datos)
+        drawdown_rows = self._drawdown_rows(data)
+        for offset, (label, value, kind) in enumerate(drawdown_rows):
+            summary_sheet.write(2 + offset, 3, label, kpi_label)
+            value_format = {'currency': kpi_value_currency, 'percent': kpi_value_percent}.get(kind, kpi_value_number)
+            summary_sheet.write(2 + offset, 4, '' if value is None else value, value_format)
+        # VaR/ES del historial debajo del drawdown
+        risk_start = 2 + len(drawdown_rows) + (1 if drawdown_rows else 0)
+        risk_rows = self._tail_risk_rows(data)
+        for offset, (label, value) in enumerate(risk_rows):
+            summary_sheet.write(risk_start + offset, 3, label, kpi_label)
+            summary_sheet.write(risk_start + offset, 4, '' if value is None else value, kpi_value_currency)
+        if drawdown_rows or risk_rows:
+            summary_sheet.set_column(3, 3, 26)
+            summary_sheet.set_column(4, 4, 16)
+
+        # Métricas personalizadas: valor de la semana y media del historial
+        custom_rows = self._custom_metric_rows(data)
+        if custom_rows:
+            summary_sheet.write(1, 6, 'Métrica Personalizada', header_format)
+            summary_sheet.write(1, 7, 'Semana', header_format)
+            summary_sheet.write(1, 8, 'Media Historial', header_format)
+            for offset, (name, value, mean) in enumerate(custom_rows):
+                summary_sheet.write(2 + offset, 6, name, kpi_label)
+                summary_sheet.write(2 + offset, 7, '' if value is None else value, kpi_value_number)
+                summary_sheet.write(2 + offset, 8, '' if mean is None else mean, kpi_value_number)
+            summary_sheet.set_column(6, 6, 28)
+            summary_sheet.set_column(7, 8, 16)
+
+        # Serie móvil de VaR/ES (una fila por ventana del historial)
+        risk_headers, risk_series = self._tail_risk_series(data)
+        if risk_series:
+            risk_sheet = workbook.add_worksheet('Riesgo de Cola' if tr('monday') == 'Lunes' else 'Tail Risk')
+            for col, header in enumerate(risk_headers):
+                risk_sheet.write(0, col, header, header_format)
+            for r, values in enumerate(risk_series, start=1):
+                risk_sheet.write(r, 0, values[0], border_format)
+                for col, value in enumerate(values[1:], start=1):
+                    risk_sheet.write(r, col, value, money_format)
+            risk_sheet.freeze_panes(1, 0)
+            risk_sheet.set_column(0, len(risk_headers) - 1, 14)
+
+        # Totales por destino (para gráfico de torta)
+        totals_by_destination = {}
+        for r in range(1, last_row + 1):
+            # Leer desde la hoja diaria por consistencia
+            # Nota: No tenemos acceso directo a valores ya escritos; usamos daily_data
+            pass
+        # Construir desde daily_data
+        for _, dd in daily_data.items():
+            dest = dd.get('destination', '') or 'Sin destino'
+            amt = dd.get('amount', 0) or 0
+            totals_by_destination[dest] = totals_by_destination.get(dest, 0) + (amt or 0)
+
+        dest_start_row = 9
+        summary_sheet.write(dest_start_row, 0, ('Totales por destino' if tr('monday') == 'Lunes' else 'Totals by destination'), kpi_label)
+        dr = dest_start_row + 1
+        for dest, total in totals_by_destination.items():
+            summary_sheet.write(dr, 0, dest, border_format)
+            summary_sheet.write(dr, 1, total, money_format)
+            dr += 1
+
+        # Hoja de gráficos
+        chart_sheet = workbook.add_worksheet('Gráficos' if tr('monday') == 'Lunes' else 'Charts')
+        chart_sheet.write(0, 0, tr('day_column'), header_format)
+        chart_sheet.write(0, 1, tr('amount_column'), header_format)
+        chart_sheet.write(0, 2, ('Acumulado' if tr('monday') == 'Lunes' else 'Cumulative'), header_format)
+
+        # Replicar nombres de días y vincular montos a la hoja diaria
+        chart_row = 1
+        for r in range(2, last_row + 1):
+            chart_sheet.write_formula(chart_row, 0, f"='{sheet_name}'!A{r}", border_format)
+            chart_sheet.write_formula(chart_row, 1, f"='{sheet_name}'!C{r}", money_format)
+            # Acumulado sobre la columna B del propio sheet
+            if chart_row == 1:
+                chart_sheet.write_formula(chart_row, 2, "=B2", money_format)
+            else:
+                chart_sheet.write_formula(chart_row, 2, f"=SUM(B$2:B{chart_row+1})", money_format)
+            chart_row += 1
+
+        # Gráfico de columnas (montos diarios)
+        column_chart = workbook.add_chart({'type': 'column'})
+        column_chart.add_series({
+            'name': ('Montos por día' if tr('monday') == 'Lunes' else 'Daily amounts'),
+            'categories': [chart_sheet.get_name(), 1, 0, chart_row - 1, 0],
+            'values': [chart_sheet.get_name(), 1, 1, chart_row - 1, 1],
+        })
+        column_chart.set_title({'name': ('Desempeño semanal' if tr('monday') == 'Lunes' else 'Weekly Performance')})
+        column_chart.set_x_axis({'name': ('Días' if tr('monday') == 'Lunes' else 'Days')})
+        column_chart.set_y_axis({'name': ('Monto ($)' if tr('monday') == 'Lunes' else 'Amount ($)')})
+        chart_sheet.insert_chart('E2', column_chart)
+
+        # Gráfico de línea (acumulado)
+        line_chart = workbook.add_chart({'type': 'line'})
+        line_chart.add_series({
+            'name': ('Acumulado' if tr('monday') == 'Lunes' else 'Cumulative'),
+            'categories': [chart_sheet.get_name(), 1, 0, chart_row - 1, 0],
+            'values': [chart_sheet.get_name(), 1, 2, chart_row - 1, 2],
+        })
+        line_chart.set_title({'name': ('Saldo acumulado' if tr('monday') == 'Lunes' else 'Cumulative balance')})
+        chart_sheet.insert_chart('E18', line_chart)
+
+        # Gráfico de torta (por destino)
+        if totals_by_destination:
+            pie_chart = workbook.add_chart({'type': 'pie'})
+            # Rango en hoja de resumen
+            start = dest_start_row + 1
+            end = dr - 1
+            pie_chart.add_series({
+                'name': ('Distribución por destino' if tr('monday') == 'Lunes' else 'Distribution by destination'),
+                'categories': [summary_sheet.get_name(), start, 0, end, 0],
+                'values': [summary_sheet.get_name(), start, 1, end, 1],
+            })
+            pie_chart.set_title({'name': ('Destinos' if tr('monday') == 'Lunes' else 'Destinations')})
+            chart_sheet.insert_chart('E34', pie_chart)
+
+        workbook.close()
+
+    @staticmethod
+    def _with_progress(rows: Iterable[tuple], progress: Optional[Callable[[int], None]] = None,
+                       step: int = 256) -> Iterable[tuple]:
+        """Recorre las filas informando a progress cuántas semanas se escribieron (de a step).
+        progress puede lanzar una excepción para cancelar la exportación en curso."""
+        if progress is None:
+            yield from rows
+            return
+        pending = 0
+        for row in rows:
+            yield row
+            pending += 1
+            if pending >= step:
+                progress(pending)
+                pending = 0
+        if pending:
+            progress(pending)
+
+    def _history_headers(self) -> List[str]:
+        """Encabezados de las filas del historial (una fila por semana)."""
+        es = tr('monday') == 'Lunes'
+        return [tr('week'), tr('monday'), tr('tuesday'), tr('wednesday'), tr('thursday'), tr('friday'),
+                'Total Semana' if es else 'Week Total',
+                'Capital Inicial' if es else 'Initial Capital',
+                'Rendimiento %' if es else 'Return %']
+
+    def write_history_excel(self, rows: Iterable[tuple], file_path: str,
+                            progress: Optional[Callable[[int], None]] = None):
+        """Exporta todo el historial en streaming con una hoja por año y un resumen con fórmulas.
+
+        rows: filas (week_start_date, lunes..viernes, initial_capital) en orden cronológico,
+        por ejemplo DatabaseManager.iter_history(). El libro se abre con constant_memory,
+        así que cada fila se escribe una vez con write_row y se descarga a disco: la
+        memoria no crece con el tamaño del historial. progress(n) recibe las semanas escritas.
+
+        Los gráficos nativos del resumen (barras por semana, curva de capital acumulado y
+        promedio por día de la semana) apuntan a la hoja de agregados, que se llena en la
+        misma pasada con valores ya calculados: Excel los dibuja sin fórmulas intermedias.
+        """
+        workbook = xlsxwriter.Workbook(file_path, {'constant_memory': True})
+        es = tr('monday') == 'Lunes'
+        header_format = workbook.add_format({
+            'bold': True, 'font_color': 'white', 'bg_color': '#1F4E79',
+            'border': 1, 'align': 'center', 'valign': 'vcenter'
+        })
+        money_format = workbook.add_format({'num_format': '$#,##0.00'})
+        percent_format = workbook.add_format({'num_format': '0.00%'})
+        kpi_title = workbook.add_format({'bold': True, 'font_size': 16})
+        headers = self._history_headers()
+
+        # La hoja de resumen va primero, pero se llena al final (aún no tiene filas)
+        summary_sheet = workbook.add_worksheet('Resumen' if es else 'Summary')
+        # Agregados por semana para los gráficos: total y acumulado, una fila por semana
+        aggregate_sheet = workbook.add_worksheet('Semanas' if es else 'Weeks')
+        aggregate_sheet.set_column(0, 0, 12)
+        aggregate_sheet.set_column(1, 2, 14, money_format)
+        aggregate_sheet.freeze_panes(1, 0)
+        aggregate_sheet.write_row(0, 0, [tr('week'), headers[6], 'Acumulado' if es else 'Cumulative'],
+                                  header_format)
+        cumulative = 0  # centavos
+        weekday_cents = [0] * 5
+        weekday_counts = [0] * 5
+
+        years = []  # (año, hoja, última fila de Excel)
+        sheet = None
+        year = None
+        row = 0
+        aggregate_row = 1
+        for week_start, *amounts, capital in self._with_progress(rows, progress):
+            week_year = str(week_start)[:4]
+            if week_year != year:
+                if sheet is not None:
+                    years.append((year, sheet.get_name(), row))
+                year = week_year
+                sheet = workbook.add_worksheet(year)
+                sheet.set_column(0, 0, 12)
+                sheet.set_column(1, 7, 14, money_format)
+                sheet.set_column(8, 8, 14, percent_format)
+                sheet.freeze_panes(1, 0)
+                sheet.write_row(0, 0, headers, header_format)
+                row = 1
+            excel_row = row + 1
+            sheet.write_row(row, 0, [
+                week_start,
+                *[amount or 0.0 for amount in amounts],
+                f"=SUM(B{excel_row}:F{excel_row})",
+                capital or 0.0,
+                f"=IF(H{excel_row}>0,G{excel_row}/H{excel_row},0)"
+            ])
+            row += 1
+
+            week_total = 0
+            for i, amount in enumerate(amounts):
+                cents = to_cents(amount)
+                week_total += cents
+                weekday_cents[i] += cents
+                weekday_counts[i] += 1
+            cumulative += week_total
+            aggregate_sheet.write_row(aggregate_row, 0, [week_start, from_cents(week_total),
+                                                         from_cents(cumulative)])
+            aggregate_row += 1
+        if sheet is not None:
+            years.append((year, sheet.get_name(), row))
+
+        # Resumen por año con fórmulas sobre cada hoja y fila de totales
+        summary_sheet.write(0, 0, 'Historial Completo' if es else 'Full History', kpi_title)
+        summary_sheet.write_row(2, 0, [
+            'Año' if es else 'Year',
+            'Semanas' if es else 'Weeks',
+            'Total' if es else 'Total',
+            'Mejor Semana' if es else 'Best Week',
+            'Peor Semana' if es else 'Worst Week',
+            'Días Positivos' if es else 'Positive Days',
+            'Días Negativos' if es else 'Negative Days'
+        ], header_format)
+        summary_sheet.set_column(0, 0, 12)
+        summary_sheet.set_column(1, 1, 10)
+        summary_sheet.set_column(2, 4, 16, money_format)
+        summary_sheet.set_column(5, 6, 14)
+        for offset, (year, name, last) in enumerate(years):
+            summary_sheet.write_row(3 + offset, 0, [
+                year,
+                f"=COUNTA('{name}'!A2:A{last})",
+                f"=SUM('{name}'!G2:G{last})",
+                f"=MAX('{name}'!G2:G{last})",
+                f"=MIN('{name}'!G2:G{last})",
+                f"=COUNTIF('{name}'!B2:F{last},\">0\")",
+                f"=COUNTIF('{name}'!B2:F{last},\"<0\")"
+            ])
+        if years:
+            first, last = 4, 3 + len(years)
+            total_row = 3 + len(years)
+            total_label = workbook.add_format({'bold': True, 'top': 2})
+            total_money = workbook.add_format({'bold': True, 'top': 2, 'num_format': '$#,##0.00'})
+            summary_sheet.write_row(total_row, 0, ['Total', f"=SUM(B{first}:B{last})"], total_label)
+            summary_sheet.write_row(total_row, 2, [
+                f"=SUM(C{first}:C{last})",
+                f"=MAX(D{first}:D{last})",
+                f"=MIN(E{first}:E{last})"
+            ], total_money)
+            summary_sheet.write_row(total_row, 5, [
+                f"=SUM(F{first}:F{last})",
+                f"=SUM(G{first}:G{last})"
+            ], total_label)
+            self._history_charts(workbook, summary_sheet, aggregate_sheet.get_name(), aggregate_row - 1,
+                                 weekday_cents, weekday_counts, total_row + 2, header_format, money_format)
+
+        workbook.close()
+
+    def _history_charts(self, workbook, summary_sheet, aggregate_name: str, weeks: int,
+                        weekday_cents: List[int], weekday_counts: List[int], start_row: int,
+                        header_format, money_format):
+        """Tabla de promedios por día y gráficos nativos del resumen del historial."""
+        es = tr('monday') == 'Lunes'
+        day_labels = [tr('monday'), tr('tuesday'), tr('wednesday'), tr('thursday'), tr('friday')]
+        summary_sheet.write_row(start_row, 0, [
+            'Día' if es else 'Day',
+            'Promedio' if es else 'Average',
+            'Días' if es else 'Days'
+        ], header_format)
+        for i, label in enumerate(day_labels):
+            mean = from_cents(weekday_cents[i]) / weekday_counts[i] if weekday_counts[i] else 0.0
+            summary_sheet.write(start_row + 1 + i, 0, label)
+            summary_sheet.write(start_row + 1 + i, 1, mean, money_format)
+            summary_sheet.write(start_row + 1 + i, 2, weekday_counts[i])
+        weekday_first, weekday_last = start_row + 1, start_row + 5
+        summary_name = summary_sheet.get_name()
+
+        weekly_chart = workbook.add_chart({'type': 'column'})
+        weekly_chart.add_series({
+            'name': 'Total Semana' if es else 'Week Total',
+            'categories': [aggregate_name, 1, 0, weeks, 0],
+            'values': [aggregate_name, 1, 1, weeks, 1],
+            'fill': {'color': '#2E86C1'},
+            'invert_if_negative': True,
+            'invert_if_negative_color': '#C0392B',
+            'gap': 50
+        })
+        weekly_chart.set_title({'name': 'Resultado por semana' if es else 'Result by week'})
+        weekly_chart.set_x_axis({'num_font': {'rotation': -45}})
+        weekly_chart.set_y_axis({'num_format': '$#,##0'})
+        weekly_chart.set_legend({'none': True})
+        weekly_chart.set_size({'width': 720, 'height': 300})
+        summary_sheet.insert_chart(2, 8, weekly_chart)
+
+        equity_chart = workbook.add_chart({'type': 'line'})
+        equity_chart.add_series({
+            'name': 'Acumulado' if es else 'Cumulative',
+            'categories': [aggregate_name, 1, 0, weeks, 0],
+            'values': [aggregate_name, 1, 2, weeks, 2],
+            'line': {'color': '#1E8449', 'width': 2}
+        })
+        equity_chart.set_title({'name': 'Curva de capital acumulado' if es else 'Cumulative equity curve'})
+        equity_chart.set_x_axis({'num_font': {'rotation': -45}})
+        equity_chart.set_y_axis({'num_format': '$#,##0'})
+        equity_chart.set_legend({'none': True})
+        equity_chart.set_size({'width': 720, 'height': 300})
+        summary_sheet.insert_chart(18, 8, equity_chart)
+
+        weekday_chart = workbook.add_chart({'type': 'column'})
+        weekday_chart.add_series({
+            'name': 'Promedio por día' if es else 'Average by day',
+            'categories': [summary_name, weekday_first, 0, weekday_last, 0],
+            'values': [summary_name, weekday_first, 1, weekday_last, 1],
+            'fill': {'color': '#8E44AD'},
+            'invert_if_negative': True,
+            'invert_if_negative_color': '#C0392B'
+        })
+        weekday_chart.set_title({'name': 'Promedio por día de la semana' if es else 'Average by weekday'})
+        weekday_chart.set_y_axis({'num_format': '$#,##0.00'})
+        weekday_chart.set_legend({'none': True})
+        weekday_chart.set_size({'width': 720, 'height': 300})
+        summary_sheet.insert_chart(34, 8, weekday_chart)
+
+    def _open_csv(self, file_path: str, compress: Optional[bool] = None):
+        """Abre el archivo de texto para csv.writer; comprime con gzip si se pide o si termina en .gz."""
+        if compress is None:
+            compress = file_path.lower().endswith('.gz')
+        if compress:
+            return gzip.open(file_path, 'wt', encoding='utf-8', newline='')
+        return open(file_path, 'w', encoding='utf-8', newline='')
+
+    def _csv_week_rows(self, data: Dict[str, Any], week_number: int):
+        """Filas de la exportación CSV de la semana: diarias, resumen y secciones opcionales."""
+        daily_data = self._normalize_daily_data(data)
+        yield ['Semana', 'Día', 'Fecha', 'Monto', 'Destino', 'Tipo', 'Comentarios']
+        for day, day_data in daily_data.items():
+            yield [
+                week_number,
+                day.capitalize(),
+                day_data.get('date', ''),
+                day_data.get('amount', 0),
+                day_data.get('destination', ''),
+                day_data.get('type', ''),
+                day_data.get('comments', '')
+            ]
+
+        yield []
+        yield ['RESUMEN SEMANAL']
+        yield ['Capital Inicial', data.get('initial_capital', 0)]
+        yield ['Total Semanal', data.get('weekly_total', 0)]
+        yield ['Rendimiento %', data.get('performance_percentage', 0)]
+        yield ['Días Positivos', data.get('positive_days', 0)]
+        yield ['Días Negativos', data.get('negative_days', 0)]
+        yield ['Total Retiros', data.get('total_withdrawals', 0)]
+        yield ['Total Reinvertido', data.get('total_reinvestment', 0)]
+
+        drawdown_rows = self._drawdown_rows(data)
+        if drawdown_rows:
+            yield []
+            yield ['DRAWDOWN Y RACHAS']
+            for label, value, _ in drawdown_rows:
+                yield [label, '' if value is None else value]
+
+        risk_rows = self._tail_risk_rows(data)
+        if risk_rows:
+            yield []
+            yield ['RIESGO DE COLA (VaR / ES)']
+            for label, value in risk_rows:
+                yield [label, '' if value is None else value]
+        risk_headers, risk_series = self._tail_risk_series(data)
+        if risk_series:
+            yield []
+            yield ['VaR / ES MÓVIL']
+            yield risk_headers
+            yield from risk_series
+
+        custom_rows = self._custom_metric_rows(data)
+        if custom_rows:
+            yield []
+            yield ['MÉTRICAS PERSONALIZADAS']
+            yield ['Métrica', 'Semana', 'Media Historial']
+            for name, value, mean in custom_rows:
+                yield [name, '' if value is None else value, '' if mean is None else mean]
+
+    def write_csv(self, data: Dict[str, Any], file_path: str, week_number: int,
+                  compress: Optional[bool] = None):
+        """Exporta la semana a CSV en una sola pasada (filas diarias y resumen)."""
+        with self._open_csv(file_path, compress) as f:
+            csv.writer(f).writerows(self._csv_week_rows(data, week_number))
+
+    def _csv_history_rows(self, rows: Iterable[tuple], destinations: Optional[List[str]] = None):
+        """Filas diarias de todo el historial seguidas del resumen acumulado durante el recorrido."""
+        day_names = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes']
+        destinations = list(destinations) if destinations else [''] * 5
+        yield ['Semana', 'Día', 'Fecha', 'Monto', 'Destino', 'Capital Inicial']
+
+        summary = HistorySummary()
+        for week_start, *amounts, capital in rows:
+            monday = date.fromisoformat(str(week_start)[:10])
+            for i, amount in enumerate(amounts):
+                yield [week_start, day_names[i], (monday + timedelta(days=i)).isoformat(),
+                       amount or 0.0, destinations[i], capital]
+            summary.add(week_start, amounts, capital)
+
+        yield []
+        yield ['RESUMEN DEL HISTORIAL']
+        yield ['Semanas', summary.weeks]
+        yield ['Desde', summary.first or '']
+        yield ['Hasta', summary.last or '']
+        yield ['Total', summary.total]
+        yield ['Mejor Semana', '' if summary.best is None else summary.best]
+        yield ['Peor Semana', '' if summary.worst is None else summary.worst]
+        yield ['Días Positivos', summary.positive_days]
+        yield ['Días Negativos', summary.negative_days]
+
+    def write_history_csv(self, rows: Iterable[tuple], file_path: str,
+                          destinations: Optional[List[str]] = None,
+                          compress: Optional[bool] = None,
+                          progress: Optional[Callable[[int], None]] = None):
+        """Exporta todo el historial a CSV en streaming, opcionalmente comprimido con gzip.
+
+        rows: filas (week_start_date, lunes..viernes, initial_capital) en orden cronológico,
+        por ejemplo DatabaseManager.iter_history(). Se escribe una fila por día y el
+        resumen al final, en una sola pasada y sin cargar el historial en memoria.
+        progress(n) recibe las semanas escritas.
+        """
+        with self._open_csv(file_path, compress) as f:
+            csv.writer(f).writerows(self._csv_history_rows(self._with_progress(rows, progress), destinations))
+
+    def write_json(self, data: Dict[str, Any], file_path: str, week_number: int):
+        """Exporta datos a formato JSON con formato bonito."""
+        # Agregar metadata
+        export_data = {
+            'metadata': {
+                'version': '2.1.0',
+                'export_date': datetime.now().isoformat(),
+                'week_number': week_number,
+                'application': 'W-T-F Trading Manager'
+            },
+            'data': data
+        }
+        
+        # Exportar JSON con formato
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(export_data, f, indent=2, ensure_ascii=False)
+
+    def write(self, data: Dict[str, Any], file_path: str, week_number: int,
+              file_format: Optional[str] = None):
+        """Exporta la semana al formato indicado o deducido de la extensión."""
+        file_format = file_format or format_from_path(file_path)
+        writers = {'xlsx': self.write_excel, 'csv': self.write_csv, 'json': self.write_json}
+        if file_format not in writers:
+            raise ValueError(f"Formato no soportado: {file_format}")
+        writers[file_format](data, file_path, week_number)
@@ -27,6 +27,9 @@ TRANSLATIONS = {
         "save_week": "💾 Guardar Semana",
         "load_week": "📂 Cargar Semana",
         "load_from_db": "🗄️ Cargar desde Base de Datos",
+        "import_history_columnar": "📥 Importar historial (Parquet / Arrow)",
+        "import_spreadsheet": "📥 Importar historial (Excel / CSV)",
+        "import_trades": "📥 Importar operaciones (extracto CSV / JSON)",
         "set_capital": "💰 Establecer Capital Inicial",
         "exit": "🚪 Salir",
         "dark_mode": "🌙 Modo Oscuro",
@@ -34,7 +37,15 @@ TRANSLATIONS = {
         "daily_advice": "📌 Mostrar consejo del día",
         "weekly_summary": "🗓️ Resumen semanal",
         "start_new_week_reset": "🆕 Empezar nueva semana (reiniciar datos)",
+        "monte_carlo": "🎲 Proyección Monte Carlo",
+        "week_patterns": "🧩 Patrones semanales",
+        "goal_solver": "🎯 Meta de capital",
+        "custom_metrics": "🧮 Métricas personalizadas",
         "export_excel": "📈 Exportar a Excel",
+        "export_history_excel": "🗂️ Historial completo a Excel",
+        "export_history_csv": "🗂️ Historial completo a CSV",
+        "export_history_columnar": "🗂️ Historial completo a Parquet / Arrow",
+        "export_bulk": "📦 Exportación masiva por semanas",
         "export_csv": "📋 Exportar a CSV",
         "export_json": "📄 Exportar a JSON",
         "about": "ℹ️ Acerca de",
@@ -45,6 +56,9 @@ TRANSLATIONS = {
         "status_save_week": "Guardar datos de la semana actual",
         "status_load_week": "Cargar datos desde archivo",
         "status_load_db": "Cargar datos guardados en la base de datos",
+        "status_import_history_columnar": "Importar semanas desde un archivo Parquet o Arrow IPC a la base de datos",
+        "status_import_spreadsheet": "Importar semanas o días desde una hoja de Excel o un archivo CSV a la base de datos",
+        "status_import_trades": "Guardar cada operación de un extracto de la plataforma y actualizar los totales diarios",
         "status_set_capital": "Configurar el capital inicial de la semana",
         "status_exit": "Salir de la aplicación",
         "status_dark_mode": "Activar/desactivar modo oscuro",
@@ -52,7 +66,15 @@ TRANSLATIONS = {
         "status_daily_advice": "Ver recomendaciones según el día actual",
         "status_weekly_summary": "Mostrar resumen con sugerencia de retiro y reinversión",
         "status_start_new_week_reset": "Crear semana nueva con datos en cero y capital actualizado",
+        "status_monte_carlo": "Simular la evolución futura del capital con el historial",
+        "status_week_patterns": "Agrupar las semanas del historial por la forma de su P/L",
+        "status_goal_solver": "Calcular el rendimiento diario necesario para llegar a un balance objetivo",
+        "status_custom_metrics": "Definir métricas propias con fórmulas sobre el historial",
         "status_export_excel": "Exportar datos a formato Excel (.xlsx)",
+        "status_export_history_excel": "Exportar todas las semanas guardadas a Excel, una hoja por año",
+        "status_export_history_csv": "Exportar todos los días guardados a CSV (admite .csv.gz comprimido)",
+        "status_export_history_columnar": "Exportar todos los días guardados a Parquet o Arrow IPC (requiere pyarrow)",
+        "status_export_bulk": "Exportar cada semana de un rango de fechas a Excel, CSV y/o JSON en segundo plano",
         "status_export_csv": "Exportar datos a formato CSV",
         "status_export_json": "Exportar datos a formato JSON",
         "status_about": "Información sobre la aplicación",
@@ -132,10 +154,44 @@ TRANSLATIONS = {
         "starting_export": "Iniciando exportación...",
         "open_file_location_question": "¿Deseas abrir la ubicación del archivo?",
         "no_data_to_export": "No hay datos para exportar",
+        "export_history_done": "Historial exportado: {weeks} semanas en {path}",
+        "import_history_title": "Importar historial",
+        "import_history_account": "Cuenta a importar:",
+        "import_history_confirm": "Se importarán {weeks} semanas de «{account}». Las semanas ya guardadas con la misma fecha se reemplazarán. ¿Continuar?",
+        "import_history_done": "Historial importado: {weeks} semanas",
+        "import_history_failed": "No se pudo importar el historial",
+        "import_spreadsheet_title": "Importar Excel / CSV",
+        "import_spreadsheet_confirm": "Las semanas del archivo se guardarán en la base de datos; las ya guardadas con la misma fecha se reemplazarán. ¿Continuar?",
+        "import_spreadsheet_done": "Importadas {weeks} semanas ({rows} filas leídas)",
+        "import_spreadsheet_rejected": "{count} filas rechazadas:",
+        "import_trades_title": "Importar operaciones",
+        "import_trades_progress": "Procesando operaciones... {rows} filas leídas",
+        "import_trades_done": "{inserted} operaciones nuevas, {duplicates} ya importadas, {rejected} rechazadas; {days} días actualizados",
+        "import_trades_cancelled": "Importación cancelada: se conservan las operaciones ya guardadas.",
+        "import_trades_weekend": "{count} días de fin de semana quedan solo en el registro de operaciones.",
+        "import_trades_week": "Semana activa: {trades} operaciones, {win_rate:.0f}% ganadoras, neto ${profit:,.2f}",
         "format_label": "Formato:",
         "format_excel_recommended": "Excel (.xlsx) - Recomendado",
         "format_csv_compatible": "CSV (.csv) - Compatible con todos",
         "format_json_developers": "JSON (.json) - Para desarrolladores",
+        "format_all": "Todos (.xlsx + .csv + .json) - En paralelo",
+        "export_progress": "{done} de {total} filas",
+        "export_progress_eta": "{done} de {total} filas · quedan {eta}",
+        "export_cancelled": "Exportación cancelada",
+        "export_bulk_title": "Exportación masiva",
+        "export_bulk_from": "Desde:",
+        "export_bulk_to": "Hasta:",
+        "export_bulk_formats": "Formatos:",
+        "export_bulk_folder": "Carpeta:",
+        "export_bulk_select_folder": "Elegir carpeta",
+        "export_bulk_start": "Exportar",
+        "export_bulk_weeks": "{weeks} semanas en el rango",
+        "export_bulk_no_weeks": "No hay semanas guardadas en el rango elegido",
+        "export_bulk_no_folder": "Elegí una carpeta de destino y al menos un formato",
+        "export_bulk_done": "{files} archivos exportados en {folder}",
+        "export_bulk_skip_unchanged": "Reutilizar los archivos de semanas sin cambios",
+        "export_bulk_skipped": "{count} archivos sin cambios reutilizados",
+        "export_bulk_errors": "{count} archivos fallaron:",
         "include_charts_excel": "Incluir gráficos en Excel (si es posible)",
         "include_detailed_summary": "Incluir resumen detallado",
         "preview_title": "👁️ Vista Previa",
@@ -180,6 +236,78 @@ TRANSLATIONS = {
         "rating": "CALIFICACIÓN",
         "no_analysis": "Sin análisis disponible",
         
+        "advice_forecast": (
+            "📊 Próxima sesión ({day}): P/L esperado ${expected:.2f}, "
+            "rango {coverage:.0f}% entre ${low:.2f} y ${high:.2f} (modelo con {samples} días)."
+        ),
+        
+        # Drawdown y rachas
+        "drawdown_title": "📉 Drawdown y Rachas",
+        "drawdown_max": "Drawdown máximo: ${amount:.2f} ({pct:.1f}%) en {duration} días",
+        "drawdown_recovery": "Recuperado en {days} días ({date})",
+        "drawdown_not_recovered": "Aún sin recuperar",
+        "drawdown_current": "Drawdown actual: ${amount:.2f} ({days} días bajo el máximo)",
+        "drawdown_streaks": "Rachas más largas: +{wins} / -{losses} días (actual {current:+d})",
+        "drawdown_no_data": "Sin historial suficiente",
+        "analysis_computing": "Calculando el análisis…",
+        "analysis_failed": "No se pudo calcular el análisis",
+        
+        # Proyección Monte Carlo
+        "monte_carlo_title": "🎲 Proyección de Capital",
+        "monte_carlo_summary": (
+            "Proyección a {weeks} semanas ({paths:,} simulaciones, {days} días de historial)\n"
+            "Capital de partida: ${start:.2f}\n\n"
+            "Percentil 5: ${p5:.2f}\n"
+            "Mediana: ${p50:.2f}\n"
+            "Percentil 95: ${p95:.2f}\n"
+            "Media: ${mean:.2f}\n\n"
+            "Probabilidad de ruina (capital < {ruin:.0f}%): {ruin_prob:.2f}%\n"
+            "Retiros esperados (30%): ${withdrawals:.2f}"
+        ),
+        "monte_carlo_bands": "Bandas P5 / P50 / P95 por semana:",
+        "monte_carlo_no_history": "No hay historial suficiente para proyectar",
+        
+        # Patrones semanales
+        "week_patterns_title": "🧩 Patrones Semanales",
+        "week_patterns_header": "{weeks} semanas agrupadas en {clusters} formas recurrentes:",
+        "week_patterns_cluster": "{name}: {size} semanas ({share:.0f}%)",
+        "week_patterns_centroid": "Forma (L-M-X-J-V): {shape}",
+        "week_patterns_recent": "Últimas: {weeks}",
+        "week_patterns_current": "La semana actual se parece a: {name}",
+        "week_patterns_no_history": "No hay suficientes semanas cerradas para buscar patrones",
+        "pattern_steady_gain": "Ganancia constante",
+        "pattern_steady_loss": "Pérdida constante",
+        "pattern_strong_start_fade": "{day} fuerte y luego se desvanece",
+        "pattern_late_recovery": "Recuperación el {day}",
+        "pattern_peak_day": "Pico el {day}",
+        "pattern_drop_day": "Caída el {day}",
+        
+        # Meta de capital
+        "goal_title": "🎯 Meta de Capital",
+        "goal_targets_label": "Metas ($):",
+        "goal_date_label": "Fecha:",
+        "goal_calculate": "Calcular",
+        "goal_result_line": "Meta ${target:,.2f} al {date}: {daily_pct:.2f}% diario (${daily:.2f}/día esta semana) durante {weeks} semanas",
+        "goal_reached": "(ya se alcanza sin ganancias)",
+        "goal_infeasible": "Meta ${target:,.2f} al {date}: no alcanzable en ese plazo",
+        "goal_invalid_targets": "Ingresa una o más metas numéricas separadas por comas",
+        "goal_col_week": "Semana",
+        "goal_col_start": "Capital inicial",
+        "goal_col_daily": "Monto diario",
+        "goal_col_profit": "Ganancia semanal",
+        "goal_col_withdrawal": "Retiro (30%)",
+        "goal_col_end": "Capital siguiente",
+        # Métricas personalizadas
+        "custom_metrics_title": "🧮 Métricas Personalizadas",
+        "custom_metrics_help": "Una fórmula por fila, evaluada para cada semana. Variables: amount, destination, day, weekday (0=Lunes), initial_capital. Agregaciones sobre los días: sum, mean, count, min, max, con filtro opcional 'where'. Ejemplo: sum(amount where destination=='Reinversión') / initial_capital",
+        "custom_metrics_col_name": "Nombre",
+        "custom_metrics_col_formula": "Fórmula",
+        "custom_metrics_add": "Agregar",
+        "custom_metrics_remove": "Quitar",
+        "custom_metrics_invalid": "La fórmula de «{name}» no es válida: {error}",
+        "custom_metric_line": "{name}: {value} (media del historial: {mean})",
+        "custom_metric_error": "{name}: error ({error})",
+        
         # Otros
         "week": "Semana",
         "loading": "Cargando...",
@@ -201,7 +329,13 @@ TRANSLATIONS = {
         "confirm_delete_week_message": "¿Desea borrar la semana seleccionada?",
         "week_label": "Semana",
         "delete_success": "Semana borrada correctamente",
-        "delete_error": "Error al borrar la semana"
+        "delete_error": "Error al borrar la semana",
+        "saved_col_total": "Total",
+        "saved_col_capital": "Capital inicial",
+        "saved_col_balance": "Saldo final",
+        "saved_col_days": "Días + / −",
+        "saved_col_modified": "Modificado",
+        "saved_col_size": "Tamaño"
     },
     "en": {
         # Window titles
@@ -225,6 +359,9 @@ TRANSLATIONS = {
         "save_week": "💾 Save Week",
         "load_week": "📂 Load Week",
         "load_from_db": "🗄️ Load from Database",
+        "import_history_columnar": "📥 Import history (Parquet / Arrow)",
+        "import_spreadsheet": "📥 Import history (Excel / CSV)",
+        "import_trades": "📥 Import trades (CSV / JSON statement)",
         "set_capital": "💰 Set Initial Capital",
         "exit": "🚪 Exit",
         "dark_mode": "🌙 Dark Mode",
@@ -232,7 +369,15 @@ TRANSLATIONS = {
         "daily_advice": "📌 Show daily advice",
         "weekly_summary": "🗓️ Weekly summary",
         "start_new_week_reset": "🆕 Start new week (reset data)",
+        "monte_carlo": "🎲 Monte Carlo projection",
+        "week_patterns": "🧩 Weekly patterns",
+        "goal_solver": "🎯 Capital goal",
+        "custom_metrics": "🧮 Custom metrics",
         "export_excel": "📈 Export to Excel",
+        "export_history_excel": "🗂️ Full history to Excel",
+        "export_history_csv": "🗂️ Full history to CSV",
+        "export_history_columnar": "🗂️ Full history to Parquet / Arrow",
+        "export_bulk": "📦 Bulk export by week",
         "export_csv": "📋 Export to CSV",
         "export_json": "📄 Export to JSON",
         "about": "ℹ️ About",
@@ -243,6 +388,9 @@ TRANSLATIONS = {
         "status_save_week": "Save current week's data",
         "status_load_week": "Load data from file",
         "status_load_db": "Load saved data from database",
+        "status_import_history_columnar": "Import weeks from a Parquet or Arrow IPC file into the database",
+        "status_import_spreadsheet": "Import weeks or days from an Excel sheet or a CSV file into the database",
+        "status_import_trades": "Store every trade from a broker statement and update the daily totals",
         "status_set_capital": "Set the week's initial capital",
         "status_exit": "Exit the application",
         "status_dark_mode": "Toggle dark mode",
@@ -250,7 +398,15 @@ TRANSLATIONS = {
         "status_daily_advice": "View recommendations for the current day",
         "status_weekly_summary": "Show summary with withdrawal and reinvestment suggestion",
         "status_start_new_week_reset": "Create a new week with zeroed data and updated capital",
+        "status_monte_carlo": "Simulate future capital using the trading history",
+        "status_week_patterns": "Group the history's weeks by the shape of their P/L",
+        "status_goal_solver": "Compute the daily return needed to reach a target balance",
+        "status_custom_metrics": "Define your own metrics with formulas over the history",
         "status_export_excel": "Export data to Excel (.xlsx)",
+        "status_export_history_excel": "Export every saved week to Excel, one sheet per year",
+        "status_export_history_csv": "Export every saved day to CSV (supports compressed .csv.gz)",
+        "status_export_history_columnar": "Export every saved day to Parquet or Arrow IPC (requires pyarrow)",
+        "status_export_bulk": "Export every week in a date range to Excel, CSV and/or JSON in the background",
         "status_export_csv": "Export data to CSV",
         "status_export_json": "Export data to JSON",
         "status_about": "Information about the application",
@@ -331,10 +487,44 @@ TRANSLATIONS = {
         "starting_export": "Starting export...",
         "open_file_location_question": "Do you want to open the file location?",
         "no_data_to_export": "No data to export",
+        "export_history_done": "History exported: {weeks} weeks to {path}",
+        "import_history_title": "Import history",
+        "import_history_account": "Account to import:",
+        "import_history_confirm": "{weeks} weeks from “{account}” will be imported. Saved weeks with the same date will be replaced. Continue?",
+        "import_history_done": "History imported: {weeks} weeks",
+        "import_history_failed": "Could not import the history",
+        "import_spreadsheet_title": "Import Excel / CSV",
+        "import_spreadsheet_confirm": "The weeks in the file will be saved to the database; weeks already saved with the same date will be replaced. Continue?",
+        "import_spreadsheet_done": "Imported {weeks} weeks ({rows} rows read)",
+        "import_spreadsheet_rejected": "{count} rows rejected:",
+        "import_trades_title": "Import trades",
+        "import_trades_progress": "Processing trades... {rows} rows read",
+        "import_trades_done": "{inserted} new trades, {duplicates} already imported, {rejected} rejected; {days} days updated",
+        "import_trades_cancelled": "Import cancelled: trades already saved are kept.",
+        "import_trades_weekend": "{count} weekend days are kept only in the trade log.",
+        "import_trades_week": "Active week: {trades} trades, {win_rate:.0f}% winners, net ${profit:,.2f}",
         "format_label": "Format:",
         "format_excel_recommended": "Excel (.xlsx) - Recommended",
         "format_csv_compatible": "CSV (.csv) - Compatible everywhere",
         "format_json_developers": "JSON (.json) - For developers",
+        "format_all": "All (.xlsx + .csv + .json) - In parallel",
+        "export_progress": "{done} of {total} rows",
+        "export_progress_eta": "{done} of {total} rows · {eta} left",
+        "export_cancelled": "Export cancelled",
+        "export_bulk_title": "Bulk export",
+        "export_bulk_from": "From:",
+        "export_bulk_to": "To:",
+        "export_bulk_formats": "Formats:",
+        "export_bulk_folder": "Folder:",
+        "export_bulk_select_folder": "Choose folder",
+        "export_bulk_start": "Export",
+        "export_bulk_weeks": "{weeks} weeks in range",
+        "export_bulk_no_weeks": "There are no saved weeks in the selected range",
+        "export_bulk_no_folder": "Choose a destination folder and at least one format",
+        "export_bulk_done": "{files} files exported to {folder}",
+        "export_bulk_skip_unchanged": "Reuse the files of unchanged weeks",
+        "export_bulk_skipped": "{count} unchanged files reused",
+        "export_bulk_errors": "{count} files failed:",
         "include_charts_excel": "Include charts in Excel (if possible)",
         "include_detailed_summary": "Include detailed summary",
         "preview_title": "👁️ Preview",
@@ -379,6 +569,78 @@ TRANSLATIONS = {
         "rating": "RATING",
         "no_analysis": "No analysis available",
         
+        "advice_forecast": (
+            "📊 Next session ({day}): expected P/L ${expected:.2f}, "
+            "{coverage:.0f}% range ${low:.2f} to ${high:.2f} (model trained on {samples} days)."
+        ),
+        
+        # Drawdown and streaks
+        "drawdown_title": "📉 Drawdown & Streaks",
+        "drawdown_max": "Max drawdown: ${amount:.2f} ({pct:.1f}%) over {duration} days",
+        "drawdown_recovery": "Recovered in {days} days ({date})",
+        "drawdown_not_recovered": "Not recovered yet",
+        "drawdown_current": "Current drawdown: ${amount:.2f} ({days} days below peak)",
+        "drawdown_streaks": "Longest streaks: +{wins} / -{losses} days (current {current:+d})",
+        "drawdown_no_data": "Not enough history",
+        "analysis_computing": "Computing analysis…",
+        "analysis_failed": "The analysis could not be computed",
+        
+        # Monte Carlo projection
+        "monte_carlo_title": "🎲 Capital Projection",
+        "monte_carlo_summary": (
+            "{weeks}-week projection ({paths:,} simulations, {days} days of history)\n"
+            "Starting capital: ${start:.2f}\n\n"
+            "5th percentile: ${p5:.2f}\n"
+            "Median: ${p50:.2f}\n"
+            "95th percentile: ${p95:.2f}\n"
+            "Mean: ${mean:.2f}\n\n"
+            "Probability of ruin (capital < {ruin:.0f}%): {ruin_prob:.2f}%\n"
+            "Expected withdrawals (30%): ${withdrawals:.2f}"
+        ),
+        "monte_carlo_bands": "P5 / P50 / P95 bands per week:",
+        "monte_carlo_no_history": "Not enough history to project",
+        
+        # Weekly patterns
+        "week_patterns_title": "🧩 Weekly Patterns",
+        "week_patterns_header": "{weeks} weeks grouped into {clusters} recurring shapes:",
+        "week_patterns_cluster": "{name}: {size} weeks ({share:.0f}%)",
+        "week_patterns_centroid": "Shape (M-T-W-T-F): {shape}",
+        "week_patterns_recent": "Latest: {weeks}",
+        "week_patterns_current": "The current week looks like: {name}",
+        "week_patterns_no_history": "Not enough closed weeks to look for patterns",
+        "pattern_steady_gain": "Steady gain",
+        "pattern_steady_loss": "Steady loss",
+        "pattern_strong_start_fade": "Strong {day}, then fade",
+        "pattern_late_recovery": "{day} recovery",
+        "pattern_peak_day": "{day} spike",
+        "pattern_drop_day": "{day} drop",
+        
+        # Capital goal
+        "goal_title": "🎯 Capital Goal",
+        "goal_targets_label": "Targets ($):",
+        "goal_date_label": "Date:",
+        "goal_calculate": "Calculate",
+        "goal_result_line": "Target ${target:,.2f} by {date}: {daily_pct:.2f}% daily (${daily:.2f}/day this week) over {weeks} weeks",
+        "goal_reached": "(already reached without gains)",
+        "goal_infeasible": "Target ${target:,.2f} by {date}: not reachable in that time",
+        "goal_invalid_targets": "Enter one or more numeric targets separated by commas",
+        "goal_col_week": "Week",
+        "goal_col_start": "Start capital",
+        "goal_col_daily": "Daily amount",
+        "goal_col_profit": "Weekly profit",
+        "goal_col_withdrawal": "Withdrawal (30%)",
+        "goal_col_end": "Next capital",
+        # Custom metrics
+        "custom_metrics_title": "🧮 Custom Metrics",
+        "custom_metrics_help": "One formula per row, evaluated for every week. Variables: amount, destination, day, weekday (0=Monday), initial_capital. Aggregations over the days: sum, mean, count, min, max, with an optional 'where' filter. Example: sum(amount where destination=='Reinversión') / initial_capital",
+        "custom_metrics_col_name": "Name",
+        "custom_metrics_col_formula": "Formula",
+        "custom_metrics_add": "Add",
+        "custom_metrics_remove": "Remove",
+        "custom_metrics_invalid": "The formula for “{name}” is not valid: {error}",
+        "custom_metric_line": "{name}: {value} (history mean: {mean})",
+        "custom_metric_error": "{name}: error ({error})",
+        
         # Other
         "week": "Week",
         "loading": "Loading...",
@@ -400,7 +662,13 @@ TRANSLATIONS = {
         "confirm_delete_week_message": "Do you want to delete the selected week?",
         "week_label": "Week",
         "delete_success": "Week deleted successfully",
-        "delete_error": "Error deleting week"
+        "delete_error": "Error deleting week",
+        "saved_col_total": "Total",
+        "saved_col_capital": "Initial capital",
+        "saved_col_balance": "Final balance",
+        "saved_col_days": "Days + / −",
+        "saved_col_modified": "Modified",
+        "saved_col_size": "Size"
     }
 }
 
@@ -0,0 +1,331 @@
+"""
+Importación de historiales desde Excel (.xlsx) y CSV (.csv / .csv.gz) sin Qt
+Las filas se leen en streaming (openpyxl en modo read_only o el módulo csv), se validan
+por lotes con NumPy y se guardan en la base de datos en una sola transacción.
+
+Formatos reconocidos por los encabezados (en español o inglés, sin importar mayúsculas/acentos):
+- Una fila por semana: Semana/Week + Lunes..Viernes (o Monday..Friday) [+ Capital Inicial],
+  como las hojas por año de la exportación del historial a Excel.
+- Una fila por día: Fecha/Date + Monto/Amount [+ Capital Inicial], como la exportación a CSV.
+"""
+
+import csv
+import gzip
+import os
+import re
+import unicodedata
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+
+DAYS_PER_WEEK = 5
+# Capital inicial si el archivo no lo trae (mismo valor por defecto que el modelo)
+DEFAULT_CAPITAL = 100.0
+# Filas revisadas al buscar la fila de encabezados de cada hoja
+HEADER_SEARCH_ROWS = 20
+# Errores detallados que se guardan en el informe (el resto solo se cuenta)
+MAX_REPORTED_ERRORS = 20
+# Rango de números de serie de Excel (1900-01-01 a 9999-12-31)
+EXCEL_SERIAL_MIN, EXCEL_SERIAL_MAX = 1, 2958466
+_ISO_DATE = re.compile(r'\d{4}-\d{2}-\d{2}$')
+# Títulos y etiquetas del resumen al pie de las exportaciones CSV (se ignoran al importar)
+_SUMMARY_LABELS = {
+    'resumen del historial', 'resumen semanal', 'drawdown y rachas', 'metricas personalizadas',
+    'semanas', 'desde', 'hasta', 'total', 'mejor semana', 'peor semana', 'dias positivos',
+    'dias negativos', 'capital inicial', 'total semanal', 'rendimiento', 'total retiros',
+    'total reinvertido', 'history summary', 'weekly summary', 'weeks', 'from', 'to',
+    'best week', 'worst week', 'positive days', 'negative days', 'initial capital',
+    'weekly total', 'performance', 'total withdrawals', 'total reinvested'
+}
+
+_ALIASES = {
+    'week': ('semana', 'week', 'inicio semana', 'week start', 'week_start_date'),
+    'date': ('fecha', 'date', 'dia fecha', 'day date'),
+    'amount': ('monto', 'amount', 'importe', 'resultado', 'p/l', 'pnl'),
+    'capital': ('capital inicial', 'initial capital', 'capital', 'initial_capital'),
+    0: ('lunes', 'monday', 'lun', 'mon', 'lunes_amount'),
+    1: ('martes', 'tuesday', 'mar', 'tue', 'martes_amount'),
+    2: ('miercoles', 'wednesday', 'mie', 'wed', 'miercoles_amount'),
+    3: ('jueves', 'thursday', 'jue', 'thu', 'jueves_amount'),
+    4: ('viernes', 'friday', 'vie', 'fri', 'viernes_amount')
+}
+_LOOKUP = {alias: key for key, aliases in _ALIASES.items() for alias in aliases}
+
+
+class ImportFormatError(ValueError):
+    """El archivo no tiene columnas reconocibles"""
+
+
+def _normalize(value) -> str:
+    """Encabezado en minúsculas, sin acentos ni espacios de más"""
+    text = unicodedata.normalize('NFKD', str(value or '')).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(text.lower().replace('%', '').split())
+
+
+def map_columns(header: Iterable) -> Optional[Dict]:
+    """Índices de columna por clave ('week', 0..4, 'capital' o 'date', 'amount', 'capital').
+    Devuelve None si la fila no es un encabezado reconocible."""
+    columns = {}
+    for index, cell in enumerate(header):
+        key = _LOOKUP.get(_normalize(cell))
+        if key is not None and key not in columns:
+            columns[key] = index
+    if 'week' in columns and all(day in columns for day in range(DAYS_PER_WEEK)):
+        columns['layout'] = 'weekly'
+        return columns
+    if 'date' in columns and 'amount' in columns:
+        columns['layout'] = 'daily'
+        return columns
+    return None
+
+
+class ImportReport:
+    """Resultado de una importación: filas leídas, semanas guardadas y filas rechazadas"""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.layouts: List[str] = []
+        self.rows_read = 0
+        self.weeks = 0
+        self.rejected = 0
+        self.errors: List[str] = []
+
+    def reject(self, where: str, reason: str):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"{where}: {reason}")
+
+    def to_dict(self) -> Dict:
+        return {
+            'file_path': self.file_path,
+            'layouts': list(self.layouts),
+            'rows_read': self.rows_read,
+            'weeks': self.weeks,
+            'rejected': self.rejected,
+            'errors': list(self.errors)
+        }
+
+
+# ----------------------------------------------------------------------
+# Lectura en streaming
+# ----------------------------------------------------------------------
+def _iter_sheets(file_path: str) -> Iterator[Tuple[str, Iterator[tuple]]]:
+    """(nombre, filas) de cada hoja o del archivo CSV, sin cargarlo en memoria"""
+    lower = file_path.lower()
+    if lower.endswith(('.xlsx', '.xlsm')):
+        try:
+            import openpyxl
+        except ImportError as e:
+            raise ImportError("La importación de Excel requiere openpyxl (pip install openpyxl)") from e
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for sheet in workbook.worksheets:
+                yield sheet.title, sheet.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+        return
+    opener = gzip.open if lower.endswith('.gz') else open
+    with opener(file_path, 'rt', encoding='utf-8-sig', newline='') as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        except csv.Error:
+            dialect = csv.excel
+        yield os.path.basename(file_path), csv.reader(f, dialect)
+
+
+def _batches(rows: Iterator[tuple], size: int) -> Iterator[List[tuple]]:
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+# ----------------------------------------------------------------------
+# Validación vectorizada por lote
+# ----------------------------------------------------------------------
+def _excel_serial(value: float) -> np.datetime64:
+    """Número de serie de Excel (días desde 1899-12-30); NaT fuera del rango de Excel"""
+    if not EXCEL_SERIAL_MIN <= value < EXCEL_SERIAL_MAX:
+        return np.datetime64('NaT')
+    return np.datetime64('1899-12-30') + int(value)
+
+
+def _to_dates(values: List) -> np.ndarray:
+    """Fechas como datetime64[D]; NaT en las que no se pueden interpretar.
+    El lote entero se convierte de una vez si todas las celdas son fechas ISO (AAAA-MM-DD...);
+    si no, se interpreta celda por celda: los números (o textos numéricos) son números de
+    serie de Excel y el resto se lee con día antes que mes (03/01/2024 es 3 de enero)."""
+    texts = [str(v)[:10] if v is not None and v != '' else 'NaT' for v in values]
+    # NumPy lee '45300' como el año 45300: la vía rápida solo acepta fechas ISO completas
+    if all(text == 'NaT' or _ISO_DATE.match(text) for text in texts):
+        try:
+            return np.array(texts, dtype='datetime64[D]')
+        except ValueError:
+            pass
+    from dateutil import parser as date_parser
+    out = np.empty(len(texts), dtype='datetime64[D]')
+    for i, (value, text) in enumerate(zip(values, texts)):
+        if text == 'NaT' or isinstance(value, bool):
+            out[i] = np.datetime64('NaT')
+        elif isinstance(value, (int, float)):
+            out[i] = _excel_serial(value)
+        elif _ISO_DATE.match(text):
+            try:
+                out[i] = np.datetime64(text, 'D')
+            except ValueError:
+                out[i] = np.datetime64('NaT')
+        else:
+            try:
+                out[i] = _excel_serial(float(str(value).strip()))
+                continue
+            except ValueError:
+                pass
+            try:
+                out[i] = np.datetime64(date_parser.parse(str(value), dayfirst=True).date(), 'D')
+            except (ValueError, OverflowError):
+                out[i] = np.datetime64('NaT')
+    return out
+
+
+def _to_numbers(values: List, default: float = np.nan) -> np.ndarray:
+    """Montos como float64 (admite '$1,234.50' y celdas vacías); NaN en los inválidos"""
+    raw = np.array([default if v is None or v == '' else v for v in values], dtype=object)
+    try:
+        return raw.astype(np.float64)
+    except (TypeError, ValueError):
+        text = np.char.replace(np.char.replace(raw.astype(str), '$', ''), ',', '')
+        text = np.char.strip(text)
+        out = np.full(len(values), np.nan)
+        for i, item in enumerate(text):
+            try:
+                out[i] = float(item) if item else default
+            except ValueError:
+                pass
+        return out
+
+
+def _column(batch: List[tuple], index: Optional[int]) -> List:
+    if index is None:
+        return [None] * len(batch)
+    return [row[index] if index < len(row) else None for row in batch]
+
+
+def _is_summary_row(row: tuple, amount_cell) -> bool:
+    """Fila sin fecha que no es un dato: sin monto o con una etiqueta del resumen exportado"""
+    if amount_cell is None or amount_cell == '':
+        return True
+    first = next((cell for cell in row if cell is not None and cell != ''), '')
+    return _normalize(first) in _SUMMARY_LABELS
+
+
+def _mondays(dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(lunes de la semana, día de la semana 0=lunes) de cada fecha"""
+    days = dates.astype(np.int64)
+    weekday = (days + 3) % 7  # 1970-01-01 fue jueves
+    return (days - weekday).astype('datetime64[D]'), weekday
+
+
+class SpreadsheetImporter:
+    """Importa semanas desde Excel o CSV a la tabla trading_weeks.
+
+    Con una fila por semana, las semanas se guardan a medida que se leen. Con una fila
+    por día, los días se agrupan por semana (memoria proporcional a las semanas, no a
+    las filas) y las semanas se guardan al final. En ambos casos la escritura es una sola
+    transacción de DatabaseManager.save_weeks: si algo falla no se guarda nada.
+    Las semanas con la misma fecha que una ya guardada la reemplazan.
+    """
+
+    def __init__(self, db_manager, batch_size: int = 5000):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+
+    def import_file(self, file_path: str) -> ImportReport:
+        report = ImportReport(file_path)
+        report.weeks = self.db_manager.save_weeks(self.iter_weeks(file_path, report))
+        if not report.layouts:
+            raise ImportFormatError("No se encontraron columnas de semana (Semana + Lunes..Viernes) "
+                                    "ni de día (Fecha + Monto)")
+        return report
+
+    def iter_weeks(self, file_path: str, report: Optional[ImportReport] = None) -> Iterator[tuple]:
+        """Filas (week_start_date, lunes..viernes, initial_capital) válidas del archivo"""
+        report = report or ImportReport(file_path)
+        daily_weeks: Dict[str, list] = {}
+        for sheet_name, rows in _iter_sheets(file_path):
+            columns = None
+            row_number = 0
+            for row in islice(rows, HEADER_SEARCH_ROWS):
+                row_number += 1
+                columns = map_columns(row)
+                if columns:
+                    break
+            if not columns:
+                continue
+            report.layouts.append(f"{sheet_name}: {columns['layout']}")
+            for batch in _batches(rows, self.batch_size):
+                report.rows_read += len(batch)
+                first_row = row_number + 1
+                row_number += len(batch)
+                if columns['layout'] == 'weekly':
+                    yield from self._weekly_batch(batch, columns, sheet_name, first_row, report)
+                else:
+                    self._daily_batch(batch, columns, sheet_name, first_row, report, daily_weeks)
+        for week in sorted(daily_weeks):
+            amounts, capital = daily_weeks[week]
+            yield (week, *amounts, DEFAULT_CAPITAL if capital is None else capital)
+
+    def _weekly_batch(self, batch, columns, sheet_name, first_row, report) -> Iterator[tuple]:
+        """Validar un lote de filas semanales de una vez"""
+        dates = _to_dates(_column(batch, columns['week']))
+        amounts = np.column_stack([_to_numbers(_column(batch, columns[day]), 0.0)
+                                   for day in range(DAYS_PER_WEEK)])
+        capitals = _to_numbers(_column(batch, columns.get('capital')))
+        mondays, _ = _mondays(dates)
+        empty = np.array([all(cell is None or cell == '' for cell in row) for row in batch])
+        valid_date = ~np.isnat(dates)
+        valid_amounts = np.isfinite(amounts).all(axis=1)
+        valid_capital = np.isnan(capitals) | (capitals >= 0)
+        valid = valid_date & valid_amounts & valid_capital & ~empty
+        for i in np.flatnonzero(~valid & ~empty):
+            reason = ("fecha inválida" if not valid_date[i] else
+                      "monto inválido" if not valid_amounts[i] else "capital negativo")
+            report.reject(f"{sheet_name} fila {first_row + i}", reason)
+        # Resúmenes y totales al pie de la hoja no tienen fecha: se ignoran sin contarlos
+        report.rows_read -= int(empty.sum())
+        weeks = mondays[valid].astype(str).tolist()
+        for week, days, capital in zip(weeks, amounts[valid].tolist(), capitals[valid].tolist()):
+            yield (week, *days, DEFAULT_CAPITAL if np.isnan(capital) else capital)
+
+    def _daily_batch(self, batch, columns, sheet_name, first_row, report, weeks: Dict[str, list]):
+        """Validar un lote de filas diarias de una vez y acumularlas por semana"""
+        dates = _to_dates(_column(batch, columns['date']))
+        amounts = _to_numbers(_column(batch, columns['amount']))
+        capitals = _to_numbers(_column(batch, columns.get('capital')))
+        mondays, weekday = _mondays(dates)
+        empty = np.array([all(cell is None or cell == '' for cell in row) for row in batch])
+        valid_date = ~np.isnat(dates) & (weekday < DAYS_PER_WEEK)
+        valid_amount = np.isfinite(amounts)
+        valid = valid_date & valid_amount & ~empty
+        amount_cells = _column(batch, columns['amount'])
+        for i in np.flatnonzero(~valid & ~empty):
+            if np.isnat(dates[i]):
+                if _is_summary_row(batch[i], amount_cells[i]):
+                    # Filas de resumen al pie del CSV exportado: se ignoran sin contarlas
+                    report.rows_read -= 1
+                    continue
+                reason = "fecha inválida"
+            else:
+                reason = "fin de semana" if not valid_date[i] else "monto inválido"
+            report.reject(f"{sheet_name} fila {first_row + i}", reason)
+        report.rows_read -= int(empty.sum())
+        for week, day, amount, capital in zip(mondays[valid].astype(str).tolist(), weekday[valid].tolist(),
+                                              amounts[valid].tolist(), capitals[valid].tolist()):
+            entry = weeks.get(week)
+            if entry is None:
+                entry = weeks[week] = [[0.0] * DAYS_PER_WEEK, None]
+            entry[0][day] += amount
+            if entry[1] is None and not np.isnan(capital):
+                entry[1] = capital
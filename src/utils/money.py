@@ -0,0 +1,53 @@
+"""
+Montos como enteros de centavos (punto fijo)
+La base de datos, los arrays del historial y los agregados trabajan en centavos int64:
+las sumas son exactas y reproducibles. Los decimales solo aparecen al mostrar o exportar.
+"""
+
+import math
+from typing import Iterable, Optional, Union
+
+CENTS_PER_UNIT = 100
+# Margen para que 1.005 * 100 = 100.49999... redondee como el decimal escrito (101)
+_EPSILON = 1e-7
+
+Number = Union[int, float, str, None]
+
+
+def to_cents(value: Number) -> int:
+    """Monto decimal a centavos, redondeando la mitad lejos de cero (como ROUND de SQLite).
+    Admite textos como '$1,234.50'; None y '' valen 0."""
+    if value is None or value == '':
+        return 0
+    if isinstance(value, str):
+        value = value.replace('$', '').replace(',', '').strip() or 0
+    scaled = abs(float(value)) * CENTS_PER_UNIT
+    if not math.isfinite(scaled):
+        raise ValueError(f"Monto inválido: {value}")
+    cents = int(math.floor(scaled + 0.5 + _EPSILON))
+    return -cents if float(value) < 0 else cents
+
+
+def from_cents(cents: Optional[int]) -> float:
+    """Centavos a monto decimal (para mostrar o exportar)"""
+    return (cents or 0) / CENTS_PER_UNIT
+
+
+# NumPy se importa dentro de las funciones de arrays: la base de datos y la línea de
+# comandos usan este módulo sin cargar NumPy
+def cents_array(values: Iterable, dtype='int64'):
+    """Array de montos decimales a centavos int64 con el mismo redondeo que to_cents (NaN vale 0)"""
+    import numpy as np
+    values = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    return (np.sign(values) * np.floor(np.abs(values) * CENTS_PER_UNIT + 0.5 + _EPSILON)).astype(dtype)
+
+
+def units_array(cents):
+    """Array de centavos a montos decimales float64"""
+    import numpy as np
+    return np.asarray(cents, dtype=np.float64) / CENTS_PER_UNIT
+
+
+def quantize(value: Number) -> float:
+    """Monto decimal redondeado al centavo"""
+    return from_cents(to_cents(value))
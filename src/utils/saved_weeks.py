@@ -0,0 +1,194 @@
+"""
+Índice de las semanas guardadas en Weekend-Saved
+Un manifiesto JSON en la carpeta guarda, por archivo, la semana, los totales, el capital,
+el tamaño, la fecha de modificación y el hash del contenido. El diálogo de carga lo lee
+en lugar de abrir cada JSON: solo se vuelven a leer los archivos cuyo tamaño o fecha
+de modificación cambiaron desde la última vez.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+from .money import to_cents
+
+DAYS = ('Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes')
+FILE_PREFIX = 'weekend_trading_'
+
+
+def week_from_filename(file_name: str) -> str:
+    """Fecha de la semana según el nombre weekend_trading_AAAA-MM-DD.json (o el nombre sin extensión)"""
+    base = os.path.splitext(file_name)[0]
+    return base.split(FILE_PREFIX)[-1] if FILE_PREFIX in base else base
+
+
+def summarize_week_file(path: str) -> Dict[str, Any]:
+    """Leer un archivo de semana y resumirlo (montos en centavos).
+    Un archivo ilegible queda registrado con 'error' para no releerlo hasta que cambie."""
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        content = f.read()
+    entry = {
+        'file': os.path.basename(path),
+        'week': week_from_filename(os.path.basename(path)),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': hashlib.sha256(content).hexdigest(),
+        'total_cents': None,
+        'capital_cents': None,
+        'balance_cents': None,
+        'positive_days': None,
+        'negative_days': None,
+        'error': None
+    }
+    try:
+        data = json.loads(content.decode('utf-8'))
+        days = data.get('data', {})
+        amounts = [to_cents((days.get(day) or {}).get('amount', 0.0)) for day in DAYS]
+        capital = to_cents(data.get('initial_capital', 100.0))
+        total = sum(amounts)
+        entry.update({
+            'week': str(data.get('week_start_date') or entry['week'])[:10],
+            'total_cents': total,
+            'capital_cents': capital,
+            'balance_cents': capital + total,
+            'positive_days': sum(1 for amount in amounts if amount > 0),
+            'negative_days': sum(1 for amount in amounts if amount < 0)
+        })
+    except (ValueError, TypeError, AttributeError) as e:
+        entry['error'] = str(e)
+    return entry
+
+
+class SavedWeeksIndex:
+    """Manifiesto de la carpeta de semanas guardadas: una entrada por archivo .json.
+
+    refresh() compara tamaño y fecha de modificación con lo registrado (un stat por
+    archivo, sin abrirlos) y solo resume los nuevos o modificados. Si un archivo se
+    tocó sin cambiar su contenido (mismo hash) no cuenta como modificado.
+    """
+
+    FILE_NAME = '.wtf_saved_index.json'
+    # Subir al cambiar los campos de summarize_week_file: invalida todo lo registrado
+    VERSION = 1
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.path = os.path.join(folder, self.FILE_NAME)
+        self._dirty = False
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get('version') == self.VERSION:
+                self.entries = stored.get('entries', {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Índice de semanas guardadas ilegible, se regenera: {e}")
+
+    @staticmethod
+    def is_week_file(file_name: str) -> bool:
+        """Archivos de semana: .json visibles (el propio índice empieza con punto)"""
+        return file_name.lower().endswith('.json') and not file_name.startswith('.')
+
+    def refresh(self) -> Dict[str, List[str]]:
+        """Sincronizar con la carpeta; devuelve los archivos agregados, quitados y modificados"""
+        changes = {'added': [], 'removed': [], 'changed': []}
+        present = set()
+        try:
+            with os.scandir(self.folder) as scan:
+                files = [(item.name, item.stat()) for item in scan
+                         if self.is_week_file(item.name) and item.is_file()]
+        except FileNotFoundError:
+            files = []
+        for name, stat in files:
+            present.add(name)
+            self._sync(name, stat, changes)
+        for name in [name for name in self.entries if name not in present]:
+            self._drop(name, changes)
+        self._save_quietly()
+        return changes
+
+    def refresh_files(self, file_names: Iterable[str]) -> Dict[str, List[str]]:
+        """Sincronizar solo los archivos indicados, sin listar la carpeta
+        (para avisos de cambio de archivos concretos)"""
+        changes = {'added': [], 'removed': [], 'changed': []}
+        for name in set(file_names):
+            if not self.is_week_file(name):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.folder, name))
+            except FileNotFoundError:
+                self._drop(name, changes)
+                continue
+            self._sync(name, stat, changes)
+        self._save_quietly()
+        return changes
+
+    def _sync(self, name: str, stat: os.stat_result, changes: Dict[str, List[str]]):
+        entry = self.entries.get(name)
+        if entry is not None and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return
+        kind = self._update(name)
+        if kind:
+            changes[kind].append(name)
+
+    def _drop(self, name: str, changes: Dict[str, List[str]]):
+        if self.entries.pop(name, None) is not None:
+            self._dirty = True
+            changes['removed'].append(name)
+
+    def _save_quietly(self):
+        try:
+            self.save()
+        except OSError as e:
+            # Carpeta de solo lectura: el índice sirve igual en memoria
+            print(f"No se pudo guardar el índice de semanas guardadas: {e}")
+
+    def _update(self, file_name: str) -> Optional[str]:
+        """Resumir un archivo; devuelve 'added', 'changed' o None si el contenido es el mismo"""
+        try:
+            entry = summarize_week_file(os.path.join(self.folder, file_name))
+        except OSError as e:
+            # Borrado o bloqueado entre el listado y la lectura: se reintenta en el próximo refresh
+            print(f"No se pudo indexar {file_name}: {e}")
+            return None
+        previous = self.entries.get(file_name)
+        self.entries[file_name] = entry
+        self._dirty = True
+        if previous is None:
+            return 'added'
+        return None if previous.get('hash') == entry['hash'] else 'changed'
+
+    def record(self, file_path: str):
+        """Registrar un archivo recién guardado (llamar después de escribirlo)"""
+        try:
+            self._update(os.path.basename(file_path))
+            self.save()
+        except Exception as e:
+            print(f"Error al actualizar el índice de semanas guardadas: {e}")
+
+    def forget(self, file_path: str):
+        """Quitar del índice un archivo borrado"""
+        try:
+            if self.entries.pop(os.path.basename(file_path), None) is not None:
+                self._dirty = True
+                self.save()
+        except Exception as e:
+            print(f"Error al actualizar el índice de semanas guardadas: {e}")
+
+    def weeks(self) -> List[Dict[str, Any]]:
+        """Entradas ordenadas de la semana más reciente a la más antigua"""
+        return sorted(self.entries.values(), key=lambda entry: (entry['week'], entry['file']), reverse=True)
+
+    def save(self):
+        """Escribir el índice si hubo cambios (reemplazo atómico del archivo)."""
+        if not self._dirty or not os.path.isdir(self.folder):
+            return
+        payload = {'version': self.VERSION, 'entries': self.entries}
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=1, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,345 @@
+"""
+Ingesta de historiales de operaciones de la plataforma (exportaciones CSV / JSON estilo Quotex) sin Qt
+El archivo se lee por bloques (CSV con el módulo csv, JSON objeto por objeto), cada bloque
+se valida con NumPy y se agrega a la tabla trades; los totales por día y los montos de
+trading_weeks se actualizan con cada bloque, sin recorrer las operaciones ya guardadas.
+
+Columnas reconocidas (en español o inglés, sin importar mayúsculas/acentos):
+ID, Activo/Asset, Dirección/Direction, Apertura/Open time, Cierre/Close time,
+Inversión/Amount, Ganancia/Profit (neta) o Pago/Payout (bruto: ganancia = pago - inversión).
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional
+import numpy as np
+from .money import cents_array, from_cents
+from .importers import (HEADER_SEARCH_ROWS, MAX_REPORTED_ERRORS, ImportFormatError,
+                        _batches, _column, _iter_sheets, _normalize, _to_numbers)
+
+_ALIASES = {
+    'id': ('id', 'trade id', 'trade_id', 'ticket', 'order id', 'deal id', 'operacion', 'n operacion'),
+    'asset': ('asset', 'activo', 'symbol', 'simbolo', 'pair', 'par', 'instrument', 'instrumento'),
+    'direction': ('direction', 'direccion', 'type', 'tipo', 'side', 'prediction', 'prediccion', 'command'),
+    'open_time': ('open time', 'opentime', 'open_time', 'opening time', 'apertura', 'hora de apertura',
+                  'fecha de apertura', 'open'),
+    'close_time': ('close time', 'closetime', 'close_time', 'closing time', 'cierre', 'hora de cierre',
+                   'fecha de cierre', 'expiration', 'expiration time', 'expiracion', 'close', 'time',
+                   'date', 'fecha'),
+    'stake': ('amount', 'investment', 'inversion', 'stake', 'importe', 'monto', 'trade amount'),
+    'profit': ('profit', 'net profit', 'pnl', 'p/l', 'ganancia', 'beneficio', 'resultado'),
+    'payout': ('payout', 'pago', 'return', 'retorno', 'total payout')
+}
+_LOOKUP = {alias: key for key, aliases in _ALIASES.items() for alias in aliases}
+
+_DIRECTIONS = {
+    'up': 1, 'call': 1, 'buy': 1, 'higher': 1, 'arriba': 1, 'compra': 1, 'sube': 1, '1': 1,
+    'down': -1, 'put': -1, 'sell': -1, 'lower': -1, 'abajo': -1, 'venta': -1, 'baja': -1, '-1': -1
+}
+# Claves bajo las que una exportación JSON puede traer la lista de operaciones
+_JSON_LIST_KEYS = ('trades', 'data', 'deals', 'orders', 'history', 'operaciones')
+_JSON_LIST_START = re.compile(r'"(?:%s)"\s*:\s*\[' % '|'.join(_JSON_LIST_KEYS))
+SECONDS_PER_DAY = 86400
+
+
+def map_trade_columns(header) -> Optional[Dict]:
+    """Índice de cada campo conocido; None si faltan la hora o el resultado de la operación"""
+    columns = {}
+    for index, cell in enumerate(header):
+        key = _LOOKUP.get(_normalize(cell))
+        if key is not None and key not in columns:
+            columns[key] = index
+    has_time = 'close_time' in columns or 'open_time' in columns
+    has_result = 'profit' in columns or ('payout' in columns and 'stake' in columns)
+    return columns if has_time and has_result else None
+
+
+class IngestCancelled(Exception):
+    """La ingesta se canceló; los lotes ya guardados se conservan"""
+
+
+class IngestReport:
+    """Resultado de una ingesta: operaciones leídas, nuevas, repetidas y rechazadas"""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.rows_read = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.errors: List[str] = []
+        # Total de cada día afectado, en centavos
+        self.days: Dict[str, int] = {}
+        self.cancelled = False
+
+    def reject(self, where: str, reason: str):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"{where}: {reason}")
+
+    @property
+    def weekend_days(self) -> List[str]:
+        """Días con operaciones en sábado o domingo (no tienen columna en trading_weeks)"""
+        return [day for day in self.days if datetime.strptime(day, '%Y-%m-%d').weekday() >= 5]
+
+    def to_dict(self) -> Dict:
+        return {
+            'file_path': self.file_path,
+            'rows_read': self.rows_read,
+            'inserted': self.inserted,
+            'duplicates': self.duplicates,
+            'rejected': self.rejected,
+            'cancelled': self.cancelled,
+            'days': {day: from_cents(cents) for day, cents in sorted(self.days.items())},
+            'weekend_days': self.weekend_days,
+            'errors': list(self.errors)
+        }
+
+
+# ----------------------------------------------------------------------
+# Lectura en streaming
+# ----------------------------------------------------------------------
+def _iter_json_records(file_path: str, read_size: int = 1 << 16) -> Iterator[Dict]:
+    """Objetos de una lista JSON (en la raíz o bajo 'trades', 'data', ...) o de JSON Lines,
+    decodificados de a uno sobre un búfer de tamaño acotado"""
+    opener = gzip.open if file_path.lower().endswith('.gz') else open
+    decoder = json.JSONDecoder()
+    with opener(file_path, 'rt', encoding='utf-8-sig') as f:
+        buffer = f.read(read_size)
+        start = buffer.lstrip()[:1]
+        if start == '{':
+            # Objeto en la raíz: lista de operaciones bajo una clave conocida (o JSON Lines)
+            try:
+                first = decoder.raw_decode(buffer.lstrip())[0]
+            except json.JSONDecodeError:
+                # Objeto más grande que la muestra: la lista se recorre en streaming
+                first = None
+            if first is not None:
+                key = next((k for k in _JSON_LIST_KEYS if isinstance(first.get(k), list)), None)
+                if key is not None:
+                    # El objeto completo cupo en la muestra
+                    yield from first[key]
+                    return
+                # JSON Lines: un objeto por línea
+                f.seek(0)
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+                return
+            while True:
+                match = _JSON_LIST_START.search(buffer)
+                if match is not None:
+                    break
+                more = f.read(read_size)
+                if not more:
+                    raise ImportFormatError("El objeto JSON no tiene una lista de operaciones bajo "
+                                            + ", ".join(f"'{k}'" for k in _JSON_LIST_KEYS))
+                # Conservar la cola por si la clave quedó partida entre dos lecturas
+                buffer = buffer[-256:] + more
+            yield from _iter_json_list(f, decoder, buffer, match.end(), read_size)
+            return
+        if start != '[':
+            raise ImportFormatError("El JSON debe ser una lista de operaciones, un objeto con "
+                                    "'trades'/'data' o JSON Lines")
+        yield from _iter_json_list(f, decoder, buffer, buffer.index('[') + 1, read_size)
+
+
+def _iter_json_list(f, decoder: json.JSONDecoder, buffer: str, position: int,
+                    read_size: int) -> Iterator[Dict]:
+    """Elementos de una lista JSON desde position (justo después de '['), leyendo f de a read_size"""
+    while True:
+        # Saltar separadores entre objetos; leer más si el búfer se agotó
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position < len(buffer):
+                break
+            more = f.read(read_size)
+            if not more:
+                return
+            buffer, position = more, 0
+        if buffer[position] == ']':
+            return
+        while True:
+            try:
+                record, position = decoder.raw_decode(buffer, position)
+                break
+            except json.JSONDecodeError:
+                more = f.read(read_size)
+                if not more:
+                    raise
+                buffer, position = buffer[position:] + more, 0
+        yield record
+        if position > read_size:
+            buffer, position = buffer[position:], 0
+
+
+def _json_rows(file_path: str):
+    """(encabezado, filas) de un JSON: las claves del primer objeto son las columnas"""
+    records = _iter_json_records(file_path)
+    first = next(records, None)
+    if first is None:
+        return [], iter(())
+    if not isinstance(first, dict):
+        raise ImportFormatError("Las operaciones del JSON deben ser objetos")
+    keys = list(first)
+
+    def rows():
+        yield tuple(first.get(k) for k in keys)
+        for record in records:
+            yield tuple(record.get(k) for k in keys) if isinstance(record, dict) else ()
+    return keys, rows()
+
+
+def _to_seconds(values: List, utc_offset: int) -> np.ndarray:
+    """Hora de cada operación como segundos desde 1970 (reloj del extracto); -1 si no se entiende.
+    Los números se toman como timestamps Unix (en ms si son muy grandes) y se corren a la
+    zona horaria local con utc_offset; los textos ISO se convierten juntos con NumPy."""
+    raw = [None if v is None or v == '' else v for v in values]
+    try:
+        numbers = np.array([np.nan if v is None else v for v in raw], dtype=np.float64)
+        numbers = np.where(numbers > 1e11, numbers / 1000.0, numbers)
+        out = np.where(np.isfinite(numbers), np.floor(np.nan_to_num(numbers)) + utc_offset, -1)
+        return out.astype(np.int64)
+    except (TypeError, ValueError):
+        pass
+    texts = ['NaT' if v is None else str(v).strip().replace(' ', 'T', 1) for v in raw]
+    try:
+        stamps = np.array(texts, dtype='datetime64[s]')
+        return np.where(np.isnat(stamps), -1, stamps.astype(np.int64))
+    except ValueError:
+        from dateutil import parser as date_parser
+        out = np.full(len(raw), -1, dtype=np.int64)
+        for i, value in enumerate(raw):
+            if value is None:
+                continue
+            try:
+                out[i] = int(float(value)) + utc_offset
+                continue
+            except (TypeError, ValueError):
+                pass
+            try:
+                stamp = date_parser.parse(str(value), dayfirst=True).replace(tzinfo=None)
+                out[i] = int(np.datetime64(stamp, 's').astype(np.int64))
+            except (ValueError, OverflowError):
+                pass
+        return out
+
+
+def _local_utc_offset() -> int:
+    return time.localtime().tm_gmtoff or 0
+
+
+class TradeIngestor:
+    """Agrega a la base las operaciones de un extracto de la plataforma.
+
+    Cada lote de batch_size filas es una transacción de DatabaseManager.append_trades:
+    la memoria no crece con el tamaño del archivo y una ingesta cancelada conserva lo
+    ya guardado. Las operaciones sin ID reciben uno derivado de su contenido (y de
+    cuántas veces se repite en el archivo), así que reimportar es idempotente.
+    """
+
+    def __init__(self, db_manager, batch_size: int = 5000, utc_offset: Optional[int] = None):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.utc_offset = _local_utc_offset() if utc_offset is None else utc_offset
+
+    def ingest_file(self, file_path: str,
+                    progress: Optional[Callable[[int], None]] = None) -> IngestReport:
+        """Ingerir el archivo; progress(filas leídas) se llama tras cada lote y puede
+        lanzar IngestCancelled para detener la ingesta (report.cancelled queda en True)"""
+        report = IngestReport(file_path)
+        try:
+            self._ingest(file_path, report, progress)
+        except IngestCancelled:
+            report.cancelled = True
+        return report
+
+    def _ingest(self, file_path: str, report: IngestReport, progress: Optional[Callable[[int], None]]):
+        seen: Dict[str, int] = {}
+        found = False
+        for source, columns, rows, first_row in self._sources(file_path):
+            found = True
+            read = 0
+            for batch in _batches(rows, self.batch_size):
+                trades = self._parse_batch(batch, columns, f"{source} fila", first_row + read, report, seen)
+                read += len(batch)
+                report.rows_read += len(batch)
+                if trades:
+                    result = self.db_manager.append_trades(trades)
+                    report.inserted += result['inserted']
+                    report.duplicates += result['duplicates']
+                    report.days.update(result['days'])
+                if progress is not None:
+                    progress(report.rows_read)
+        if not found:
+            raise ImportFormatError("No se encontraron las columnas de hora de cierre y ganancia "
+                                    "(o pago e inversión) de las operaciones")
+
+    @staticmethod
+    def _sources(file_path: str) -> Iterator[tuple]:
+        """(nombre, columnas, filas restantes, número de la primera fila de datos) de cada
+        hoja o archivo con encabezados de operaciones"""
+        if file_path.lower().endswith(('.json', '.jsonl', '.json.gz')):
+            header, rows = _json_rows(file_path)
+            columns = map_trade_columns(header)
+            if columns:
+                yield os.path.basename(file_path), columns, rows, 1
+            return
+        for sheet_name, rows in _iter_sheets(file_path):
+            for row_number, row in enumerate(islice(rows, HEADER_SEARCH_ROWS), start=1):
+                columns = map_trade_columns(row)
+                if columns:
+                    yield sheet_name, columns, rows, row_number + 1
+                    break
+
+    def _parse_batch(self, batch, columns, where: str, first_row: int, report, seen: Dict[str, int]) -> List[tuple]:
+        """Validar un lote de una vez y convertirlo a filas de la tabla trades"""
+        time_column = columns.get('close_time', columns.get('open_time'))
+        seconds = _to_seconds(_column(batch, time_column), self.utc_offset)
+        stakes = _to_numbers(_column(batch, columns.get('stake')), default=0.0)
+        payouts = None
+        if 'profit' in columns:
+            profits = _to_numbers(_column(batch, columns['profit']))
+        else:
+            payouts = _to_numbers(_column(batch, columns['payout']))
+            profits = payouts - stakes
+        empty = np.array([all(cell is None or cell == '' for cell in row) for row in batch], dtype=bool)
+        valid = (seconds >= 0) & np.isfinite(profits) & np.isfinite(stakes) & ~empty
+        for i in np.flatnonzero(~valid & ~empty):
+            reason = "hora inválida" if seconds[i] < 0 else "monto inválido"
+            report.reject(f"{where} {first_row + i}", reason)
+
+        indices = np.flatnonzero(valid)
+        stake_cents = cents_array(stakes[indices])
+        if payouts is None:
+            profit_cents = cents_array(profits[indices])
+        else:
+            # Resta en centavos: el pago y la inversión se redondean por separado
+            profit_cents = cents_array(payouts[indices]) - stake_cents
+        dates = (seconds[indices] // SECONDS_PER_DAY).astype('datetime64[D]').astype(str).tolist()
+        ids = _column(batch, columns.get('id'))
+        assets = _column(batch, columns.get('asset'))
+        # Pocos valores distintos ('up', 'down', ...): se normaliza cada uno una sola vez
+        direction_codes = {value: _DIRECTIONS.get(_normalize(value), 0)
+                           for value in set(_column(batch, columns.get('direction')))}
+        directions = [direction_codes[value] for value in _column(batch, columns.get('direction'))]
+        trades = []
+        for i, trade_date, closed_at, stake, profit in zip(indices.tolist(), dates, seconds[indices].tolist(),
+                                                           stake_cents.tolist(), profit_cents.tolist()):
+            trade_id = ids[i]
+            if trade_id is None or trade_id == '':
+                digest = hashlib.sha1(repr(batch[i]).encode('utf-8')).hexdigest()[:16]
+                seen[digest] = occurrence = seen.get(digest, 0) + 1
+                trade_id = f"h:{digest}:{occurrence}"
+            asset = assets[i]
+            trades.append((str(trade_id), trade_date, closed_at,
+                           None if asset in (None, '') else str(asset), directions[i], stake, profit))
+        return trades
+
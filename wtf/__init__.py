@@ -0,0 +1,4 @@
+"""
+W-T-F Trading Manager sin interfaz gráfica
+Exportaciones y resúmenes del historial desde la línea de comandos: python -m wtf --help
+"""
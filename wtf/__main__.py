@@ -0,0 +1,9 @@
+"""
+Punto de entrada de `python -m wtf`
+"""
+
+import sys
+from .cli import main
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Línea de comandos: exportaciones y resumen del historial leyendo la base SQLite directamente
+No importa PyQt5 (ni NumPy): arranca rápido en servidores sin pantalla y desde cron.
+
+Ejemplos:
+    python -m wtf export --from 2024-01-01 --format xlsx --out exportaciones/
+    python -m wtf export --format csv --format json --out archivo/ --force
+    python -m wtf export --history historial_2024.csv.gz --from 2024-01-01 --to 2024-12-31
+    python -m wtf summary --from 2024-01-01 --json
+    python -m wtf import operaciones_2024.xlsx
+    python -m wtf trades extracto_quotex.csv --utc-offset -180
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date
+from typing import List, Optional
+
+DEFAULT_DB = "trading_data.db"
+
+
+def _iso_date(value: str) -> str:
+    """Validar una fecha AAAA-MM-DD para argparse"""
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha inválida (se espera AAAA-MM-DD): {value}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m wtf",
+                                     description="W-T-F Trading Manager sin interfaz gráfica")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"Base de datos SQLite (por defecto {DEFAULT_DB})")
+    parser.add_argument("--lang", choices=("es", "en"), default="es", help="Idioma de las etiquetas exportadas")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_range(command):
+        command.add_argument("--from", dest="start", type=_iso_date, help="Primera semana (fecha del lunes o posterior)")
+        command.add_argument("--to", dest="end", type=_iso_date, help="Última semana (fecha de inicio, inclusive)")
+
+    export = commands.add_parser("export", help="Exportar semanas guardadas")
+    add_range(export)
+    export.add_argument("--format", dest="formats", action="append", choices=("xlsx", "csv", "json"),
+                        help="Formato de cada semana (se puede repetir; por defecto xlsx)")
+    export.add_argument("--out", default=".", help="Carpeta de salida de los archivos por semana")
+    export.add_argument("--history", metavar="ARCHIVO",
+                        help="Escribir el rango en un solo archivo .xlsx, .csv o .csv.gz en lugar de uno por semana")
+    export.add_argument("--force", action="store_true",
+                        help="Reescribir también las semanas sin cambios desde la última exportación")
+    export.add_argument("--workers", type=int, default=None, help="Hilos de exportación en paralelo")
+    export.add_argument("--quiet", action="store_true", help="No mostrar el avance")
+
+    summary = commands.add_parser("summary", help="Resumen del historial")
+    add_range(summary)
+    summary.add_argument("--json", action="store_true", help="Salida en JSON")
+
+    import_ = commands.add_parser("import", help="Importar semanas o días desde un .xlsx, .csv o .csv.gz")
+    import_.add_argument("file", help="Archivo a importar (las semanas con la misma fecha se reemplazan)")
+    import_.add_argument("--json", action="store_true", help="Informe en JSON")
+
+    trades = commands.add_parser("trades", help="Agregar las operaciones de un extracto de la plataforma (CSV / JSON)")
+    trades.add_argument("file", help="Extracto .csv, .json, .jsonl o .xlsx (las operaciones ya importadas se ignoran)")
+    trades.add_argument("--utc-offset", type=int, default=None, metavar="MINUTOS",
+                        help="Zona horaria de los timestamps Unix del extracto (por defecto la local)")
+    trades.add_argument("--json", action="store_true", help="Informe en JSON")
+    return parser
+
+
+def _open_db(path: str):
+    """DatabaseManager sobre una base existente (no crea una vacía por error de ruta)"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No existe la base de datos: {path}")
+    from src.database.database_manager import DatabaseManager
+    return DatabaseManager(path)
+
+
+def _report_progress(job, quiet: bool):
+    """Esperar el trabajo mostrando filas escritas y tiempo restante en stderr"""
+    while not job.wait(0.5):
+        if quiet:
+            continue
+        state = job.snapshot()
+        eta = state['eta']
+        eta_text = "--" if eta is None else f"{eta:.0f}s"
+        print(f"\r{state['done_rows']}/{state['total_rows']} filas · quedan {eta_text}   ",
+              end="", file=sys.stderr, flush=True)
+    if not quiet:
+        print(file=sys.stderr)
+
+
+def run_export(args) -> int:
+    from src.utils.export_service import ExportService
+
+    db = _open_db(args.db)
+    service = ExportService(max_workers=args.workers)
+    try:
+        started = time.monotonic()
+        if args.history:
+            folder = os.path.dirname(os.path.abspath(args.history))
+            os.makedirs(folder, exist_ok=True)
+            weeks = db.count_weeks(args.start, args.end)
+            task = service.history_task(lambda: db.iter_history(start=args.start, end=args.end),
+                                        weeks, args.history)
+            job = service.submit([task], "historial")
+        else:
+            os.makedirs(args.out, exist_ok=True)
+            tasks = service.weeks_tasks(db.iter_history(start=args.start, end=args.end), args.out,
+                                        args.formats or ['xlsx'], skip_unchanged=not args.force)
+            job = service.submit(tasks, "semanas")
+        try:
+            _report_progress(job, args.quiet)
+        except KeyboardInterrupt:
+            job.cancel()
+            job.wait()
+        state = job.snapshot()
+    finally:
+        service.shutdown()
+
+    elapsed = time.monotonic() - started
+    print(f"Escritos: {len(state['outputs'])} · sin cambios: {len(state['skipped'])} · "
+          f"errores: {len(state['errors'])} · {elapsed:.1f}s")
+    for error in state['errors']:
+        print(f"  {error}", file=sys.stderr)
+    if state['status'] == 'cancelled':
+        print("Exportación cancelada", file=sys.stderr)
+        return 130
+    return 1 if state['errors'] else 0
+
+
+def run_summary(args) -> int:
+    from src.utils.exporters import summarize_history
+
+    db = _open_db(args.db)
+    summary = summarize_history(db.iter_history(start=args.start, end=args.end))
+    if args.json:
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+        return 0
+    labels = [
+        ('weeks', "Semanas"), ('first_week', "Desde"), ('last_week', "Hasta"),
+        ('total', "Total"), ('average_week', "Promedio semanal"),
+        ('best_week', "Mejor semana"), ('worst_week', "Peor semana"),
+        ('positive_days', "Días positivos"), ('negative_days', "Días negativos"),
+        ('last_initial_capital', "Capital inicial (última semana)")
+    ]
+    for key, label in labels:
+        value = summary[key]
+        if isinstance(value, float):
+            value = f"${value:,.2f}"
+        print(f"{label:<32} {'-' if value is None else value}")
+    return 0
+
+
+def run_import(args) -> int:
+    from src.utils.importers import SpreadsheetImporter
+
+    db = _open_db(args.db)
+    started = time.monotonic()
+    report = SpreadsheetImporter(db).import_file(args.file)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        print(f"Semanas: {report.weeks} · filas leídas: {report.rows_read} · "
+              f"rechazadas: {report.rejected} · {time.monotonic() - started:.1f}s")
+        for error in report.errors:
+            print(f"  {error}", file=sys.stderr)
+    return 1 if report.rejected else 0
+
+
+def run_trades(args) -> int:
+    from src.utils.trade_ingest import TradeIngestor
+
+    db = _open_db(args.db)
+    started = time.monotonic()
+    offset = None if args.utc_offset is None else args.utc_offset * 60
+    report = TradeIngestor(db, utc_offset=offset).ingest_file(args.file)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        print(f"Nuevas: {report.inserted} · ya importadas: {report.duplicates} · "
+              f"rechazadas: {report.rejected} · días: {len(report.days)} · "
+              f"{time.monotonic() - started:.1f}s")
+        for error in report.errors:
+            print(f"  {error}", file=sys.stderr)
+    return 1 if report.rejected else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    from src.utils.i18n import set_language
+    set_language(args.lang)
+    try:
+        if args.command == 'export':
+            return run_export(args)
+        if args.command == 'import':
+            return run_import(args)
+        if args.command == 'trades':
+            return run_trades(args)
+        return run_summary(args)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1